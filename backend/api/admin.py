@@ -0,0 +1,115 @@
+import os
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from core.dependencies import get_backfill, get_watchdog
+from core.security import require_admin
+from models.admin import (
+    BackfillJobStatus,
+    BackfillRequest,
+    BackfillSeriesProgress,
+    LoopStats,
+    ProfileStarted,
+)
+from services.backfill_jobs import BackfillRunner
+from services.profiling import SamplingProfiler
+
+router = APIRouter(
+    prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+# One per worker process: requests reach whichever worker accepted them, so
+# callers check `worker` in the responses.
+_profiler = SamplingProfiler()
+
+
+@router.post("/profile/start", response_model=ProfileStarted, status_code=202)
+async def start_profile(
+    interval_ms: float = Query(5, ge=1, le=1000),
+    max_seconds: float = Query(60, gt=0, le=600),
+):
+    """Start sampling this worker's event-loop thread."""
+    if _profiler.running:
+        raise HTTPException(409, "Profiler already running")
+    _profiler.interval = interval_ms / 1000
+    _profiler.max_seconds = max_seconds
+    _profiler.start()
+    return ProfileStarted(
+        worker=os.getpid(), interval_ms=interval_ms, max_seconds=max_seconds
+    )
+
+
+@router.post(
+    "/profile/stop",
+    responses={200: {"content": {"text/plain": {}, "application/json": {}}}},
+)
+async def stop_profile(fmt: Literal["speedscope", "folded"] = Query("speedscope")):
+    """Stop sampling and return the profile: a speedscope JSON document, or
+    folded stacks for flamegraph.pl."""
+    if not _profiler.running:
+        raise HTTPException(409, "Profiler not running")
+    _profiler.stop()
+    if fmt == "folded":
+        return PlainTextResponse(_profiler.folded())
+    return JSONResponse(
+        _profiler.speedscope(),
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{os.getpid()}.json"'
+        },
+    )
+
+
+@router.get("/loop", response_model=LoopStats)
+async def loop_stats(request: Request):
+    watchdog = get_watchdog(request)
+    if watchdog is None:
+        raise HTTPException(503, "Loop watchdog disabled")
+    return LoopStats(
+        worker=os.getpid(),
+        threshold_ms=watchdog.threshold * 1000,
+        max_lag_ms=round(watchdog.max_lag * 1000, 3),
+        stalls=watchdog.stalls,
+    )
+
+
+async def _backfill_status(runner: BackfillRunner, job_id: str) -> BackfillJobStatus:
+    meta = await runner.store.meta(job_id)
+    if meta is None:
+        raise HTTPException(404, "Job not found")
+    progress = await runner.store.progress(job_id)
+    series = [
+        BackfillSeriesProgress(series_id=s, **progress[s])
+        for s in meta["series"]
+        if s in progress
+    ]
+    return BackfillJobStatus(
+        job_id=job_id,
+        status=meta["status"],
+        start=meta["start"],
+        total=len(meta["series"]),
+        completed=sum(p.done for p in series),
+        points=sum(p.points for p in series),
+        series=series,
+    )
+
+
+@router.post("/backfill", response_model=BackfillJobStatus, status_code=202)
+async def submit_backfill(body: BackfillRequest, request: Request):
+    """Start loading the full history of each series into InfluxDB; poll
+    the job by `job_id`. The job runs as fast as the FRED quota allows
+    after live requests, and resumes from its checkpoints after a restart.
+    """
+    runner = get_backfill(request)
+    if runner is None:
+        raise HTTPException(503, "Backfill unavailable")
+    job_id = await runner.submit(body.series_ids, body.start)
+    return await _backfill_status(runner, job_id)
+
+
+@router.get("/backfill/{job_id}", response_model=BackfillJobStatus)
+async def get_backfill_job(job_id: str, request: Request):
+    runner = get_backfill(request)
+    if runner is None:
+        raise HTTPException(503, "Backfill unavailable")
+    return await _backfill_status(runner, job_id)
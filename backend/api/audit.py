@@ -1,23 +1,172 @@
-from fastapi import APIRouter
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from core.config import settings
-from core.exceptions import UpstreamError
-from models.audit import AuditRequest, SWOTReport
+from core.dependencies import get_audit_jobs, get_cache, get_llm
+from core.exceptions import UpstreamError, UpstreamUnavailable
+from models.audit import (
+    AuditBatchRequest,
+    AuditCacheStats,
+    AuditJobResults,
+    AuditJobStatus,
+    AuditRequest,
+    SWOTReport,
+)
+from services.audit_context import AuditContextBuilder
 from services.audit_engine import AuditEngine
+from services.llm_client import LLMClient
+from services.llm_limiter import Priority
+from services.resilience import CircuitOpenError
+from storage.audit_cache import AuditCache
+from storage.redis_cache import RedisCache
 
 router = APIRouter(tags=["audit"])
 
 
-def get_audit_engine() -> AuditEngine:
-    return AuditEngine(api_key=settings.GROQ_API_KEY)
+def get_audit_cache(cache: RedisCache | None) -> AuditCache | None:
+    if cache is None:
+        return None
+    return AuditCache(
+        cache, ttl=settings.AUDIT_CACHE_TTL, semantic=settings.AUDIT_SEMANTIC_DEDUPE
+    )
+
+
+def get_audit_engine(
+    cache: RedisCache | None = None,
+    llm: LLMClient | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> AuditEngine:
+    return AuditEngine(
+        api_key=settings.GROQ_API_KEY,
+        cache=get_audit_cache(cache),
+        llm=llm,
+        priority=priority,
+        context=(
+            AuditContextBuilder(cache, max_tokens=settings.AUDIT_CONTEXT_TOKENS)
+            if cache is not None
+            else None
+        ),
+    )
+
+
+def _sse(event: str, data: dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+@router.post(
+    "/api/audit",
+    response_model=SWOTReport,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def run_audit(
+    body: AuditRequest,
+    request: Request,
+    response: Response,
+    stream: bool = Query(False),
+):
+    """Run a SWOT audit. Identical (and, when enabled, near-identical)
+    requests are answered from the report cache; `X-Cache` says which.
+
+    With `stream=true` the response is Server-Sent Events: `item` for each
+    SWOT entry as it completes, `summary`, then `report` with the validated
+    report, or `error` if generation fails.
+    """
+    engine = get_audit_engine(get_cache(request), get_llm(request))
+    if stream:
+
+        async def events() -> AsyncIterator[bytes]:
+            try:
+                async for event, data in engine.stream(body):
+                    yield _sse(event, data)
+            except Exception as e:
+                yield _sse("error", {"detail": UpstreamError("LLM", str(e)).detail})
+            finally:
+                await engine.close()
 
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
-@router.post("/api/audit", response_model=SWOTReport)
-async def run_audit(request: AuditRequest):
-    engine = get_audit_engine()
     try:
-        return await engine.analyze(request)
+        report, kind = await engine.analyze_cached(body)
+    except CircuitOpenError as e:
+        # Cached reports were already checked; nothing else to fall back to
+        raise UpstreamUnavailable("LLM", e.retry_after)
     except ValueError as e:
         raise UpstreamError("LLM", str(e))
     except Exception as e:
         raise UpstreamError("LLM", str(e))
+    finally:
+        await engine.close()
+    if kind != "off":
+        response.headers["X-Cache"] = "MISS" if kind == "miss" else "HIT"
+        if kind != "miss":
+            response.headers["X-Cache-Match"] = kind
+    return report
+
+
+@router.get("/api/audit/cache/stats", response_model=AuditCacheStats)
+async def audit_cache_stats(request: Request):
+    audit_cache = get_audit_cache(get_cache(request))
+    if audit_cache is None:
+        raise HTTPException(503, "Cache unavailable")
+    return await audit_cache.stats()
+
+
+@router.post("/api/audit/batch", response_model=AuditJobStatus, status_code=202)
+async def submit_audit_batch(body: AuditBatchRequest, request: Request):
+    """Start a background job auditing every item; poll it by `job_id`.
+
+    Identical items are audited once. Jobs run at background priority, so
+    interactive audits are admitted to the LLM first.
+    """
+    runner = get_audit_jobs(request)
+    if runner is None:
+        raise HTTPException(503, "Batch audits unavailable")
+    job_id = await runner.submit(body.items)
+    meta = await runner.store.meta(job_id)
+    return AuditJobStatus(
+        job_id=job_id,
+        status=meta["status"],
+        total=meta["total"],
+        unique=meta["unique"],
+        completed=0,
+    )
+
+
+@router.get("/api/audit/batch/{job_id}", response_model=AuditJobResults)
+async def get_audit_batch(
+    job_id: str,
+    request: Request,
+    cursor: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Job progress plus results completed since `cursor`, in completion
+    order; pass `next_cursor` back to fetch only newer results."""
+    runner = get_audit_jobs(request)
+    if runner is None:
+        raise HTTPException(503, "Batch audits unavailable")
+    meta = await runner.store.meta(job_id)
+    if meta is None:
+        raise HTTPException(404, "Job not found")
+    completed = await runner.store.completed(job_id)
+    results = await runner.store.results(job_id, cursor, limit)
+
+    indices: dict[str, list[int]] = {}
+    for i, key in enumerate(meta["order"]):
+        indices.setdefault(key, []).append(i)
+    return AuditJobResults(
+        job_id=job_id,
+        status=meta["status"],
+        total=meta["total"],
+        unique=meta["unique"],
+        completed=completed,
+        results=[{**r, "indices": indices.get(r["key"], [])} for r in results],
+        next_cursor=cursor + len(results),
+    )
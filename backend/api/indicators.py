@@ -1,20 +1,355 @@
-from fastapi import APIRouter, Query
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
-from core.dependencies import get_fred_client
-from core.exceptions import UpstreamError
-from models.indicators import IndicatorSeries
+import orjson
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from core.config import settings
+from core.dependencies import get_cache, get_fred_client
+from core.exceptions import UpstreamError, UpstreamUnavailable
+from core.http_cache import (
+    SERIES_CACHE_CONTROL,
+    if_none_match,
+    make_etag,
+    not_modified,
+)
+from core.wire_format import (
+    COLUMNAR,
+    COLUMNAR_MEDIA_TYPE,
+    JSON,
+    MEDIA_TYPES,
+    MSGPACK_MEDIA_TYPE,
+    encode_batch,
+    encode_series,
+    negotiate,
+    to_columns,
+)
+from models.indicators import (
+    IndicatorBatchColumns,
+    IndicatorBatchRequest,
+    IndicatorBatchResponse,
+    IndicatorSeries,
+    IndicatorSeriesColumns,
+    SeriesTransform,
+)
+from services.downsampling import transform_points
+from services.fred_client import FredClient
+from services.resilience import CircuitOpenError
+from storage.payload_cache import PayloadCache
+from storage.redis_cache import RedisCache
+from storage.series_cache import (
+    SERIES_TTL,
+    derived_key,
+    get_series_version,
+    series_key,
+    store_series,
+)
 
 router = APIRouter(prefix="/api/indicators", tags=["indicators"])
+_payloads = PayloadCache()
+
 
+def _alternate_formats(columnar_model: type[BaseModel]) -> dict[str, Any]:
+    return {
+        COLUMNAR_MEDIA_TYPE: {
+            "schema": columnar_model.model_json_schema()
+        },
+        MSGPACK_MEDIA_TYPE: {
+            "schema": {"type": "string", "format": "binary"},
+        },
+    }
 
-@router.get("/fred/{series_id}", response_model=IndicatorSeries)
+
+@router.get(
+    "/fred/{series_id}",
+    response_model=IndicatorSeries,
+    responses={
+        200: {"content": _alternate_formats(IndicatorSeriesColumns)},
+        304: {"description": "Not modified since the given ETag"},
+    },
+)
 async def get_fred_series(
     series_id: str,
+    request: Request,
     start: str | None = Query(None),
     end: str | None = Query(None),
+    max_points: int | None = Query(None, ge=3, le=20000),
+    downsample: Literal["lttb", "minmax"] = Query("lttb"),
+    freq: Literal["weekly", "monthly", "quarterly"] | None = Query(None),
+    agg: Literal["mean", "last", "sum"] = Query("mean"),
 ):
-    client = get_fred_client()
+    """Return one series, optionally resampled (`freq`, `agg`) and
+    downsampled to `max_points`. Reduced variants are cached per params.
+
+    The representation is negotiated from Accept: row JSON by default, or
+    columnar JSON / MessagePack (see `core.wire_format`).
+
+    Cached series carry a strong ETag derived from the stored version tag, so
+    a matching If-None-Match is answered with 304 before any body is loaded.
+    Otherwise the already-encoded body for that version is returned as-is,
+    skipping response-model validation; `response_model` only documents it.
+
+    If FRED fails (or its circuit is open) the last stale copy is served
+    with `X-Stale: true` and no ETag.
+    """
+    transform = SeriesTransform(
+        max_points=max_points, downsample=downsample, freq=freq, agg=agg
+    )
+    variant = (
+        transform.cache_field(start, end)
+        if transform.active or start or end
+        else ""
+    )
+    fmt = negotiate(request)
+    if fmt != JSON:
+        variant = f"{variant}|{fmt}"
+    cache = get_cache(request)
+
+    version = None
+    if cache is not None:
+        version = await get_series_version(cache, series_id)
+        if version is not None:
+            etag = make_etag(version, variant)
+            if if_none_match(request, etag):
+                return _vary(not_modified(etag, SERIES_CACHE_CONTROL))
+            body = await _cached_body(cache, series_id, version, variant, etag)
+            if body is not None:
+                return _series_response(body, etag, fmt)
+
     try:
-        return await client.get_observations(series_id, start, end)
+        series, loaded_version = await _load_series(series_id, start, end, cache)
     except Exception as e:
-        raise UpstreamError("FRED", str(e))
+        stale = await _stale_series(cache, series_id)
+        if stale is None:
+            raise _upstream_error(e)
+        series = _slice(stale, start, end)
+        if transform.active:
+            series = _apply_transform(series, transform)
+        response = _series_response(encode_series(series, fmt), None, fmt)
+        response.headers["X-Stale"] = "true"
+        return response
+    version = loaded_version or version
+
+    if transform.active:
+        series = _apply_transform(series, transform)
+    body = encode_series(series, fmt)
+    if cache is None or version is None:
+        return _series_response(body, None, fmt)
+
+    etag = make_etag(version, variant)
+    _payloads.put(f"{series_id}:{etag}", body)
+    if variant:
+        await cache.hset_raw(
+            derived_key(series_id), f"{version}|{variant}", body, ttl=SERIES_TTL
+        )
+    return _series_response(body, etag, fmt)
+
+
+async def _cached_body(
+    cache: RedisCache, series_id: str, version: str, variant: str, etag: str
+) -> bytes | None:
+    """Encoded body for a series version: process memory first, then Redis."""
+    key = f"{series_id}:{etag}"
+    body = _payloads.get(key)
+    if body is None:
+        if variant:
+            body = await cache.hget_raw(derived_key(series_id), f"{version}|{variant}")
+        else:
+            body = await cache.get_raw(series_key(series_id))
+        if body is not None:
+            _payloads.put(key, body)
+    return body
+
+
+async def _stale_series(
+    cache: RedisCache | None, series_id: str
+) -> dict[str, Any] | None:
+    """Last known copy of a series (fresh or stale backup), if any."""
+    if cache is None:
+        return None
+    series, _ = await cache.get_with_stale(series_key(series_id))
+    return series
+
+
+def _upstream_error(exc: Exception) -> Exception:
+    if isinstance(exc, CircuitOpenError):
+        return UpstreamUnavailable("FRED", exc.retry_after)
+    return UpstreamError("FRED", str(exc))
+
+
+def _vary(response: Response) -> Response:
+    response.headers["Vary"] = "Accept"
+    return response
+
+
+def _series_response(body: bytes, etag: str | None, fmt: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": SERIES_CACHE_CONTROL} if etag else {}
+    return _vary(Response(content=body, media_type=MEDIA_TYPES[fmt], headers=headers))
+
+
+def _slice(series: dict[str, Any], start: str | None, end: str | None) -> dict[str, Any]:
+    """Restrict a cached full series to [start, end] (ISO dates compare as strings)."""
+    if start is None and end is None:
+        return series
+    data = [
+        p
+        for p in series["data"]
+        if (start is None or p["date"] >= start) and (end is None or p["date"] <= end)
+    ]
+    return {**series, "data": data}
+
+
+def _apply_transform(
+    series: dict[str, Any], transform: SeriesTransform
+) -> dict[str, Any]:
+    data = transform_points(
+        series["data"],
+        freq=transform.freq,
+        agg=transform.agg,
+        max_points=transform.max_points,
+        method=transform.downsample,
+    )
+    frequency = transform.freq.capitalize() if transform.freq else series["frequency"]
+    return {**series, "frequency": frequency, "data": data}
+
+
+async def _fetch_and_cache(
+    client: FredClient,
+    cache: RedisCache | None,
+    series_id: str,
+    limit: asyncio.Semaphore | None = None,
+) -> tuple[dict[str, Any], str | None]:
+    """Fetch a full series upstream and cache it; returns (series, version)."""
+    if limit is None:
+        series = (await client.get_observations(series_id)).model_dump()
+    else:
+        async with limit:
+            series = (await client.get_observations(series_id)).model_dump()
+    version = None
+    if cache is not None:
+        version = await store_series(cache, series_id, series)
+    return series, version
+
+
+async def _load_series(
+    series_id: str,
+    start: str | None,
+    end: str | None,
+    cache: RedisCache | None,
+) -> tuple[dict[str, Any], str | None]:
+    """Serve from the cached full series when possible, else go to FRED.
+
+    The version is only returned when this call wrote a new one.
+    """
+    client = get_fred_client()
+    if cache is None:
+        series = await client.get_observations(series_id, start, end)
+        return series.model_dump(), None
+    cached = await cache.get(series_key(series_id))
+    version = None
+    if cached is None:
+        cached, version = await _fetch_and_cache(client, cache, series_id)
+    return _slice(cached, start, end), version
+
+
+async def _resolve_batch(
+    body: IndicatorBatchRequest, cache: RedisCache | None
+) -> AsyncIterator[tuple[str, dict[str, Any] | None, str | None, bool]]:
+    """Yield (series_id, series, error, stale) with cache hits first, then
+    misses as their concurrent upstream fetches complete. A failed fetch
+    falls back to the stale copy when there is one."""
+    series_ids = list(dict.fromkeys(body.series_ids))
+    keys = [series_key(sid) for sid in series_ids]
+    cached = await cache.get_many(keys) if cache is not None else [None] * len(keys)
+
+    def finish(series: dict[str, Any]) -> dict[str, Any]:
+        series = _slice(series, body.start, body.end)
+        return _apply_transform(series, body) if body.active else series
+
+    misses = []
+    for sid, hit in zip(series_ids, cached):
+        if hit is None:
+            misses.append(sid)
+        else:
+            yield sid, finish(hit), None, False
+    if not misses:
+        return
+
+    client = get_fred_client()
+    limit = asyncio.Semaphore(settings.FRED_BATCH_CONCURRENCY)
+
+    async def resolve(sid: str):
+        try:
+            series, _ = await _fetch_and_cache(client, cache, sid, limit)
+            return sid, finish(series), None, False
+        except Exception as e:
+            stale = await _stale_series(cache, sid)
+            if stale is not None:
+                return sid, finish(stale), None, True
+            return sid, None, f"Upstream error from FRED: {e}", False
+
+    for done in asyncio.as_completed([resolve(sid) for sid in misses]):
+        yield await done
+
+
+@router.post(
+    "/batch",
+    response_model=IndicatorBatchResponse,
+    responses={
+        200: {
+            "content": {
+                "application/x-ndjson": {},
+                **_alternate_formats(IndicatorBatchColumns),
+            }
+        }
+    },
+)
+async def get_fred_batch(
+    body: IndicatorBatchRequest,
+    request: Request,
+    stream: bool = Query(False),
+):
+    """Resolve many FRED series in one request.
+
+    With `stream=true` the response is NDJSON, one series (or
+    `{"series_id", "error"}`) per line, written as soon as each resolves.
+    Accept selects the representation as for a single series; columnar
+    also applies to streamed lines.
+
+    Series served from a stale copy because FRED failed are listed in the
+    `X-Stale` header, or flagged `"stale": true` on their streamed line.
+    """
+    cache = get_cache(request)
+    fmt = negotiate(request)
+
+    if stream:
+
+        async def lines() -> AsyncIterator[bytes]:
+            async for sid, series, error, stale in _resolve_batch(body, cache):
+                if error is not None:
+                    item = {"series_id": sid, "error": error}
+                else:
+                    item = to_columns(series) if fmt == COLUMNAR else series
+                    if stale:
+                        item = {**item, "stale": True}
+                yield orjson.dumps(item) + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    result: dict[str, Any] = {"series": {}, "errors": {}}
+    stale_ids = []
+    async for sid, series, error, stale in _resolve_batch(body, cache):
+        if error is None:
+            result["series"][sid] = series
+        else:
+            result["errors"][sid] = error
+        if stale:
+            stale_ids.append(sid)
+    # Cached series were validated when first built; skip re-validation
+    response = Response(content=encode_batch(result, fmt), media_type=MEDIA_TYPES[fmt])
+    if stale_ids:
+        response.headers["X-Stale"] = ",".join(stale_ids)
+    return _vary(response)
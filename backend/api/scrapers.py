@@ -1,12 +1,23 @@
-from fastapi import APIRouter, HTTPException
+from collections.abc import Iterator
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from core.config import settings
+from core.http_cache import (
+    SCRAPERS_CACHE_CONTROL,
+    if_none_match,
+    make_etag,
+    not_modified,
+)
 from models.scraper import ScraperConfig
 from storage.scraper_store import ScraperStore
 
 router = APIRouter(prefix="/api/scrapers", tags=["scrapers"])
 _store: ScraperStore | None = None
 
+STREAM_CHUNK_ITEMS = 256
+
 
 def get_store() -> ScraperStore:
     global _store
@@ -15,9 +26,53 @@ def get_store() -> ScraperStore:
     return _store
 
 
-@router.get("", response_model=list[ScraperConfig])
-async def list_scrapers():
-    return get_store().list_all()
+def _iter_json_array(items: list[ScraperConfig]) -> Iterator[bytes]:
+    """Serialize a list of configs as a JSON array, a chunk of items at a time."""
+    yield b"["
+    for i in range(0, len(items), STREAM_CHUNK_ITEMS):
+        chunk = b",".join(
+            s.model_dump_json().encode() for s in items[i : i + STREAM_CHUNK_ITEMS]
+        )
+        yield chunk if i == 0 else b"," + chunk
+    yield b"]"
+
+
+@router.get(
+    "",
+    response_model=list[ScraperConfig],
+    responses={
+        200: {"headers": {"X-Next-Cursor": {"schema": {"type": "string"}}}},
+        304: {"description": "Not modified since the given ETag"},
+    },
+)
+async def list_scrapers(
+    request: Request,
+    active: bool | None = Query(None),
+    host: str | None = Query(None),
+    min_schedule: int | None = Query(None, ge=0),
+    max_schedule: int | None = Query(None, ge=0),
+    cursor: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    store = get_store()
+    etag = make_etag(store.version, request.url.query)
+    if if_none_match(request, etag):
+        return not_modified(etag, SCRAPERS_CACHE_CONTROL)
+
+    page, next_cursor = store.query(
+        active=active,
+        host=host,
+        min_schedule=min_schedule,
+        max_schedule=max_schedule,
+        cursor=cursor,
+        limit=limit,
+    )
+    headers = {"ETag": etag, "Cache-Control": SCRAPERS_CACHE_CONTROL}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return StreamingResponse(
+        _iter_json_array(page), media_type="application/json", headers=headers
+    )
 
 
 @router.post("", response_model=ScraperConfig, status_code=201)
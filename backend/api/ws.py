@@ -0,0 +1,65 @@
+import asyncio
+import json
+import logging
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from core.dependencies import get_hub
+from services.live_hub import SERIES_CHANNEL_PREFIX, LiveHub, Subscriber
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["live"])
+
+
+async def _pump(websocket: WebSocket, sub: Subscriber) -> None:
+    """Drain the subscriber's queue onto the socket."""
+    try:
+        while True:
+            payload = await sub.get()
+            await websocket.send_text(payload)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        # The receive loop notices the disconnect and cleans up
+        logger.debug("Live send failed", exc_info=True)
+
+
+async def _handle_command(hub: LiveHub, sub: Subscriber, raw: str) -> None:
+    try:
+        msg = json.loads(raw)
+        action = msg["action"]
+        if not isinstance(msg["channels"], list):
+            raise TypeError("channels must be a list")
+        channels = [str(c) for c in msg["channels"]]
+        since = {str(k): int(v) for k, v in (msg.get("since") or {}).items()}
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError):
+        logger.debug("Ignoring malformed live command: %r", raw[:200])
+        return
+    if action == "subscribe":
+        hub.subscribe(sub, channels)
+        for channel in channels:
+            if channel.startswith(SERIES_CHANNEL_PREFIX):
+                await hub.catch_up(sub, channel, since.get(channel))
+    elif action == "unsubscribe":
+        hub.unsubscribe(sub, channels)
+
+
+@router.websocket("/ws/live")
+async def live(websocket: WebSocket):
+    hub = get_hub(websocket)
+    if hub is None:
+        await websocket.close(code=1013)
+        return
+
+    await websocket.accept()
+    sub = hub.connect()
+    sender = asyncio.create_task(_pump(websocket, sub))
+    try:
+        while True:
+            await _handle_command(hub, sub, await websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        hub.disconnect(sub)
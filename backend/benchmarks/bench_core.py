@@ -0,0 +1,40 @@
+"""Micro-benchmarks for the pure-Python math on the ingest path."""
+
+import random
+
+from benchmarks.harness import benchmark
+from models.risk import RegionRiskInput
+from services.anomaly_detector import WelfordDetector
+from services.risk_engine import RiskEngine
+
+UPDATES = 20_000
+_rng = random.Random(42)
+_values = [_rng.gauss(100, 15) for _ in range(UPDATES)]
+_keys = [f"fred:S{i % 50}" for i in range(UPDATES)]
+_inputs = [
+    RegionRiskInput(
+        region_code=f"R{i}",
+        cpi_change=_rng.uniform(-2, 20),
+        unemployment_rate=_rng.uniform(0, 30),
+        bdi_change=_rng.uniform(-60, 30),
+        port_congestion=_rng.random(),
+    )
+    for i in range(1_000)
+]
+
+
+@benchmark("detector.update")
+def detector_update(env) -> int:
+    detector = WelfordDetector()
+    update = detector.update
+    for key, value in zip(_keys, _values):
+        update(key, value)
+    return UPDATES
+
+
+@benchmark("risk.calculate")
+def risk_calculate(env) -> int:
+    engine = RiskEngine()
+    for inp in _inputs:
+        engine.calculate(inp)
+    return len(_inputs)
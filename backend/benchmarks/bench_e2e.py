@@ -0,0 +1,148 @@
+"""End-to-end throughput: the FRED fetch job, API endpoints and the
+storage/LLM clients, all against the stand-ins from benchmarks.stubs."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import cache
+from unittest.mock import patch
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.bench_series_payload import _series
+from benchmarks.harness import benchmark
+from benchmarks.stubs import Stubs
+from fetchers.fred_fetcher import DEFAULT_SERIES, fetch_fred_indicators
+from core.config import settings
+from services.fred_client import FredClient
+from services.ingest import Observation
+from services.ingest_stages import build_pipeline
+from storage.series_cache import store_series
+
+CONCURRENCY = 16
+
+
+async def _gather(n: int, call: Callable[[], Awaitable[object]]) -> int:
+    gate = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with gate:
+            await call()
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return n
+
+
+@cache
+def _cached_series(series_id: str = "BENCH") -> dict:
+    return {**_series(2_000), "series_id": series_id}
+
+
+def _client() -> AsyncClient:
+    from main import app
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+
+
+@benchmark("fetch_job.fred", threshold=0.30)
+async def fetch_job(env: Stubs) -> int:
+    """Full fetch of the default series through the ingest pipeline: FRED,
+    Influx write, Redis store."""
+    fred = FredClient(api_key="bench")
+    runs = 10
+    with patch.object(settings, "INGEST_FLUSH_SECONDS", 0):
+        pipeline = build_pipeline(env.influx, env.cache)
+    await pipeline.start()
+    for _ in range(runs):
+        await fetch_fred_indicators(fred, pipeline)
+    await pipeline.close()
+    return runs * len(DEFAULT_SERIES)
+
+
+@benchmark("ingest.pipeline")
+async def ingest_pipeline(env: Stubs) -> int:
+    """Observations through every standard stage, published as fast as the
+    stages accept them."""
+    events = [
+        Observation(
+            source="bench",
+            series_id=f"S{i % 50}",
+            date=f"{2000 + i // 600}-{i // 50 % 12 + 1:02}-01",
+            value=float(i),
+            regions=("global",),
+            series={
+                "series_id": f"S{i % 50}",
+                "title": "Bench",
+                "units": "Index",
+                "frequency": "Monthly",
+                "data": [{"date": "2000-01-01", "value": float(i)}],
+            },
+        )
+        for i in range(2_000)
+    ]
+    with patch.object(settings, "INGEST_FLUSH_SECONDS", 0):
+        pipeline = build_pipeline(env.influx, env.cache)
+    await pipeline.start()
+    for event in events:
+        await pipeline.publish(event)
+    await pipeline.close()
+    return len(events)
+
+
+@benchmark("fred_client.observations", threshold=0.30)
+async def fred_observations(env: Stubs) -> int:
+    fred = FredClient(api_key="bench")
+    return await _gather(50, lambda: fred.get_observations("GDP"))
+
+
+@benchmark("api.series.cached")
+async def api_series_cached(env: Stubs) -> int:
+    """ETag-less GET of a cached series: the pre-encoded body fast path."""
+    await store_series(env.cache, "BENCH", _cached_series())
+    with patch("api.indicators.get_cache", return_value=env.cache):
+        async with _client() as ac:
+            return await _gather(300, lambda: ac.get("/api/indicators/fred/BENCH"))
+
+
+@benchmark("api.series.miss", threshold=0.30)
+async def api_series_miss(env: Stubs) -> int:
+    """No cache: every request goes to the FRED stand-in."""
+    with patch("api.indicators.get_cache", return_value=None):
+        async with _client() as ac:
+            return await _gather(100, lambda: ac.get("/api/indicators/fred/GDP"))
+
+
+@benchmark("api.batch.cached")
+async def api_batch_cached(env: Stubs) -> int:
+    ids = [f"B{i}" for i in range(10)]
+    for series_id in ids:
+        await store_series(env.cache, series_id, _cached_series(series_id))
+    with patch("api.indicators.get_cache", return_value=env.cache):
+        async with _client() as ac:
+            return await _gather(
+                100,
+                lambda: ac.post("/api/indicators/batch", json={"series_ids": ids}),
+            )
+
+
+@benchmark("redis.get_many")
+async def redis_get_many(env: Stubs) -> int:
+    keys = [f"bench:{i}" for i in range(100)]
+    for key in keys:
+        await env.cache.set(key, {"value": key})
+    for _ in range(50):
+        await env.cache.get_many(keys)
+    return 50 * len(keys)
+
+
+@benchmark("influx.write", threshold=0.30)
+async def influx_write(env: Stubs) -> int:
+    return await _gather(
+        200,
+        lambda: env.influx.write_metric("bench", {"series_id": "GDP"}, {"value": 1.0}),
+    )
+
+
+@benchmark("llm.chat", threshold=0.30)
+async def llm_chat(env: Stubs) -> int:
+    return await _gather(50, lambda: env.llm.chat("You are terse.", "Summarise GDP."))
+
@@ -0,0 +1,57 @@
+"""Compare per-request work for model-validated vs pre-encoded series bodies.
+
+Run from backend/:  python -m benchmarks.bench_series_payload
+"""
+
+import json
+import timeit
+from datetime import date, timedelta
+
+import orjson
+
+from models.indicators import IndicatorSeries
+from storage.payload_cache import PayloadCache
+
+SIZES = (1_000, 10_000, 50_000)
+
+
+def _series(points: int) -> dict:
+    first = date(1900, 1, 1)
+    return {
+        "series_id": "BENCH",
+        "title": "Benchmark series",
+        "units": "Index",
+        "frequency": "Daily",
+        "data": [
+            {"date": (first + timedelta(days=i)).isoformat(), "value": i * 0.5}
+            for i in range(points)
+        ],
+    }
+
+
+def main() -> None:
+    print(f"{'points':>8} {'validate+dump':>15} {'orjson':>10} {'cached':>10}")
+    for size in SIZES:
+        series = _series(size)
+        encoded = json.dumps(series).encode()
+        payloads = PayloadCache()
+        payloads.put("BENCH", encoded)
+
+        def validated():
+            IndicatorSeries.model_validate(series).model_dump_json()
+
+        def encoded_once():
+            orjson.dumps(series)
+
+        def cached():
+            bytes(payloads.get("BENCH"))
+
+        row = []
+        for fn in (validated, encoded_once, cached):
+            runs = 5
+            row.append(min(timeit.repeat(fn, number=runs, repeat=3)) / runs * 1000)
+        print(f"{size:>8} {row[0]:>13.3f}ms {row[1]:>8.3f}ms {row[2]:>8.4f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark registry, timing and JSON baselines.
+
+A benchmark is a function (sync or async) taking the running `Stubs` and
+doing one round of work; it returns how many operations the round did.
+Each benchmark runs one warm-up round and then `rounds` timed rounds; the
+best round's throughput is compared against the baseline, since the best
+round is the one least disturbed by the rest of the machine.
+"""
+
+import inspect
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_THRESHOLD = 0.20  # fractional throughput loss that counts as a regression
+
+
+@dataclass
+class Benchmark:
+    name: str
+    fn: Callable[[Any], Any]
+    threshold: float = DEFAULT_THRESHOLD
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_sec: float  # best round
+    median_ops_per_sec: float
+    rounds: int
+    threshold: float
+
+
+@dataclass
+class Comparison:
+    name: str
+    current: float
+    baseline: float | None
+    threshold: float
+
+    @property
+    def ratio(self) -> float | None:
+        return None if self.baseline is None else self.current / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio is not None and self.ratio < 1 - self.threshold
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, threshold: float = DEFAULT_THRESHOLD):
+    """Register the decorated function as benchmark `name`."""
+
+    def register(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        REGISTRY[name] = Benchmark(name, fn, threshold)
+        return fn
+
+    return register
+
+
+async def _round(bench: Benchmark, env: Any) -> tuple[int, float]:
+    start = time.perf_counter()
+    ops = bench.fn(env)
+    if inspect.isawaitable(ops):
+        ops = await ops
+    return ops, time.perf_counter() - start
+
+
+async def run(bench: Benchmark, env: Any, rounds: int = 5) -> Result:
+    await _round(bench, env)
+    throughputs = []
+    for _ in range(rounds):
+        ops, elapsed = await _round(bench, env)
+        throughputs.append(ops / elapsed)
+    return Result(
+        name=bench.name,
+        ops_per_sec=max(throughputs),
+        median_ops_per_sec=statistics.median(throughputs),
+        rounds=rounds,
+        threshold=bench.threshold,
+    )
+
+
+def save(results: list[Result], path: Path) -> None:
+    """Write `results` as the baseline, keeping entries for benchmarks that
+    were not run this time."""
+    existing = load(path)
+    for result in results:
+        entry = asdict(result)
+        del entry["name"]
+        entry["ops_per_sec"] = round(result.ops_per_sec, 1)
+        entry["median_ops_per_sec"] = round(result.median_ops_per_sec, 1)
+        existing[result.name] = entry
+    doc = {
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": dict(sorted(existing.items())),
+    }
+    path.write_text(json.dumps(doc, indent=2) + "\n")
+
+
+def load(path: Path) -> dict[str, dict[str, Any]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def compare(
+    results: list[Result],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float | None = None,
+) -> list[Comparison]:
+    """Pair each result with its baseline. `threshold` overrides the
+    per-benchmark thresholds recorded in the baseline."""
+    comparisons = []
+    for result in results:
+        entry = baseline.get(result.name)
+        comparisons.append(
+            Comparison(
+                name=result.name,
+                current=result.ops_per_sec,
+                baseline=entry["ops_per_sec"] if entry else None,
+                threshold=threshold
+                if threshold is not None
+                else (entry or {}).get("threshold", result.threshold),
+            )
+        )
+    return comparisons
@@ -0,0 +1,564 @@
+"""Load-test scenarios against real uvicorn workers backed by local stand-ins.
+
+Starts the FRED, Groq and Influx stand-ins (benchmarks.stubs) and a
+fakeredis TCP server, launches `uvicorn main:app --workers N` pointed at
+them, and drives it with virtual dashboard users. Run from backend/:
+
+    python -m benchmarks.load --workers 1,2,4 --users 64 --clients 4
+    python -m benchmarks.load --scenarios ws --ws-rate 50 --json ws.json
+
+Scenarios:
+  cold   each user repeatedly opens the dashboard: one getFredSeries per
+         tracked series, in parallel, with no cached ETags
+  poll   users hold ETags and re-poll every --poll-interval (mostly 304s)
+  audit  bursts of --users concurrent, distinct POST /api/audit requests
+         (raise LLM_RPM/LLM_TPM with --set to load the app, not the limiter)
+  ws     --users live subscribers on the indicators channel while updates
+         are published through the Redis fan-out at --ws-rate per second
+
+For each scenario the worker counts give one capacity curve: throughput,
+p50/p95/p99 latency, errors, and the CPU% and peak RSS of each worker
+(from Linux /proc). Users are spread over --clients generator processes;
+when "gen cpu%" nears 100 the generator, not the backend, is the limit.
+fakeredis serves one command at a time, so at high worker counts pass
+--redis-url to a real Redis.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+
+import httpx
+
+from benchmarks.stubs import StubStats, fred_app, groq_app, influx_app, serve
+from services.live_hub import REDIS_FANOUT_CHANNEL, encode_message
+
+BACKEND = Path(__file__).resolve().parents[1]
+SCENARIOS = ("cold", "poll", "audit", "ws")
+# The series EconomicRadarPanel loads on the dashboard
+TRACKED_SERIES = ("GDP", "CPIAUCSL", "UNRATE", "FEDFUNDS")
+WS_SETTLE_SECONDS = 1.0  # for subscriptions to register, and to drain
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+@dataclass
+class Recorder:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        ok: tuple[int, ...] = (200,),
+        **kwargs,
+    ) -> httpx.Response | None:
+        """Time one request to its last byte. The body is read raw, so the
+        generator does not spend CPU decompressing it."""
+        start = time.perf_counter()
+        try:
+            async with client.stream(method, url, **kwargs) as response:
+                async for _ in response.aiter_raw():
+                    pass
+        except httpx.HTTPError:
+            self.errors += 1
+            return None
+        if response.status_code in ok:
+            self.latencies.append(time.perf_counter() - start)
+        else:
+            self.errors += 1
+        return response
+
+
+@dataclass
+class Report:
+    scenario: str
+    workers: int
+    ops: int
+    errors: int
+    seconds: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    worker_cpu_percent: list[float]
+    worker_rss_mb: list[float]
+    generator_cpu_percent: float  # busiest generator process
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.ops / self.seconds
+
+
+# -- worker stats from /proc ---------------------------------------------------
+
+_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _stat_fields(pid: int) -> list[str]:
+    raw = Path(f"/proc/{pid}/stat").read_text()
+    return raw[raw.rindex(")") + 2 :].split()  # fields after "(comm)"
+
+
+def worker_pids(master: int) -> list[int]:
+    """uvicorn's worker processes; the master itself when it runs alone."""
+    children = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            ppid = int(_stat_fields(int(entry.name))[1])
+            cmdline = (entry / "cmdline").read_bytes()
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == master and b"resource_tracker" not in cmdline:
+            children.append(int(entry.name))
+    return sorted(children) or [master]
+
+
+def cpu_seconds(pid: int) -> float:
+    fields = _stat_fields(pid)
+    return (int(fields[11]) + int(fields[12])) / _TICKS  # utime + stime
+
+
+def peak_rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+@contextmanager
+def measure(pids: list[int]):
+    """Yields a dict filled with per-pid CPU% and peak RSS on exit."""
+    stats: dict[str, list[float]] = {}
+    cpu = {pid: cpu_seconds(pid) for pid in pids}
+    wall = time.perf_counter()
+    yield stats
+    wall = time.perf_counter() - wall
+    stats["cpu"] = [(cpu_seconds(p) - cpu[p]) / wall * 100 for p in pids]
+    stats["rss"] = [peak_rss_mb(p) for p in pids]
+
+
+# -- stand-ins and the backend under test ---------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def stand_ins(redis_url: str | None):
+    """Run the HTTP stand-ins (and fakeredis unless `redis_url` is given) on
+    a background thread; yields the environment for the backend."""
+    ready = threading.Event()
+    stop: asyncio.Event | None = None
+    loop: asyncio.AbstractEventLoop | None = None
+    urls: dict[str, str] = {}
+
+    async def run() -> None:
+        nonlocal stop, loop
+        stop, loop = asyncio.Event(), asyncio.get_running_loop()
+        async with (
+            serve(fred_app(StubStats())) as urls["fred"],
+            serve(groq_app(StubStats())) as urls["groq"],
+            serve(influx_app(StubStats())) as urls["influx"],
+        ):
+            ready.set()
+            await stop.wait()
+
+    thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+    thread.start()
+    ready.wait()
+
+    redis_server = None
+    if redis_url is None:
+        from fakeredis import TcpFakeServer
+
+        redis_server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+        threading.Thread(target=redis_server.serve_forever, daemon=True).start()
+        redis_url = f"redis://127.0.0.1:{redis_server.server_address[1]}"
+    try:
+        yield {
+            "REDIS_URL": redis_url,
+            "FRED_BASE_URL": f"{urls['fred']}/fred",
+            "FRED_API_KEY": "loadtest",
+            "FRED_RPM": "0",
+            "GROQ_BASE_URL": urls["groq"],
+            "GROQ_API_KEY": "loadtest",
+            "INFLUXDB_URL": urls["influx"],
+        }
+    finally:
+        loop.call_soon_threadsafe(stop.set)
+        thread.join()
+        if redis_server is not None:
+            redis_server.shutdown()
+            redis_server.server_close()
+
+
+@asynccontextmanager
+async def backend(workers: int, env: dict[str, str], log: Path):
+    """Start uvicorn with `workers` processes, logging to `log`; yields
+    (base URL, master pid) once every worker has started."""
+    port = _free_port()
+    with log.open("ab") as out:
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "main:app",
+                "--port",
+                str(port),
+                "--workers",
+                str(workers),
+                "--no-access-log",
+            ],
+            cwd=BACKEND,
+            env={**os.environ, **env},
+            stdout=out,
+            stderr=subprocess.STDOUT,
+        )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=url) as client:
+            for _ in range(300):
+                try:
+                    if (await client.get("/api/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited, see {log}")
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError(f"uvicorn did not become healthy, see {log}")
+        while len(worker_pids(proc.pid)) < workers:
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(1.0)  # the last workers finish their lifespan
+        yield url, proc.pid
+    finally:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+# -- scenarios (run inside the generator processes) ------------------------------
+
+
+@dataclass
+class Context:
+    url: str
+    client: httpx.AsyncClient
+    users: int  # this process's share
+    first_user: int
+    total_users: int
+    duration: float
+    options: dict
+
+
+async def _users(ctx: Context, user: Callable[[int, float], Awaitable[None]]) -> None:
+    """Run `user(index, deadline)` for each of this process's users."""
+    deadline = time.perf_counter() + ctx.duration
+    await asyncio.gather(
+        *(user(ctx.first_user + i, deadline) for i in range(ctx.users))
+    )
+
+
+def _series_url(series_id: str) -> str:
+    return f"/api/indicators/fred/{series_id}"
+
+
+async def cold(ctx: Context, rec: Recorder) -> None:
+    async def user(i: int, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            await asyncio.gather(
+                *(
+                    rec.request(ctx.client, "GET", _series_url(s))
+                    for s in TRACKED_SERIES
+                )
+            )
+
+    await _users(ctx, user)
+
+
+async def poll(ctx: Context, rec: Recorder) -> None:
+    interval = ctx.options["poll_interval"]
+
+    async def user(i: int, deadline: float) -> None:
+        etags = {}
+        for series_id in TRACKED_SERIES:
+            response = await ctx.client.get(_series_url(series_id))
+            etags[series_id] = response.headers.get("ETag", "")
+        # Spread users over the interval, as real dashboards would be
+        await asyncio.sleep(interval * i / ctx.total_users)
+        while time.perf_counter() < deadline:
+            tick = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    rec.request(
+                        ctx.client,
+                        "GET",
+                        _series_url(s),
+                        ok=(200, 304),
+                        headers={"If-None-Match": etags[s]},
+                    )
+                    for s in TRACKED_SERIES
+                )
+            )
+            await asyncio.sleep(max(interval - (time.perf_counter() - tick), 0))
+
+    await _users(ctx, user)
+
+
+async def audit(ctx: Context, rec: Recorder) -> None:
+    start, burst = time.perf_counter(), 0
+    while time.perf_counter() - start < ctx.duration:
+        burst += 1
+        await asyncio.gather(
+            *(
+                rec.request(
+                    ctx.client,
+                    "POST",
+                    "/api/audit",
+                    json={
+                        # Distinct descriptions, so the report cache misses
+                        "model_description": f"Load test model {burst}-{i}",
+                        "target_market": "Global",
+                        "industry": "Logistics",
+                    },
+                )
+                for i in range(ctx.first_user, ctx.first_user + ctx.users)
+            )
+        )
+
+
+async def ws(ctx: Context, rec: Recorder) -> None:
+    """Subscribers only; `publish` runs in the parent. Latency is from the
+    publish to receipt, so `rec.latencies` counts delivered messages."""
+    from websockets.asyncio.client import connect
+
+    ws_url = ctx.url.replace("http", "ws", 1) + "/ws/live"
+    subscribe = json.dumps({"action": "subscribe", "channels": ["indicators"]})
+    until = time.perf_counter() + WS_SETTLE_SECONDS * 2 + ctx.duration
+
+    async def subscriber() -> None:
+        try:
+            async with connect(ws_url, max_queue=None) as sock:
+                await sock.send(subscribe)
+                while (left := until - time.perf_counter()) > 0:
+                    try:
+                        raw = await asyncio.wait_for(sock.recv(), timeout=left)
+                    except asyncio.TimeoutError:
+                        break
+                    sent = json.loads(raw)["data"].get("sent")
+                    if sent is not None:
+                        rec.latencies.append(time.time() - sent)
+        except OSError:
+            rec.errors += 1
+
+    await asyncio.gather(*(subscriber() for _ in range(ctx.users)))
+
+
+async def publish(redis_url: str, rate: float, duration: float) -> int:
+    """Publish timestamped updates through the live fan-out; every worker's
+    hub delivers them to its subscribers. Returns how many were sent."""
+    import redis.asyncio as aioredis
+
+    redis = aioredis.from_url(redis_url)
+    await asyncio.sleep(WS_SETTLE_SECONDS)
+    start, published = time.perf_counter(), 0
+    try:
+        while time.perf_counter() - start < duration:
+            payload = encode_message(
+                "indicators", "update", {"series_id": "GDP", "sent": time.time()}
+            )
+            # Envelope format of LiveHub._relay
+            await redis.publish(
+                REDIS_FANOUT_CHANNEL, f"loadtest\nindicators\n\n{payload}"
+            )
+            published += 1
+            await asyncio.sleep(1 / rate)
+    finally:
+        await redis.aclose()
+    return published
+
+
+RUNNERS = {"cold": cold, "poll": poll, "audit": audit, "ws": ws}
+
+
+def drive(
+    name: str, url: str, share: tuple[int, int, int], duration: float, options: dict
+) -> tuple[list[float], int, float]:
+    """Generator process entry point: run `name` for users
+    [first, first + users) of `total`. Returns latencies, errors and the
+    process's CPU%."""
+
+    async def main() -> Recorder:
+        first, users, total = share
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as c:
+            rec = Recorder()
+            ctx = Context(url, c, users, first, total, duration, options)
+            await RUNNERS[name](ctx, rec)
+            return rec
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    rec = asyncio.run(main())
+    cpu_percent = (time.process_time() - cpu) / (time.perf_counter() - wall) * 100
+    return rec.latencies, rec.errors, cpu_percent
+
+
+def _shares(users: int, clients: int) -> list[tuple[int, int, int]]:
+    shares, first = [], 0
+    for i in range(clients):
+        n = users // clients + (i < users % clients)
+        if n:
+            shares.append((first, n, users))
+        first += n
+    return shares
+
+
+async def run_scenario(
+    name: str,
+    workers: int,
+    args: argparse.Namespace,
+    pool: ProcessPoolExecutor,
+) -> Report:
+    options = {"poll_interval": args.poll_interval}
+    async with backend(workers, args.env, args.log) as (url, master):
+        async with httpx.AsyncClient(base_url=url) as client:
+            # Prime the Redis series cache: "cold" is a cold browser, not a
+            # cold backend
+            for series_id in TRACKED_SERIES:
+                await client.get(_series_url(series_id))
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        with measure(worker_pids(master)) as stats:
+            runs = [
+                loop.run_in_executor(
+                    pool, drive, name, url, share, args.duration, options
+                )
+                for share in _shares(args.users, args.clients)
+            ]
+            if name == "ws":
+                published = await publish(
+                    args.env["REDIS_URL"], args.ws_rate, args.duration
+                )
+            results = await asyncio.gather(*runs)
+        seconds = time.perf_counter() - start
+
+    latencies = [t for lat, _, _ in results for t in lat]
+    errors = sum(e for _, e, _ in results)
+    if name == "ws":
+        seconds = args.duration
+        errors += args.users * published - len(latencies)  # undelivered
+    return Report(
+        scenario=name,
+        workers=workers,
+        ops=len(latencies),
+        errors=errors,
+        seconds=seconds,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        worker_cpu_percent=stats["cpu"],
+        worker_rss_mb=stats["rss"],
+        generator_cpu_percent=max(cpu for _, _, cpu in results),
+    )
+
+
+def print_curve(reports: list[Report]) -> None:
+    """One capacity curve: throughput and latency by worker count. "scale"
+    is throughput per worker relative to the smallest run."""
+    first = reports[0]
+    base = first.ops_per_sec / first.workers
+    print(f"\n{first.scenario}")
+    print(
+        f"{'workers':>7} {'ops/s':>9} {'scale':>6} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>6} {'cpu%/w':>7} {'rss MB/w':>9} {'gen cpu%':>8}"
+    )
+    for r in reports:
+        scale = r.ops_per_sec / r.workers / base if base else 0.0
+        cpu = sum(r.worker_cpu_percent) / len(r.worker_cpu_percent)
+        print(
+            f"{r.workers:>7} {r.ops_per_sec:>9,.0f} {scale:>5.0%} {r.p50_ms:>8.1f} "
+            f"{r.p95_ms:>8.1f} {r.p99_ms:>8.1f} {r.errors:>6} {cpu:>7.0f} "
+            f"{max(r.worker_rss_mb):>9.0f} {r.generator_cpu_percent:>8.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--workers", default=f"1,2,{os.cpu_count() or 4}")
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--clients", type=int, default=1, help="generator processes")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--ws-rate", type=float, default=20.0)
+    parser.add_argument("--redis-url", help="use this Redis instead of fakeredis")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="backend setting for the run, e.g. --set LLM_RPM=100000",
+    )
+    parser.add_argument("--json", type=Path, help="also write the reports here")
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    workers = sorted({int(w) for w in args.workers.split(",")})
+    args.log = Path(tempfile.mkstemp(prefix="load-uvicorn-", suffix=".log")[1])
+    print(f"Backend logs: {args.log}")
+
+    reports: list[Report] = []
+    with (
+        stand_ins(args.redis_url) as env,
+        ProcessPoolExecutor(args.clients, mp_context=get_context("spawn")) as pool,
+    ):
+        args.env = {**env, **dict(kv.split("=", 1) for kv in args.set)}
+        for name in scenarios:
+            curve = [
+                asyncio.run(run_scenario(name, n, args, pool)) for n in workers
+            ]
+            print_curve(curve)
+            reports.extend(curve)
+
+    if args.json:
+        rows = [{**asdict(r), "ops_per_sec": r.ops_per_sec} for r in reports]
+        args.json.write_text(json.dumps(rows, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
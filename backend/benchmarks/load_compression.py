@@ -0,0 +1,82 @@
+"""Local load test: bytes on the wire and server CPU per Accept-Encoding.
+
+Drives the real app in-process over ASGI with a fakeredis-backed cache
+holding one large series, so timings cover routing, the payload fast path
+and compression, but no network. Run from backend/:
+
+    python -m benchmarks.load_compression [--points 10000] [--requests 500]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from unittest.mock import patch
+
+import fakeredis
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.bench_series_payload import _series
+from main import app
+from storage.redis_cache import RedisCache
+from storage.series_cache import store_series
+
+ENCODINGS = ("identity", "gzip", "br", "zstd")
+
+
+async def _run(points: int, requests: int, concurrency: int) -> None:
+    with patch(
+        "redis.asyncio.from_url", return_value=fakeredis.FakeAsyncRedis()
+    ):
+        cache = RedisCache("redis://fake")
+    await store_series(cache, "BENCH", _series(points))
+
+    print(
+        f"{'encoding':>9} {'bytes/resp':>11} {'ratio':>6} "
+        f"{'cpu ms/req':>11} {'req/s':>8}"
+    )
+    with patch("api.indicators.get_cache", return_value=cache):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as ac:
+            baseline = None
+            for encoding in ENCODINGS:
+                headers = {"Accept-Encoding": encoding}
+                sizes: list[int] = []
+                gate = asyncio.Semaphore(concurrency)
+
+                async def one():
+                    async with gate:
+                        async with ac.stream(
+                            "GET", "/api/indicators/fred/BENCH", headers=headers
+                        ) as r:
+                            sizes.append(
+                                sum([len(c) async for c in r.aiter_raw()])
+                            )
+
+                await one()  # warm the per-version caches
+                sizes.clear()
+                cpu, wall = time.process_time(), time.perf_counter()
+                await asyncio.gather(*(one() for _ in range(requests)))
+                cpu = time.process_time() - cpu
+                wall = time.perf_counter() - wall
+
+                size = sum(sizes) / len(sizes)
+                baseline = baseline or size
+                print(
+                    f"{encoding:>9} {size:>11.0f} {baseline / size:>5.1f}x "
+                    f"{cpu / requests * 1000:>11.3f} {requests / wall:>8.0f}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(_run(args.points, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Run the benchmark suite against local stand-ins and check for regressions.
+
+Run from backend/:
+
+    python -m benchmarks.run                 # compare with baseline.json
+    python -m benchmarks.run -k api --save   # refresh those baseline entries
+
+Exits 1 when a benchmark's best-round throughput falls more than its
+threshold below the baseline. Baselines are only comparable on the
+machine that recorded them: save one on main, then compare the branch.
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks import bench_core, bench_e2e  # noqa: F401  (register benchmarks)
+from benchmarks.harness import REGISTRY, Result, compare, load, run, save
+from benchmarks.stubs import stubs
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+async def _run_all(patterns: list[str], rounds: int, delay: float) -> list[Result]:
+    selected = [
+        b
+        for name, b in REGISTRY.items()
+        if not patterns or any(fnmatch.fnmatch(name, f"*{p}*") for p in patterns)
+    ]
+    results = []
+    async with stubs(delay=delay) as env:
+        for bench in selected:
+            results.append(await run(bench, env, rounds))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="patterns", action="append", default=[])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="stub upstream latency (s)"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--threshold", type=float, help="override per-benchmark thresholds"
+    )
+    parser.add_argument("--save", action="store_true", help="write the baseline")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("fetchers.fred_fetcher").setLevel(logging.ERROR)
+
+    results = asyncio.run(_run_all(args.patterns, args.rounds, args.delay))
+    comparisons = compare(results, load(args.baseline), args.threshold)
+
+    print(f"{'benchmark':<26} {'ops/s':>11} {'median':>11} {'baseline':>11} {'':>8}")
+    for result, c in zip(results, comparisons):
+        if c.ratio is None:
+            verdict, base = "new", "-"
+        else:
+            verdict = "REGRESS" if c.regressed else f"{c.ratio:.2f}x"
+            base = f"{c.baseline:,.0f}"
+        print(
+            f"{result.name:<26} {result.ops_per_sec:>11,.0f} "
+            f"{result.median_ops_per_sec:>11,.0f} {base:>11} {verdict:>8}"
+        )
+
+    if args.save:
+        save(results, args.baseline)
+        print(f"Saved {len(results)} results to {args.baseline}")
+    elif any(c.regressed for c in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Local stand-ins for the services the backend talks to.
+
+FRED, Groq and the InfluxDB write endpoint are small Starlette apps served
+by uvicorn on 127.0.0.1, so the real clients (httpx, the Groq SDK, the
+Influx SDK over aiohttp) do their full request/response work. Redis is
+fakeredis in-process, so cache numbers cover client-side work only.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import fakeredis
+import orjson
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from core.config import settings
+from services.llm_client import LLMClient
+from storage.influxdb import InfluxStorage
+from storage.redis_cache import RedisCache
+
+
+# A canned completion that parses as a SWOT report, so audits succeed
+SWOT_ANSWER = orjson.dumps(
+    {
+        "strengths": ["Stub strength"],
+        "weaknesses": ["Stub weakness"],
+        "opportunities": ["Stub opportunity"],
+        "threats": ["Stub threat"],
+        "risk_summary": "Stub summary.",
+    }
+).decode()
+
+
+def _json(payload: object) -> Response:
+    return Response(orjson.dumps(payload), media_type="application/json")
+
+
+def observations(points: int) -> list[dict[str, str]]:
+    first = date(1950, 1, 1)
+    return [
+        {"date": (first + timedelta(days=30 * i)).isoformat(), "value": f"{i / 7:.3f}"}
+        for i in range(points)
+    ]
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    points_written: int = 0
+    by_path: dict[str, int] = field(default_factory=dict)
+
+    def hit(self, path: str) -> None:
+        self.requests += 1
+        self.by_path[path] = self.by_path.get(path, 0) + 1
+
+
+def fred_app(stats: StubStats, points: int = 1_000, delay: float = 0.0) -> Starlette:
+    """FRED's series, observations and release-date endpoints. Every series
+    has the same `points` monthly observations, paged by `offset`/`limit`
+    when given; `delay` simulates latency."""
+    history = observations(points)
+    body = orjson.dumps({"count": points, "observations": history})
+
+    async def handle(request: Request) -> Response:
+        stats.hit(request.url.path)
+        if delay:
+            await asyncio.sleep(delay)
+        series_id = request.query_params.get("series_id", "")
+        endpoint = request.path_params["endpoint"]
+        if endpoint == "series":
+            return _json(
+                {
+                    "seriess": [
+                        {
+                            "id": series_id,
+                            "title": f"Stub {series_id}",
+                            "units": "Index",
+                            "frequency": "Monthly",
+                            "last_updated": "2024-01-01 07:00:00-06",
+                        }
+                    ]
+                }
+            )
+        if endpoint == "series/observations":
+            if "limit" not in request.query_params:
+                return Response(body, media_type="application/json")
+            offset = int(request.query_params.get("offset", 0))
+            limit = int(request.query_params["limit"])
+            return _json(
+                {"count": points, "observations": history[offset : offset + limit]}
+            )
+        if endpoint == "series/release":
+            return _json({"releases": [{"id": 10}]})
+        if endpoint == "release/dates":
+            return _json({"release_dates": [{"date": "2024-02-01"}]})
+        return _json({"error_message": "unknown endpoint"})
+
+    return Starlette(routes=[Route("/fred/{endpoint:path}", handle)])
+
+
+def groq_app(stats: StubStats, delay: float = 0.0) -> Starlette:
+    """An OpenAI-compatible chat completions endpoint answering SWOT_ANSWER."""
+    body = orjson.dumps(
+        {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "bench",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": SWOT_ANSWER},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 50,
+                "completion_tokens": 100,
+                "total_tokens": 150,
+            },
+        }
+    )
+
+    async def completions(request: Request) -> Response:
+        stats.hit(request.url.path)
+        await request.body()
+        if delay:
+            await asyncio.sleep(delay)
+        return Response(body, media_type="application/json")
+
+    return Starlette(
+        routes=[Route("/openai/v1/chat/completions", completions, methods=["POST"])]
+    )
+
+
+def influx_app(stats: StubStats) -> Starlette:
+    """InfluxDB's v2 write endpoint; counts the line-protocol points."""
+
+    async def write(request: Request) -> Response:
+        stats.hit(request.url.path)
+        stats.points_written += (await request.body()).count(b"\n") + 1
+        return Response(status_code=204)
+
+    return Starlette(routes=[Route("/api/v2/write", write, methods=["POST"])])
+
+
+@asynccontextmanager
+async def serve(app: Starlette) -> AsyncIterator[str]:
+    """Run `app` on a free localhost port; yields its base URL."""
+    import uvicorn
+
+    config = uvicorn.Config(
+        app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()  # surface a failed bind
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+@dataclass
+class Stubs:
+    fred_url: str
+    groq_url: str
+    influx_url: str
+    cache: RedisCache
+    influx: InfluxStorage
+    llm: LLMClient
+    stats: dict[str, StubStats]
+
+
+def fake_cache() -> RedisCache:
+    with patch("redis.asyncio.from_url", return_value=fakeredis.FakeAsyncRedis()):
+        return RedisCache("redis://fake")
+
+
+@asynccontextmanager
+async def stubs(points: int = 1_000, delay: float = 0.0) -> AsyncIterator[Stubs]:
+    """Start all stand-ins, point FredClient and the Groq SDK at them, and
+    build the shared cache, Influx and LLM clients."""
+    stats = {name: StubStats() for name in ("fred", "groq", "influx")}
+    async with AsyncExitStack() as stack:
+        fred_url = await stack.enter_async_context(
+            serve(fred_app(stats["fred"], points, delay))
+        )
+        groq_url = await stack.enter_async_context(
+            serve(groq_app(stats["groq"], delay))
+        )
+        influx_url = await stack.enter_async_context(serve(influx_app(stats["influx"])))
+        stack.enter_context(
+            patch.object(settings, "FRED_BASE_URL", f"{fred_url}/fred")
+        )
+        stack.enter_context(patch.object(settings, "FRED_RPM", 0))  # no quota
+        # AsyncGroq reads its base URL from the environment when none is given
+        stack.enter_context(patch.dict(os.environ, {"GROQ_BASE_URL": groq_url}))
+        cache = fake_cache()
+        stack.push_async_callback(cache.close)
+        influx = InfluxStorage(influx_url, token="bench", org="bench", bucket="bench")
+        stack.push_async_callback(influx.close)
+        llm = LLMClient(api_key="bench")
+        stack.push_async_callback(llm.close)
+        yield Stubs(fred_url, groq_url, influx_url, cache, influx, llm, stats)
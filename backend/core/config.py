@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     INFLUXDB_TOKEN: str = ""
     INFLUXDB_ORG: str = "globalpulsepro"
     INFLUXDB_BUCKET: str = "trade_data"
+    INFLUXDB_BATCH_POINTS: int = 5000  # points per write in bulk loads
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
@@ -23,10 +24,64 @@ class Settings(BaseSettings):
     FIRECRAWL_API_KEY: str = ""
     GROQ_API_KEY: str = ""
 
+    # FRED
+    FRED_BASE_URL: str = "https://api.stlouisfed.org/fred"
+    FRED_BATCH_CONCURRENCY: int = 8
+    # Adaptive polling: how often due series are checked, and the poll
+    # interval around an expected release
+    FRED_POLL_TICK_MINUTES: float = 5
+    FRED_POLL_FAST_MINUTES: float = 15
+    FRED_TIMEOUT_SECONDS: float = 10.0
+    FRED_HEDGE: bool = True
+    # API key quota (FRED allows 120 requests/minute), shared through Redis by
+    # every worker using FRED_API_KEY; 0 disables the limiter
+    FRED_RPM: int = 120
+    # Backfills: series fetched concurrently, observations per request
+    # (FRED's maximum is 100000)
+    FRED_BACKFILL_CONCURRENCY: int = 4
+    FRED_BACKFILL_PAGE_SIZE: int = 10000
+    # Fixed timeout of one backfill page request (never hedged)
+    FRED_BACKFILL_TIMEOUT_SECONDS: float = 60.0
+
+    # Ingest pipeline: queued observations per stage, how long the storage
+    # stage waits to fill a batch, and the shutdown drain
+    INGEST_QUEUE_SIZE: int = 1000
+    INGEST_FLUSH_SECONDS: float = 1.0
+    INGEST_DRAIN_SECONDS: float = 5.0
+
+    # LLM (Groq): shared client limits
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_RPM: int = 30
+    LLM_TPM: int = 20000
+    LLM_TIMEOUT_SECONDS: float = 60.0
+
+    # Upstream circuit breakers (FRED, Groq)
+    UPSTREAM_FAILURE_THRESHOLD: int = 5
+    UPSTREAM_RESET_SECONDS: float = 30.0
+
+    # Audit
+    AUDIT_CACHE_TTL: int = 86400
+    AUDIT_SEMANTIC_DEDUPE: bool = False
+    AUDIT_BATCH_CONCURRENCY: int = 8
+    AUDIT_CONTEXT_TOKENS: int = 300
+
+    # Scheduler
+    SCHEDULER_JITTER_SECONDS: int = 30
+    SCHEDULER_DRAIN_SECONDS: float = 10.0
+    SCHEDULER_LEASE_SECONDS: float = 10.0
+
     # Scraper
     SCRAPER_STORE_PATH: str = "./data/scraper_store"
     SCRAPER_MAX_CONCURRENT: int = 5
 
+    # HTTP
+    COMPRESSION_MIN_SIZE: int = 1024
+
+    # Admin / profiling: the admin API and X-Trace are off while the token is
+    # empty; a watchdog threshold of 0 disables loop-stall logging
+    ADMIN_TOKEN: str = ""
+    LOOP_WATCHDOG_MS: float = 250
+
     # CORS
     cors_origins: list[str] = ["http://localhost:5173"]
 
@@ -1,6 +1,38 @@
+from fastapi.requests import HTTPConnection
+
 from core.config import settings
+from services.audit_jobs import AuditJobRunner
+from services.backfill_jobs import BackfillRunner
 from services.fred_client import FredClient
+from services.llm_client import LLMClient
+from services.live_hub import LiveHub
+from services.profiling import LoopWatchdog
+from storage.redis_cache import RedisCache
 
 
 def get_fred_client() -> FredClient:
     return FredClient(api_key=settings.FRED_API_KEY)
+
+
+def get_hub(conn: HTTPConnection) -> LiveHub | None:
+    return getattr(conn.app.state, "hub", None)
+
+
+def get_cache(conn: HTTPConnection) -> RedisCache | None:
+    return getattr(conn.app.state, "cache", None)
+
+
+def get_llm(conn: HTTPConnection) -> LLMClient | None:
+    return getattr(conn.app.state, "llm", None)
+
+
+def get_audit_jobs(conn: HTTPConnection) -> AuditJobRunner | None:
+    return getattr(conn.app.state, "audit_jobs", None)
+
+
+def get_watchdog(conn: HTTPConnection) -> LoopWatchdog | None:
+    return getattr(conn.app.state, "watchdog", None)
+
+
+def get_backfill(conn: HTTPConnection) -> BackfillRunner | None:
+    return getattr(conn.app.state, "backfill", None)
@@ -7,3 +7,14 @@ class UpstreamError(HTTPException):
             status_code=502,
             detail=f"Upstream error from {source}: {detail}",
         )
+
+
+class UpstreamUnavailable(HTTPException):
+    """The upstream's circuit breaker is open and no fallback data exists."""
+
+    def __init__(self, source: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail=f"{source} is unavailable, retry later",
+            headers={"Retry-After": str(int(retry_after))},
+        )
@@ -0,0 +1,43 @@
+"""Conditional-request helpers: strong ETags, If-None-Match and 304s."""
+
+import hashlib
+
+from fastapi import Request, Response
+
+# Series refresh every 15 minutes; let clients reuse a body for a minute and
+# serve it stale while revalidating for the rest of the fetch interval.
+SERIES_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=900"
+# Scraper configs change on user action; always revalidate (a 304 is cheap).
+SCRAPERS_CACHE_CONTROL = "private, no-cache"
+
+
+def digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def make_etag(version: str, variant: str = "") -> str:
+    """Quoted strong ETag for a payload version, optionally narrowed by a variant.
+
+    The variant (query params) is hashed, never the body, so this stays cheap.
+    """
+    if variant:
+        version = f"{version}-{digest(variant.encode())[:12]}"
+    return f'"{version}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match already covers `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
@@ -0,0 +1,140 @@
+"""Prometheus metrics shared across the backend.
+
+Hot paths get label children through `bound`, which memoizes
+`metric.labels(...)` so a recording costs a cache hit plus the update
+(well under a microsecond) instead of a locked lookup each time.
+"""
+
+import os
+from functools import lru_cache
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.metrics import MetricWrapperBase
+
+
+@lru_cache(maxsize=4096)
+def bound(metric: MetricWrapperBase, *labels: str) -> MetricWrapperBase:
+    """The child of `metric` for `labels`, created once and reused."""
+    return metric.labels(*labels)
+
+
+def render() -> bytes:
+    """Text exposition of all metrics; aggregated across worker processes
+    when PROMETHEUS_MULTIPROC_DIR is set (uvicorn --workers N)."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Redis cache reads by key prefix and result (hit, miss, stale)",
+    ["prefix", "result"],
+)
+FRED_REQUEST_SECONDS = Histogram(
+    "fred_request_seconds",
+    "FRED API call latency by endpoint and outcome",
+    ["endpoint", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16),
+)
+INFLUX_WRITE_SECONDS = Histogram(
+    "influx_write_seconds",
+    "InfluxDB write call latency",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+INFLUX_WRITE_POINTS = Histogram(
+    "influx_write_points",
+    "Points per InfluxDB write call",
+    buckets=(1, 10, 100, 500, 1000, 5000, 10000),
+)
+BACKFILL_POINTS = Counter(
+    "fred_backfill_points_total", "Observations written to InfluxDB by FRED backfills"
+)
+
+INGEST_EVENTS = Counter(
+    "ingest_events_total",
+    "Observations handled per ingest stage by outcome (ok, error, dropped)",
+    ["stage", "outcome"],
+)
+INGEST_STAGE_SECONDS = Histogram(
+    "ingest_stage_seconds",
+    "Time an ingest stage spends on one batch of observations",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+INGEST_QUEUE_DEPTH = Gauge(
+    "ingest_queue_depth", "Observations waiting per ingest stage", ["stage"]
+)
+INGEST_BLOCKED_SECONDS = Counter(
+    "ingest_blocked_seconds_total",
+    "Time publishers waited on a full ingest stage queue (backpressure)",
+    ["stage"],
+)
+
+LLM_QUEUE_SECONDS = Histogram(
+    "llm_queue_seconds",
+    "Time LLM calls wait for rate-limiter admission",
+    ["priority"],
+    buckets=(0.005, 0.05, 0.25, 1, 2.5, 5, 10, 30, 60),
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_seconds",
+    "LLM call latency after admission",
+    ["mode", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32),
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens charged to the LLM rate limiter")
+LLM_QUEUED = Gauge("llm_queued_calls", "LLM calls waiting for admission")
+
+JOB_RUN_SECONDS = Histogram(
+    "scheduler_job_run_seconds",
+    "Duration of scheduled job runs",
+    ["job", "outcome"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 900),
+)
+JOB_SKIPPED = Counter(
+    "scheduler_job_skipped_total",
+    "Scheduled runs skipped because the previous run was still going or was missed",
+    ["job", "reason"],
+)
+
+UPSTREAM_CALLS = Counter(
+    "upstream_calls_total",
+    "Calls to upstream APIs by outcome (ok, error, timeout, rejected by breaker)",
+    ["upstream", "outcome"],
+)
+UPSTREAM_HEDGES = Counter(
+    "upstream_hedged_calls_total",
+    "Second attempts started because the first ran past the p95 latency",
+    ["upstream"],
+)
+UPSTREAM_CIRCUIT_STATE = Gauge(
+    "upstream_circuit_state",
+    "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)",
+    ["upstream"],
+)
+
+LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a timer callback",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked past the watchdog threshold",
+)
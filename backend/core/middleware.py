@@ -0,0 +1,306 @@
+"""ASGI middleware."""
+
+import gzip
+import json
+import logging
+import time
+import zlib
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import HTTP_REQUEST_SECONDS, bound
+from core.security import ADMIN_HEADER, admin_token_valid
+from core.tracing import tracing
+from storage.payload_cache import PayloadCache
+
+logger = logging.getLogger(__name__)
+
+# Preference order when the client accepts several encodings equally
+ENCODINGS = ("zstd", "br", "gzip")
+# Already-compressed or tiny-gain media types are passed through
+_SKIP_MEDIA_PREFIXES = ("image/", "video/", "audio/", "application/zip")
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk so streamed
+    responses (NDJSON batches) still reach the client item by item."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=5)
+        else:
+            self._obj = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "zstd":
+            out = self._obj.compress(data)
+            flush = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else (
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+            return out + self._obj.flush(flush)
+        if self.encoding == "br":
+            out = self._obj.process(data)
+            return out + (self._obj.finish() if final else self._obj.flush())
+        out = self._obj.compress(data)
+        return out + self._obj.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def select_encoding(accept_encoding: str) -> str | None:
+    """Best supported coding from an Accept-Encoding header, None for identity."""
+    best, best_q = None, 0.0
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        candidates = ENCODINGS if coding == "*" else (coding,)
+        for candidate in candidates:
+            if candidate not in ENCODINGS or q <= 0:
+                continue
+            if q > best_q or (
+                q == best_q and ENCODINGS.index(candidate) < ENCODINGS.index(best)
+            ):
+                best, best_q = candidate, q
+    return best
+
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    """Distinct strong validator per coding: '"v"' -> '"v-br"'."""
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def _strip_encoding(tag: str) -> str:
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+class MetricsMiddleware:
+    """Record HTTP latency labelled by route template ("/api/indicators/fred/
+    {series_id}"), never the raw path, so label cardinality stays bounded.
+
+    Register it innermost: FastAPI sets `scope["route"]` on the scope it is
+    handed, and outer middleware may pass a copy down. Streamed responses
+    are timed until their last chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            bound(HTTP_REQUEST_SECONDS, scope["method"], route, str(status)).observe(
+                time.perf_counter() - start
+            )
+
+
+class TraceMiddleware:
+    """Trace one request on demand: with `X-Trace: 1` and a valid admin
+    token, FredClient, RedisCache, InfluxStorage and LLM calls made while
+    serving it are timed (see `core.tracing`). Totals per call type go back
+    in `Server-Timing`; the full span list is logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if headers.get("x-trace") != "1" or not admin_token_valid(
+            headers.get(ADMIN_HEADER)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        with tracing() as trace:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", trace.server_timing()
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+        logger.info(
+            "Trace %s %s: %s",
+            scope["method"],
+            scope["path"],
+            json.dumps(trace.as_dict()),
+        )
+
+
+class CompressionMiddleware:
+    """Negotiate zstd / br / gzip for response bodies of at least `minimum_size`.
+
+    Complete bodies with a strong ETag are compressed once per (path, ETag,
+    coding) and served from `cache` afterwards; since handlers derive ETags
+    from the payload version, a hot series is compressed once per version.
+    Streamed bodies are compressed chunk by chunk. Encoded responses get an
+    encoding-suffixed ETag; If-None-Match tags are un-suffixed on the way in
+    so handlers keep comparing against their own validators.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache: PayloadCache | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else PayloadCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        encoding = select_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        if "if-none-match" in headers:
+            scope = dict(scope)
+            raw = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            tags = ", ".join(
+                _strip_encoding(t.strip()) for t in headers["if-none-match"].split(",")
+            )
+            scope["headers"] = raw + [(b"if-none-match", tags.encode("latin-1"))]
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send
+    ):
+        self.middleware = middleware
+        self.path = scope["path"]
+        self.encoding = encoding
+        self._send = send
+        self.start: Message | None = None
+        self.passthrough = False
+        self.stream: _StreamCompressor | None = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.start is None:
+            await self._send(message)
+            return
+        if self.passthrough:
+            await self._send(message)
+            return
+        if self.stream is not None:
+            await self._send_chunk(message)
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        status = self.start["status"]
+        if status == 304:
+            self._mark_vary(headers)
+            if "etag" in headers:
+                headers["etag"] = _encoded_etag(headers["etag"], self.encoding)
+            await self._start_passthrough(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        media_type = headers.get("content-type", "")
+        if (
+            status < 200
+            or status in (204, 206)
+            or "content-encoding" in headers
+            or media_type.startswith(_SKIP_MEDIA_PREFIXES)
+            or (not more and len(body) < self.middleware.minimum_size)
+        ):
+            await self._start_passthrough(message)
+            return
+
+        self._mark_vary(headers)
+        headers["content-encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag is not None:
+            headers["etag"] = _encoded_etag(etag, self.encoding)
+
+        if more:
+            del headers["content-length"]
+            self.stream = _StreamCompressor(self.encoding)
+            await self._send(self.start)
+            await self._send_chunk(message)
+            return
+
+        compressed = None
+        cacheable = status == 200 and etag is not None and not etag.startswith("W/")
+        key = f"{self.path}|{etag}|{self.encoding}"
+        if cacheable:
+            compressed = self.middleware.cache.get(key)
+        if compressed is None:
+            compressed = _compress(body, self.encoding)
+            if cacheable:
+                self.middleware.cache.put(key, compressed)
+        headers["content-length"] = str(len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, message: Message) -> None:
+        more = message.get("more_body", False)
+        data = self.stream.chunk(message.get("body", b""), final=not more)
+        await self._send(
+            {"type": "http.response.body", "body": data, "more_body": more}
+        )
+
+    async def _start_passthrough(self, message: Message) -> None:
+        self.passthrough = True
+        await self._send(self.start)
+        await self._send(message)
+
+    @staticmethod
+    def _mark_vary(headers: MutableHeaders) -> None:
+        vary = headers.get("vary")
+        if vary is None:
+            headers["vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["vary"] = f"{vary}, Accept-Encoding"
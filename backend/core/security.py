@@ -0,0 +1,23 @@
+import secrets
+
+from fastapi import HTTPException
+from fastapi.requests import HTTPConnection
+
+from core.config import settings
+
+ADMIN_HEADER = "X-Admin-Token"
+
+
+def admin_token_valid(token: str | None) -> bool:
+    """False whenever ADMIN_TOKEN is unset, so the admin surface is off by default."""
+    expected = settings.ADMIN_TOKEN
+    return bool(expected) and token is not None and secrets.compare_digest(
+        token.encode(), expected.encode()
+    )
+
+
+def require_admin(conn: HTTPConnection) -> None:
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(404, "Not Found")
+    if not admin_token_valid(conn.headers.get(ADMIN_HEADER)):
+        raise HTTPException(403, "Admin token required")
@@ -0,0 +1,112 @@
+"""Per-request span timings, switched on by a request header.
+
+A trace lives in a ContextVar, so spans recorded by FredClient, RedisCache
+and InfluxStorage calls land in the trace of the request (task) that made
+them, including calls from tasks it spawned. With no active trace a
+`traced` call costs one ContextVar lookup.
+"""
+
+import functools
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass
+class Span:
+    name: str
+    start: float  # seconds since the trace began
+    duration: float
+    depth: int
+
+
+@dataclass
+class Trace:
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[Span] = field(default_factory=list)
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value: time so far, then total milliseconds
+        and call count per span name in first-seen order."""
+        elapsed = (time.perf_counter() - self.started) * 1000
+        totals: dict[str, list[float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span.name, [0.0, 0])
+            entry[0] += span.duration
+            entry[1] += 1
+        return ", ".join(
+            [f"total;dur={elapsed:.2f}"]
+            + [
+                f'{name};dur={total * 1000:.2f};desc="{count}x"'
+                for name, (total, count) in totals.items()
+            ]
+        )
+
+    def as_dict(self) -> list[dict]:
+        return [
+            {
+                "name": s.name,
+                "start_ms": round(s.start * 1000, 3),
+                "duration_ms": round(s.duration * 1000, 3),
+                "depth": s.depth,
+            }
+            for s in self.spans
+        ]
+
+
+_current: ContextVar[Trace | None] = ContextVar("trace", default=None)
+# Nesting is per task: tasks spawned inside a span (asyncio.gather) start
+# from the depth at spawn time, so sibling spans are recorded as siblings
+_depth: ContextVar[int] = ContextVar("trace_depth", default=0)
+
+
+@contextmanager
+def tracing() -> Iterator[Trace]:
+    """Collect spans from everything awaited inside the block."""
+    trace = Trace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block as span `name` if a trace is active."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start, depth = time.perf_counter(), _depth.get()
+    token = _depth.set(depth + 1)
+    try:
+        yield
+    finally:
+        _depth.reset(token)
+        end = time.perf_counter()
+        trace.spans.append(Span(name, start - trace.started, end - start, depth))
+
+
+def traced(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Record each await of the decorated coroutine function as span `name`."""
+
+    def decorate(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if _current.get() is None:
+                return await func(*args, **kwargs)
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
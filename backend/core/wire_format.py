@@ -0,0 +1,96 @@
+"""Content negotiation and encoders for indicator series representations.
+
+`json` is the default `{date, value}` row shape. `columnar` is the same
+series as parallel `dates` / `values` arrays. `msgpack` is the columnar
+shape in MessagePack with `values` packed as little-endian float64 bytes
+(NaN for missing), so clients can wrap it in a Float64Array without parsing.
+"""
+
+from typing import Any
+
+import msgpack
+import numpy as np
+import orjson
+from fastapi import Request
+
+JSON = "json"
+COLUMNAR = "columnar"
+MSGPACK = "msgpack"
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.globalpulse.columnar+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+MEDIA_TYPES = {
+    JSON: "application/json",
+    COLUMNAR: COLUMNAR_MEDIA_TYPE,
+    MSGPACK: MSGPACK_MEDIA_TYPE,
+}
+_ACCEPTED = {
+    "application/json": JSON,
+    COLUMNAR_MEDIA_TYPE: COLUMNAR,
+    MSGPACK_MEDIA_TYPE: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+
+def negotiate(request: Request) -> str:
+    """Pick the representation with the highest q in Accept; JSON on ties or none."""
+    header = request.headers.get("accept")
+    if not header:
+        return JSON
+    best, best_q = JSON, 0.0
+    for part in header.split(","):
+        media, _, params = part.strip().partition(";")
+        fmt = _ACCEPTED.get(media.strip().lower())
+        if fmt is None:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q or (q == best_q and fmt == JSON):
+            best, best_q = fmt, q
+    return best
+
+
+def to_columns(series: dict[str, Any]) -> dict[str, Any]:
+    """Row-shaped series to parallel `dates` / `values` arrays."""
+    data = series["data"]
+    return {
+        **{k: v for k, v in series.items() if k != "data"},
+        "dates": [p["date"] for p in data],
+        "values": [p["value"] for p in data],
+    }
+
+
+def _packed(series: dict[str, Any]) -> dict[str, Any]:
+    columns = to_columns(series)
+    values = np.array(
+        [np.nan if v is None else v for v in columns["values"]], dtype="<f8"
+    )
+    return {**columns, "values": values.tobytes()}
+
+
+def encode_series(series: dict[str, Any], fmt: str) -> bytes:
+    if fmt == COLUMNAR:
+        return orjson.dumps(to_columns(series))
+    if fmt == MSGPACK:
+        return msgpack.packb(_packed(series))
+    return orjson.dumps(series)
+
+
+def encode_batch(result: dict[str, Any], fmt: str) -> bytes:
+    """Encode a `{"series": {...}, "errors": {...}}` batch result."""
+    if fmt == JSON:
+        return orjson.dumps(result)
+    shape = _packed if fmt == MSGPACK else to_columns
+    body = {
+        "series": {sid: shape(s) for sid, s in result["series"].items()},
+        "errors": result["errors"],
+    }
+    return msgpack.packb(body) if fmt == MSGPACK else orjson.dumps(body)
@@ -0,0 +1,140 @@
+"""Load full FRED series histories into InfluxDB.
+
+The live fetch job writes one point per run; this pages through whole
+histories instead. As a command (run from backend/, against the
+configured Redis and InfluxDB):
+
+    python -m fetchers.fred_backfill GDP CPIAUCSL UNRATE --start 1950-01-01
+    python -m fetchers.fred_backfill --resume   # continue unfinished jobs
+"""
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from core.metrics import BACKFILL_POINTS
+from services.fred_client import FredClient
+from storage.influxdb import InfluxStorage
+
+logger = logging.getLogger(__name__)
+
+MEASUREMENT = "fred"  # same measurement and tags as the live fetch job
+
+
+def _timestamp(day: str) -> datetime:
+    return datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+
+
+async def backfill_series(
+    fred: FredClient,
+    influx: InfluxStorage,
+    series_id: str,
+    checkpoint: dict[str, Any],
+    save: Callable[[dict[str, Any]], Awaitable[None]],
+    start: str | None = None,
+    page_size: int = 10_000,
+    batch_points: int = 5_000,
+) -> dict[str, Any]:
+    """Write the observations of `series_id` from `checkpoint["offset"]` on
+    to InfluxDB, stamped with their observation dates. Returns the final
+    checkpoint.
+
+    Pages are requested oldest first with FRED's limit/offset, and the next
+    page is fetched while the current one is written in batches of
+    `batch_points`; `save` receives the checkpoint after every batch. Points
+    are keyed by series and date, so writing one twice (after a resume)
+    overwrites it rather than duplicating it.
+    """
+    state = dict(checkpoint)
+    tags = {"series_id": series_id}
+
+    def fetch(offset: int) -> Awaitable[dict[str, Any]]:
+        return fred.get_observation_page(series_id, offset, page_size, start)
+
+    page = await fetch(state["offset"])
+    upcoming: asyncio.Future | None = None
+    try:
+        while True:
+            observations = page["observations"]
+            state["count"] = page["count"]
+            end = state["offset"] + len(observations)
+            if observations and end < page["count"]:
+                upcoming = asyncio.ensure_future(fetch(end))
+            for i in range(0, len(observations), batch_points):
+                batch = observations[i : i + batch_points]
+                rows = [
+                    (_timestamp(obs["date"]), {"value": float(obs["value"])})
+                    for obs in batch
+                    if obs["value"] != "."
+                ]
+                written = await influx.write_batch(MEASUREMENT, tags, rows)
+                BACKFILL_POINTS.inc(written)
+                state["points"] += written
+                state["offset"] += len(batch)
+                await save(state)
+            if upcoming is None:
+                break
+            page, upcoming = await upcoming, None
+    finally:
+        if upcoming is not None:
+            upcoming.cancel()
+    state["done"] = True
+    await save(state)
+    return state
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.config import settings
+    from services.backfill_jobs import build_runner
+    from storage.redis_cache import RedisCache
+
+    cache = RedisCache(settings.REDIS_URL)
+    influx = InfluxStorage(
+        url=settings.INFLUXDB_URL,
+        token=settings.INFLUXDB_TOKEN,
+        org=settings.INFLUXDB_ORG,
+        bucket=settings.INFLUXDB_BUCKET,
+    )
+    runner = build_runner(cache, influx)
+    try:
+        if args.resume:
+            job_ids = await runner.resume()
+        else:
+            job_ids = [await runner.submit(args.series_ids, args.start)]
+        for job_id in job_ids:
+            print(f"Backfill job {job_id}")
+        while not await runner.wait(timeout=5):
+            for job_id in job_ids:
+                progress = (await runner.store.progress(job_id)).values()
+                done = sum(p["done"] for p in progress)
+                points = sum(p["points"] for p in progress)
+                print(f"{job_id}: {done}/{len(progress)} series, {points} points")
+        for job_id in job_ids:
+            for series_id, p in (await runner.store.progress(job_id)).items():
+                status = p["error"] or ("done" if p["done"] else "incomplete")
+                print(f"{series_id:>16} {p['points']:>8} points  {status}")
+    finally:
+        await runner.close()
+        await influx.close()
+        await cache.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill FRED series histories")
+    parser.add_argument("series_ids", nargs="*", metavar="SERIES_ID")
+    parser.add_argument("--start", help="first observation date, YYYY-MM-DD")
+    parser.add_argument(
+        "--resume", action="store_true", help="continue unfinished jobs instead"
+    )
+    args = parser.parse_args()
+    if not args.resume and not args.series_ids:
+        parser.error("give series ids or --resume")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,69 @@
 import logging
 
 from services.fred_client import FredClient
-from storage.influxdb import InfluxStorage
-from storage.redis_cache import RedisCache
+from services.ingest import IngestPipeline, Observation
+from services.poll_planner import PollPlanner
+from storage.series_cache import SERIES_TTL, touch_series
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_SERIES = ["GDP", "CPIAUCSL", "UNRATE", "FEDFUNDS"]
+# The default series are US aggregates; they also serve as the global backdrop
+SUMMARY_REGIONS = ("americas", "global")
+
+# Latest observation date seen per series, so observations are only marked
+# new (for live updates and the detector) when FRED publishes a new point.
+_latest_dates: dict[str, str] = {}
 
 
 async def fetch_fred_indicators(
     fred: FredClient,
-    influx: InfluxStorage,
-    cache: RedisCache,
+    pipeline: IngestPipeline,
+    planner: PollPlanner | None = None,
 ) -> None:
-    """Fetch the latest observations for each default FRED series,
-    write the most recent value to InfluxDB, and cache the full series in Redis."""
-    for series_id in DEFAULT_SERIES:
+    """Fetch the latest observations for each default FRED series and
+    publish them to the ingest pipeline, whose stages store, cache, analyse
+    and broadcast them.
+
+    With a `planner`, only series due for a poll are checked, and their
+    observations are fetched only when FRED reports them updated. A poll is
+    committed only once its series is published, so one that fails is
+    retried on the next run."""
+    series_ids = DEFAULT_SERIES
+    if planner is not None:
+        series_ids = await planner.due(DEFAULT_SERIES)
+    for series_id in series_ids:
         try:
-            series = await fred.get_observations(series_id)
-            if series.data:
-                latest = series.data[-1]
-                await influx.write_metric(
-                    measurement="fred",
-                    tags={"series_id": series_id},
-                    fields={"value": latest.value},
+            ttl, poll = SERIES_TTL, None
+            if planner is None:
+                series = await fred.get_observations(series_id)
+            else:
+                info = await fred.get_series_info(series_id)
+                poll = await planner.plan(series_id, info)
+                ttl = poll.ttl
+                if not poll.changed:
+                    await touch_series(planner.cache, series_id, ttl)
+                    await planner.commit(poll)
+                    continue
+                series = await fred.get_observations(series_id, info=info)
+            latest = series.data[-1] if series.data else None
+            new = latest is not None and _latest_dates.get(series_id) != latest.date
+            if new:
+                _latest_dates[series_id] = latest.date
+            await pipeline.publish(
+                Observation(
+                    source="fred",
+                    series_id=series_id,
+                    date=latest.date if latest else None,
+                    value=latest.value if latest else None,
+                    regions=SUMMARY_REGIONS,
+                    series=series.model_dump(),
+                    ttl=ttl,
+                    new=new,
                 )
-            await cache.set(f"fred:{series_id}", series.model_dump(), ttl=900)
+            )
+            if poll is not None:
+                await planner.commit(poll)
             logger.info(f"FRED {series_id}: {len(series.data)} points fetched")
         except Exception:
             logger.exception(f"Failed to fetch FRED {series_id}")
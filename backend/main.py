@@ -1,14 +1,27 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 
+from api.audit import get_audit_engine
 from api.router import api_router
 from core.config import settings
+from core.metrics import render as render_metrics
+from core.middleware import CompressionMiddleware, MetricsMiddleware, TraceMiddleware
+from services.audit_jobs import AuditJobRunner
+from services.backfill_jobs import build_runner as build_backfill_runner
+from services.fred_client import share_quota as share_fred_quota
+from services.ingest_stages import build_pipeline
+from services.live_hub import LiveHub
+from services.llm_client import LLMClient
+from services.llm_limiter import LLMRateLimiter, Priority
+from services.profiling import LoopWatchdog
+from storage.audit_jobs import AuditJobStore
 from storage.influxdb import InfluxStorage
 from storage.redis_cache import RedisCache
-from scheduler.jobs import register_jobs, start_scheduler, stop_scheduler
+from storage.series_cache import series_key
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,23 +29,79 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # APScheduler and the Redis client SDK load here rather than on import,
+    # so importing the app (tests, tooling) stays fast
+    from scheduler.jobs import (
+        pause_scheduler,
+        register_jobs,
+        resume_scheduler,
+        start_scheduler,
+        stop_scheduler,
+    )
+    from scheduler.leader import LeaderElector
+
     # Startup
     app.state.influx = InfluxStorage(
-        url=settings.influxdb_url,
-        token=settings.influxdb_token,
-        org=settings.influxdb_org,
-        bucket=settings.influxdb_bucket,
+        url=settings.INFLUXDB_URL,
+        token=settings.INFLUXDB_TOKEN,
+        org=settings.INFLUXDB_ORG,
+        bucket=settings.INFLUXDB_BUCKET,
+    )
+    app.state.cache = RedisCache(url=settings.REDIS_URL)
+    share_fred_quota(app.state.cache.redis)
+    app.state.hub = LiveHub(
+        redis=app.state.cache.redis,
+        snapshot_loader=lambda series_id: app.state.cache.get(series_key(series_id)),
+    )
+    await app.state.hub.start()
+    app.state.llm = LLMClient(
+        api_key=settings.GROQ_API_KEY,
+        limiter=LLMRateLimiter(
+            rpm=settings.LLM_RPM,
+            tpm=settings.LLM_TPM,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        ),
+    )
+    app.state.audit_jobs = AuditJobRunner(
+        AuditJobStore(app.state.cache),
+        get_audit_engine(app.state.cache, app.state.llm, Priority.BACKGROUND),
+        concurrency=settings.AUDIT_BATCH_CONCURRENCY,
     )
-    app.state.cache = RedisCache(url=settings.redis_url)
+    await app.state.audit_jobs.start()
+    app.state.backfill = build_backfill_runner(app.state.cache, app.state.influx)
+    await app.state.backfill.start()
 
-    register_jobs(app.state.influx, app.state.cache)
-    start_scheduler()
+    app.state.ingest = build_pipeline(app.state.influx, app.state.cache, app.state.hub)
+    await app.state.ingest.start()
+
+    # Every worker registers the jobs; only the lease holder runs them.
+    register_jobs(app.state.ingest, app.state.cache)
+    app.state.leader = LeaderElector(
+        app.state.cache.redis,
+        lease=settings.SCHEDULER_LEASE_SECONDS,
+        on_elected=resume_scheduler,
+        on_demoted=pause_scheduler,
+    )
+    start_scheduler(app.state.leader)
+    await app.state.leader.start()
+    # Started last: SDK imports and client setup above block the loop once
+    if settings.LOOP_WATCHDOG_MS > 0:
+        app.state.watchdog = LoopWatchdog(threshold=settings.LOOP_WATCHDOG_MS / 1000)
+        app.state.watchdog.start()
     logger.info("Global Pulse Pro backend started")
 
     yield
 
     # Shutdown
-    stop_scheduler()
+    if settings.LOOP_WATCHDOG_MS > 0:
+        await app.state.watchdog.stop()
+    await stop_scheduler()
+    await app.state.leader.close()
+    await app.state.ingest.close()
+    await app.state.audit_jobs.close()
+    await app.state.backfill.close()
+    await app.state.hub.close()
+    await app.state.llm.close()
     await app.state.influx.close()
     await app.state.cache.close()
     logger.info("Global Pulse Pro backend stopped")
@@ -44,13 +113,18 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Innermost, so it sees the matched route (see MetricsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TraceMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Stale"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
 
 app.include_router(api_router)
 
@@ -58,3 +132,8 @@ app.include_router(api_router)
 @app.get("/api/health")
 async def health():
     return {"status": "ok", "version": "3.0.0"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,40 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ProfileStarted(BaseModel):
+    worker: int  # pid; profiling is per worker process
+    interval_ms: float
+    max_seconds: float
+
+
+class LoopStats(BaseModel):
+    worker: int
+    threshold_ms: float
+    max_lag_ms: float
+    stalls: int
+
+
+class BackfillRequest(BaseModel):
+    series_ids: list[str] = Field(min_length=1, max_length=1000)
+    start: str | None = None  # first observation date, YYYY-MM-DD
+
+
+class BackfillSeriesProgress(BaseModel):
+    series_id: str
+    offset: int  # observations (oldest first) already written
+    count: int | None  # total observations, once the first page arrived
+    points: int  # non-missing observations written
+    done: bool
+    error: str | None
+
+
+class BackfillJobStatus(BaseModel):
+    job_id: str
+    status: Literal["running", "done", "failed"]
+    start: str | None
+    total: int
+    completed: int
+    points: int
+    series: list[BackfillSeriesProgress]
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class AuditRequest(BaseModel):
@@ -13,3 +15,34 @@ class SWOTReport(BaseModel):
     opportunities: list[str]
     threats: list[str]
     risk_summary: str
+
+
+class AuditCacheStats(BaseModel):
+    exact: int
+    semantic: int
+    miss: int
+    hit_rate: float
+
+
+class AuditBatchRequest(BaseModel):
+    items: list[AuditRequest] = Field(min_length=1, max_length=1000)
+
+
+class AuditJobStatus(BaseModel):
+    job_id: str
+    status: Literal["running", "done"]
+    total: int
+    unique: int
+    completed: int
+
+
+class AuditJobItem(BaseModel):
+    key: str
+    indices: list[int]  # positions in the submitted `items` sharing this result
+    report: SWOTReport | None
+    error: str | None
+
+
+class AuditJobResults(AuditJobStatus):
+    results: list[AuditJobItem]
+    next_cursor: int
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class IndicatorPoint(BaseModel):
@@ -12,3 +14,49 @@ class IndicatorSeries(BaseModel):
     units: str
     frequency: str
     data: list[IndicatorPoint]
+
+
+class IndicatorSeriesColumns(BaseModel):
+    """Columnar representation of an IndicatorSeries: parallel date/value arrays."""
+
+    series_id: str
+    title: str
+    units: str
+    frequency: str
+    dates: list[str]
+    values: list[float | None]
+
+
+class SeriesTransform(BaseModel):
+    """Server-side reduction applied before a series is returned."""
+
+    max_points: int | None = Field(None, ge=3, le=20000)
+    downsample: Literal["lttb", "minmax"] = "lttb"
+    freq: Literal["weekly", "monthly", "quarterly"] | None = None
+    agg: Literal["mean", "last", "sum"] = "mean"
+
+    @property
+    def active(self) -> bool:
+        return self.max_points is not None or self.freq is not None
+
+    def cache_field(self, start: str | None, end: str | None) -> str:
+        return (
+            f"{start or ''}|{end or ''}|{self.freq or ''}|{self.agg}"
+            f"|{self.max_points or ''}|{self.downsample}"
+        )
+
+
+class IndicatorBatchRequest(SeriesTransform):
+    series_ids: list[str] = Field(min_length=1, max_length=50)
+    start: str | None = None
+    end: str | None = None
+
+
+class IndicatorBatchResponse(BaseModel):
+    series: dict[str, IndicatorSeries]
+    errors: dict[str, str]
+
+
+class IndicatorBatchColumns(BaseModel):
+    series: dict[str, IndicatorSeriesColumns]
+    errors: dict[str, str]
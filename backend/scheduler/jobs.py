@@ -1,44 +1,153 @@
 import asyncio
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
 
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobEvent
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from core.config import settings
+from core.metrics import JOB_RUN_SECONDS, JOB_SKIPPED, bound
 from services.fred_client import FredClient
-from storage.influxdb import InfluxStorage
+from services.ingest import IngestPipeline
+from services.poll_planner import PollPlanner
 from storage.redis_cache import RedisCache
 from fetchers.fred_fetcher import fetch_fred_indicators
+from scheduler.leader import LeaderElector, StaleLeaderError
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
+# One run per job at a time; a backlog of missed runs collapses into one.
+# add_interval_job sets the same explicitly so it is visible on pending jobs.
+scheduler = AsyncIOScheduler(
+    job_defaults={"max_instances": 1, "coalesce": True, "misfire_grace_time": 300}
+)
+_running: set[asyncio.Task] = set()
+_leader: LeaderElector | None = None
 
 
-def _run_async(coro_func, *args, **kwargs):
-    """Schedule an async coroutine as a task on the running event loop."""
-    loop = asyncio.get_event_loop()
-    loop.create_task(coro_func(*args, **kwargs))
+async def _timed(job_id: str, func: Callable[..., Awaitable[Any]], *args) -> None:
+    """Run a job coroutine on the scheduler's loop, recording its duration and
+    outcome. Exceptions propagate so APScheduler logs them as job errors.
 
+    Under leader election the run first fences with the leader's token and
+    is skipped if this worker no longer leads."""
+    if _leader is not None:
+        try:
+            await _leader.fence()
+        except StaleLeaderError as exc:
+            bound(JOB_SKIPPED, job_id, "not_leader").inc()
+            logger.warning("Skipped run of job %s (%s)", job_id, exc)
+            return
+    task = asyncio.current_task()
+    _running.add(task)
+    start, outcome = time.perf_counter(), "error"
+    try:
+        await func(*args)
+        outcome = "ok"
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    finally:
+        bound(JOB_RUN_SECONDS, job_id, outcome).observe(time.perf_counter() - start)
+        _running.discard(task)
 
-def register_jobs(influx: InfluxStorage, cache: RedisCache) -> None:
-    """Register all periodic fetcher jobs on the scheduler."""
-    fred = FredClient(api_key=settings.FRED_API_KEY)
+
+def _on_skipped(event: JobEvent) -> None:
+    reason = "overlap" if event.code == EVENT_JOB_MAX_INSTANCES else "missed"
+    bound(JOB_SKIPPED, event.job_id, reason).inc()
+    logger.warning("Skipped run of job %s (%s)", event.job_id, reason)
+
+
+scheduler.add_listener(_on_skipped, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+
+
+def add_interval_job(
+    func: Callable[..., Awaitable[Any]],
+    job_id: str,
+    name: str,
+    minutes: float,
+    args: list | None = None,
+) -> None:
+    """Schedule a coroutine every `minutes`, jittered so jobs sharing an
+    interval do not fire (and hit upstreams) in the same instant."""
     scheduler.add_job(
-        _run_async,
+        _timed,
         "interval",
-        minutes=15,
-        args=[fetch_fred_indicators, fred, influx, cache],
-        id="fred_fetcher",
-        name="Fetch FRED indicators",
+        minutes=minutes,
+        jitter=settings.SCHEDULER_JITTER_SECONDS,
+        args=[job_id, func, *(args or [])],
+        id=job_id,
+        name=name,
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+
+def register_jobs(pipeline: IngestPipeline, cache: RedisCache) -> None:
+    """Register all periodic fetcher jobs on the scheduler; fetchers publish
+    what they fetch to `pipeline`.
+
+    The FRED job ticks often but only polls series the planner marks due."""
+    fred = FredClient(api_key=settings.FRED_API_KEY)
+    planner = PollPlanner(cache, fred, fast=settings.FRED_POLL_FAST_MINUTES * 60)
+    add_interval_job(
+        fetch_fred_indicators,
+        "fred_fetcher",
+        "Fetch FRED indicators",
+        minutes=settings.FRED_POLL_TICK_MINUTES,
+        args=[fred, pipeline, planner],
     )
 
 
-def start_scheduler() -> None:
-    """Start the APScheduler event loop."""
-    scheduler.start()
+def start_scheduler(leader: LeaderElector | None = None) -> None:
+    """Start the scheduler on the running event loop.
+
+    With a `leader`, the scheduler starts paused and only runs jobs while
+    that elector holds the lease; wire its callbacks to `resume_scheduler`
+    and `pause_scheduler`."""
+    global _leader
+    _leader = leader
+    scheduler.start(paused=leader is not None)
+
+
+async def resume_scheduler() -> None:
+    """Leadership gained: start running jobs (overdue runs fire right away)."""
+    if scheduler.running:
+        scheduler.resume()
+
+
+async def pause_scheduler() -> None:
+    """Leadership lost: stop starting runs and cancel in-flight ones, since a
+    newly elected worker may already be running the same jobs."""
+    if not scheduler.running:
+        return
+    scheduler.pause()
+    tasks = set(_running)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
-def stop_scheduler() -> None:
-    """Gracefully shut down the scheduler."""
+async def stop_scheduler(timeout: float | None = None) -> None:
+    """Stop starting runs, give in-flight runs up to `timeout` seconds
+    (SCHEDULER_DRAIN_SECONDS by default) to finish, then cancel the rest."""
+    global _leader
+    if not scheduler.running:
+        return
+    if timeout is None:
+        timeout = settings.SCHEDULER_DRAIN_SECONDS
+    scheduler.pause()
+    pending: set[asyncio.Task] = set()
+    if _running:
+        _, pending = await asyncio.wait(set(_running), timeout=timeout)
+        if pending:
+            logger.warning("Cancelling %d job run(s) still in flight", len(pending))
     scheduler.shutdown(wait=False)
+    await asyncio.sleep(0)  # shutdown runs via call_soon on this loop
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    _leader = None
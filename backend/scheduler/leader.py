@@ -0,0 +1,172 @@
+"""Redis-lease leader election so one worker runs the scheduled jobs.
+
+    leader:{name}         str  "{worker_id}:{token}" of the current leader,
+                               expiring after `lease` seconds unless renewed
+    leader:{name}:token   int  fencing token, incremented on every election
+    leader:{name}:fence   int  highest token that has started a job run
+
+Every worker runs an elector; only the one holding the lease resumes its
+scheduler. The leader renews every `lease / 3` seconds and steps down as
+soon as a renewal finds the lease gone or its local lease time runs out,
+so a partitioned leader stops before another worker can be elected.
+
+A leader that stalls (GC pause, blocked loop) past its lease may still
+wake up believing it leads. `fence` guards against that: a job run first
+records its token in the fence key and refuses to start if a newer leader
+has already recorded a higher one.
+
+Ownership checks use WATCH/MULTI rather than Lua so they also run against
+fakeredis in tests.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class StaleLeaderError(Exception):
+    """A newer leader has taken over; the caller must not act as leader."""
+
+
+class LeaderElector:
+    def __init__(
+        self,
+        redis: Redis,
+        name: str = "scheduler",
+        lease: float = 10.0,
+        on_elected: Callback | None = None,
+        on_demoted: Callback | None = None,
+        worker_id: str | None = None,
+    ):
+        self.redis = redis
+        self.key = f"leader:{name}"
+        self.lease = lease
+        self.worker_id = worker_id or uuid.uuid4().hex
+        self.token: int | None = None
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._valid_until = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.token is not None and time.monotonic() < self._valid_until
+
+    @property
+    def _value(self) -> bytes:
+        return f"{self.worker_id}:{self.token}".encode()
+
+    async def start(self) -> None:
+        """Try once right away, then campaign or renew in the background."""
+        await self.step()
+        self._task = asyncio.create_task(self._loop())
+
+    async def close(self) -> None:
+        """Stop campaigning and hand the lease back so a peer takes over now
+        rather than after it expires."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.token is None:
+            return
+        value = self._value
+        await self._demote("stepped down from")
+        try:
+            await self._if_owner(value, lambda pipe: pipe.delete(self.key))
+        except RedisError:
+            logger.warning("Could not release leader lease %s", self.key)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await self.step()
+            except Exception as exc:
+                logger.warning("Leader election for %s failed: %s", self.key, exc)
+                if self.token is not None and not self.is_leader:
+                    await self._demote()
+
+    async def step(self) -> None:
+        """Renew the lease if leading, otherwise try to take it."""
+        if self.token is not None:
+            started = time.monotonic()
+            renewed = await self._if_owner(
+                self._value, lambda pipe: pipe.pexpire(self.key, self._lease_ms)
+            )
+            if renewed and started < self._valid_until:
+                self._valid_until = started + self.lease
+            else:
+                await self._demote()
+            return
+        started = time.monotonic()
+        claim = f"{self.worker_id}:claiming"
+        if not await self.redis.set(self.key, claim, nx=True, px=self._lease_ms):
+            return
+        token = await self.redis.incr(f"{self.key}:token")
+        await self.redis.set(
+            self.key, f"{self.worker_id}:{token}", xx=True, px=self._lease_ms
+        )
+        self.token = token
+        self._valid_until = started + self.lease
+        logger.info("Worker %s leads %s (token %d)", self.worker_id, self.key, token)
+        if self._on_elected is not None:
+            await self._on_elected()
+
+    async def fence(self) -> int:
+        """Record this leader's token as the latest to act and return it.
+
+        Raises StaleLeaderError when not leading or when a newer leader has
+        already fenced with a higher token.
+        """
+        if not self.is_leader:
+            raise StaleLeaderError(f"{self.worker_id} does not hold {self.key}")
+        token, fence_key = self.token, f"{self.key}:fence"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(fence_key)
+            current = await pipe.get(fence_key)
+            if current is not None and int(current) > token:
+                await pipe.unwatch()
+                raise StaleLeaderError(f"token {token} superseded by {int(current)}")
+            pipe.multi()
+            pipe.set(fence_key, token)
+            try:
+                await pipe.execute()
+            except WatchError:
+                raise StaleLeaderError(f"token {token} raced a newer leader")
+        return token
+
+    @property
+    def _lease_ms(self) -> int:
+        return int(self.lease * 1000)
+
+    async def _if_owner(self, value: bytes, action: Callable) -> bool:
+        """Apply `action` to a MULTI pipeline only while the lease holds `value`."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(self.key)
+            if await pipe.get(self.key) != value:
+                await pipe.unwatch()
+                return False
+            pipe.multi()
+            action(pipe)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    async def _demote(self, reason: str = "lost") -> None:
+        logger.warning("Worker %s %s %s", self.worker_id, reason, self.key)
+        self.token = None
+        self._valid_until = 0.0
+        if self._on_demoted is not None:
+            await self._on_demoted()
@@ -0,0 +1,138 @@
+"""Market context for audit prompts, read from precomputed region summaries."""
+
+import re
+
+from storage.redis_cache import RedisCache
+from storage.region_summary import get_summaries
+
+GLOBAL_REGION = "global"
+
+# Checked in order, so sub-regions win over the region containing them
+REGION_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "seasia": (
+        "southeast asia", "asean", "vietnam", "thailand", "indonesia",
+        "malaysia", "philippines", "singapore", "東南亞", "越南", "泰國",
+        "印尼", "馬來西亞", "菲律賓", "新加坡",
+    ),
+    "latam": (
+        "latin america", "latin american", "south america", "south american",
+        "brazil", "mexico", "argentina",
+        "chile", "colombia", "peru", "拉丁美洲", "拉美", "巴西", "墨西哥",
+        "阿根廷", "智利",
+    ),
+    "mena": (
+        "middle east", "mena", "saudi", "uae", "dubai", "egypt", "turkey",
+        "israel", "qatar", "中東", "沙烏地", "杜拜", "埃及", "土耳其",
+    ),
+    "africa": (
+        "africa", "nigeria", "kenya", "ethiopia", "ghana", "非洲", "南非",
+        "奈及利亞", "肯亞",
+    ),
+    "europe": (
+        "europe", "eu", "uk", "britain", "germany", "france", "italy", "spain",
+        "netherlands", "poland", "歐洲", "歐盟", "英國", "德國", "法國",
+    ),
+    "apac": (
+        "asia", "apac", "china", "japan", "korea", "taiwan", "india",
+        "australia", "亞太", "亞洲", "中國", "日本", "韓國", "台灣", "印度", "澳洲",
+    ),
+    "americas": (
+        "us", "usa", "united states", "america", "american", "canada",
+        "north america", "美國", "加拿大", "北美", "美洲",
+    ),
+}
+
+
+def _pattern(keywords: tuple[str, ...]) -> re.Pattern:
+    # Word boundaries for Latin keywords ("us" must not match "business")
+    parts = [
+        rf"\b{re.escape(k)}\b" if k.isascii() else re.escape(k) for k in keywords
+    ]
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
+_REGION_PATTERNS = {region: _pattern(kw) for region, kw in REGION_KEYWORDS.items()}
+
+
+def resolve_region(target_market: str) -> str:
+    for region, pattern in _REGION_PATTERNS.items():
+        if pattern.search(target_market):
+            return region
+    return GLOBAL_REGION
+
+
+def _fmt(value: float) -> str:
+    return f"{value:,.2f}".rstrip("0").rstrip(".")
+
+
+def _indicator_line(s: dict) -> str:
+    line = (
+        f"{s['title']} ({s['series_id']}): {_fmt(s['value'])} {s['units']}"
+        f" as of {s['date']}"
+    )
+    if s.get("change_pct") is not None:
+        line += f", {s['change_pct']:+.2f}% vs prior"
+    if s.get("yoy_pct") is not None:
+        line += f", {s['yoy_pct']:+.2f}% YoY"
+    return line
+
+
+def _risk_line(region: str, risk: dict) -> str:
+    parts = ", ".join(f"{k} {v:.0f}" for k, v in risk["breakdown"].items())
+    return f"Risk score {region}: {risk['overall']:.1f}/100 ({parts})"
+
+
+def _anomaly_line(a: dict) -> str:
+    return (
+        f"Anomaly {a['date']}: {a['key']} = {_fmt(a['value'])} "
+        f"(z={a['z_score']:.1f}, {a['severity']})"
+    )
+
+
+def _lines(region: str, summary: dict) -> list[str]:
+    """Most decision-relevant first: risk, then anomalies, then indicators."""
+    lines = []
+    if "risk" in summary:
+        lines.append(_risk_line(region, summary["risk"]))
+    lines.extend(_anomaly_line(a) for a in summary.get("anomalies", []))
+    lines.extend(
+        _indicator_line(v)
+        for k, v in sorted(summary.items())
+        if k.startswith("indicator:")
+    )
+    return lines
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class AuditContextBuilder:
+    """Build a compact data section for an audit prompt.
+
+    Reads the target region's summary and the global one (two HGETALLs, no
+    upstream calls) and keeps whole lines, most relevant first, until
+    `max_tokens` is reached.
+    """
+
+    def __init__(self, cache: RedisCache, max_tokens: int = 300):
+        self.cache = cache
+        self.max_tokens = max_tokens
+
+    async def build(self, target_market: str) -> str:
+        region = resolve_region(target_market)
+        regions = [region] if region == GLOBAL_REGION else [region, GLOBAL_REGION]
+        summaries = await get_summaries(self.cache, regions)
+
+        seen, kept, used = set(), [], 0
+        for r in regions:
+            for line in _lines(r, summaries[r]):
+                if line in seen:
+                    continue
+                cost = estimate_tokens(line)
+                if used + cost > self.max_tokens:
+                    return "\n".join(kept)
+                seen.add(line)
+                kept.append(line)
+                used += cost
+        return "\n".join(kept)
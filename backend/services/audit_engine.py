@@ -1,7 +1,16 @@
 import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import ValidationError
 
 from models.audit import AuditRequest, SWOTReport
-from services.llm_client import LLMClient
+from services.audit_context import AuditContextBuilder
+from services.json_stream import IncrementalObjectParser
+from services.llm_client import DEFAULT_MODEL, DEFAULT_TEMPERATURE, LLMClient
+from services.llm_limiter import Priority
+from storage.audit_cache import AuditCache
 
 SYSTEM_PROMPT = (
     "You are a business model analyst. Respond ONLY with valid JSON containing "
@@ -9,25 +18,164 @@ SYSTEM_PROMPT = (
     "opportunities (list of strings), threats (list of strings), risk_summary (string). "
     "Do not include any text outside the JSON object."
 )
+logger = logging.getLogger(__name__)
+
+SWOT_LISTS = ("strengths", "weaknesses", "opportunities", "threats")
 
 
 class AuditEngine:
-    def __init__(self, api_key: str):
-        self._llm = LLMClient(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        cache: AuditCache | None = None,
+        model: str = DEFAULT_MODEL,
+        temperature: float = DEFAULT_TEMPERATURE,
+        llm: LLMClient | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        context: AuditContextBuilder | None = None,
+    ):
+        # Without the shared client the engine builds (and must close) its own
+        self._owns_llm = llm is None
+        self._llm = llm if llm is not None else LLMClient(api_key=api_key)
+        self._cache = cache
+        self.model = model
+        self.temperature = temperature
+        self.priority = priority
+        self._context = context
+
+    async def close(self) -> None:
+        """Release the LLM client if this engine built it; a shared one is
+        left to its owner."""
+        if self._owns_llm:
+            await self._llm.close()
 
     async def _call_llm(self, prompt: str) -> str:
-        return await self._llm.chat(system_prompt=SYSTEM_PROMPT, user_prompt=prompt)
+        return await self._llm.chat(
+            system_prompt=SYSTEM_PROMPT,
+            user_prompt=prompt,
+            model=self.model,
+            temperature=self.temperature,
+            priority=self.priority,
+        )
 
-    async def analyze(self, request: AuditRequest) -> SWOTReport:
+    @staticmethod
+    def build_prompt(request: AuditRequest, context: str = "") -> str:
         prompt = (
             f"Perform a SWOT analysis for the following business model.\n\n"
             f"Business description: {request.model_description}\n"
             f"Target market: {request.target_market}\n"
             f"Industry: {request.industry}\n"
         )
-        raw = await self._call_llm(prompt)
+        if context:
+            prompt += (
+                f"\nLatest market data for the target market "
+                f"(ground the analysis in it where relevant):\n{context}\n"
+            )
+        return prompt
+
+    async def market_context(self, request: AuditRequest) -> str:
+        """The target market's latest data for the prompt, or "" without a
+        context builder or when it fails."""
+        if self._context is None:
+            return ""
+        try:
+            return await self._context.build(request.target_market)
+        except Exception:
+            logger.exception("Audit context unavailable; auditing without it")
+            return ""
+
+    def _cache_key(self, request: AuditRequest) -> tuple[str, str, str, float]:
+        # The context goes to the cache on its own: fingerprinted along with
+        # the description it would make unrelated businesses look alike
+        return (SYSTEM_PROMPT, self.build_prompt(request), self.model, self.temperature)
+
+    def cache_entry(self, request: AuditRequest, context: str) -> str:
+        """The audit-cache entry a report for `request` is stored under."""
+        return AuditCache.entry_for(*self._cache_key(request), context)
+
+    async def analyze(self, request: AuditRequest) -> SWOTReport:
+        report, _ = await self.analyze_cached(request)
+        return report
+
+    async def analyze_cached(self, request: AuditRequest) -> tuple[SWOTReport, str]:
+        """Like `analyze`, also returning the cache outcome: "exact",
+        "semantic", "miss", or "off" when no cache is configured."""
+        return await self.analyze_with(request, await self.market_context(request))
+
+    async def analyze_with(
+        self, request: AuditRequest, context: str
+    ) -> tuple[SWOTReport, str]:
+        """`analyze_cached` with the market context already built."""
+        key = self._cache_key(request)
+        if self._cache is not None:
+            cached, kind = await self._cache.lookup(*key, context)
+            if cached is not None:
+                return SWOTReport.model_validate(cached), kind
+
+        report = self._parse(await self._call_llm(self.build_prompt(request, context)))
+        if self._cache is None:
+            return report, "off"
+        await self._cache.store(*key, report.model_dump(), context)
+        return report, "miss"
+
+    async def stream(
+        self, request: AuditRequest
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Yield `(event, data)` as the report is generated.
+
+        `item` events carry each SWOT list entry as soon as its closing quote
+        arrives, `summary` the risk summary, and a final `report` event the
+        validated SWOTReport plus the cache outcome. Cached reports are
+        replayed through the same events. A string the model garbles ends
+        the stream with an `error` event. Raises ValueError if the finished
+        completion does not validate.
+        """
+        context = await self.market_context(request)
+        key = self._cache_key(request)
+        if self._cache is not None:
+            cached, kind = await self._cache.lookup(*key, context)
+            if cached is not None:
+                report = SWOTReport.model_validate(cached)
+                for field in SWOT_LISTS:
+                    for index, value in enumerate(getattr(report, field)):
+                        yield "item", {"field": field, "index": index, "value": value}
+                yield "summary", {"value": report.risk_summary}
+                yield "report", {"report": report.model_dump(), "cache": kind}
+                return
+
+        parser = IncrementalObjectParser()
+        deltas = self._llm.chat_stream(
+            system_prompt=SYSTEM_PROMPT,
+            user_prompt=self.build_prompt(request, context),
+            model=self.model,
+            temperature=self.temperature,
+            priority=self.priority,
+        )
+        async for delta in deltas:
+            for event in parser.feed(delta):
+                if event.kind == "error":
+                    yield "error", {"detail": f"Upstream error from LLM: {event.value}"}
+                    return
+                if event.key in SWOT_LISTS and event.index is not None:
+                    yield "item", {
+                        "field": event.key,
+                        "index": event.index,
+                        "value": event.value,
+                    }
+                elif event.key == "risk_summary":
+                    yield "summary", {"value": event.value}
+
+        report = self._parse(parser.document())
+        kind = "off"
+        if self._cache is not None:
+            await self._cache.store(*key, report.model_dump(), context)
+            kind = "miss"
+        yield "report", {"report": report.model_dump(), "cache": kind}
+
+    @staticmethod
+    def _parse(raw: str) -> SWOTReport:
         try:
             data = json.loads(raw)
             return SWOTReport(**data)
-        except (json.JSONDecodeError, TypeError, KeyError) as exc:
+        except (json.JSONDecodeError, ValidationError, TypeError, KeyError) as exc:
             raise ValueError(f"Failed to parse LLM response: {exc}") from exc
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import uuid
+
+from models.audit import AuditRequest
+from services.audit_engine import AuditEngine
+from services.job_lease import LeaseLost, held, keep_resuming
+from storage.audit_jobs import AuditJobStore
+
+logger = logging.getLogger(__name__)
+
+
+class AuditJobRunner:
+    """Runs batch audit jobs as background tasks on this worker.
+
+    Each request's market context is built once at submit; requests are
+    deduped by the audit-cache entry for request and context, persisted
+    with the context, and audited `concurrency` at a time through the
+    shared engine, whose LLM client applies the app-wide rate limits. Each
+    result is stored as it completes, so a resumed job only runs what is
+    still missing. A lease renewed while the job runs keeps two workers
+    from running it at once; `start` resumes unfinished jobs and keeps
+    retrying any no worker holds.
+    """
+
+    def __init__(
+        self,
+        store: AuditJobStore,
+        engine: AuditEngine,
+        concurrency: int = 8,
+        lease: int = 60,
+    ):
+        self.store = store
+        self.engine = engine
+        self.concurrency = concurrency
+        self.lease = lease
+        self.worker_id = uuid.uuid4().hex
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._sweeper: asyncio.Task | None = None
+
+    def item_key(self, request: AuditRequest, context: str = "") -> str:
+        return self.engine.cache_entry(request, context)
+
+    async def submit(self, requests: list[AuditRequest]) -> str:
+        job_id = uuid.uuid4().hex
+        contexts = [await self.engine.market_context(r) for r in requests]
+        order = [self.item_key(r, c) for r, c in zip(requests, contexts)]
+        items = {
+            key: {**r.model_dump(), "context": c}
+            for key, r, c in zip(order, requests, contexts)
+        }
+        await self.store.create(job_id, order, items)
+        if await self.store.claim(job_id, self.worker_id, self.lease):
+            self._start(job_id)
+        return job_id
+
+    async def start(self) -> None:
+        """Resume unfinished jobs now and every `lease` seconds after."""
+        await self.resume()
+        self._sweeper = keep_resuming(self.resume, self.lease)
+
+    async def resume(self) -> list[str]:
+        """Start the unfinished jobs no worker holds, e.g. after a crash or
+        redeploy; returns the ids taken."""
+        resumed = []
+        for job_id in await self.store.active():
+            if job_id in self._tasks:
+                continue
+            if await self.store.claim(job_id, self.worker_id, self.lease):
+                logger.info("Resuming audit job %s", job_id)
+                self._start(job_id)
+                resumed.append(job_id)
+        return resumed
+
+    def _start(self, job_id: str) -> None:
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: str) -> None:
+        try:
+            async with held(self.store, job_id, self.worker_id, self.lease):
+                pending = await self.store.pending(job_id)
+                limit = asyncio.Semaphore(self.concurrency)
+
+                async def run_item(key: str, data: dict) -> None:
+                    async with limit:
+                        try:
+                            # Items stored without a context were keyed as
+                            # having none
+                            context = data.pop("context", "")
+                            report, _ = await self.engine.analyze_with(
+                                AuditRequest(**data), context
+                            )
+                            result = {"report": report.model_dump(), "error": None}
+                        except Exception as e:
+                            result = {
+                                "report": None,
+                                "error": f"Upstream error from LLM: {e}",
+                            }
+                        await self.store.complete(job_id, key, result)
+
+                await asyncio.gather(*(run_item(k, d) for k, d in pending.items()))
+                await self.store.finish(job_id)
+        except LeaseLost:
+            logger.warning("Audit job %s taken over by another worker", job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Left active with the lease released; the next sweep retries it
+            logger.exception("Audit job %s interrupted", job_id)
+
+    async def close(self) -> None:
+        """Stop this worker's jobs, releasing their leases for a peer."""
+        tasks = list(self._tasks.values())
+        if self._sweeper is not None:
+            tasks.append(self._sweeper)
+            self._sweeper = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
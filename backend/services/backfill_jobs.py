@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import uuid
+
+from core.config import settings
+from fetchers.fred_backfill import backfill_series
+from services.fred_client import FredClient
+from services.job_lease import LeaseLost, held, keep_resuming
+from services.llm_limiter import Priority
+from storage.backfill_jobs import BackfillJobStore, new_checkpoint
+from storage.influxdb import InfluxStorage
+from storage.redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillRunner:
+    """Runs FRED backfill jobs as background tasks on this worker.
+
+    Series are loaded `concurrency` at a time through a BACKGROUND-priority
+    FredClient, so the shared FRED quota (`services.fred_client.quota`)
+    paces the job while live polls and API misses are admitted first.
+    Progress is checkpointed per Influx batch, so a resumed job picks up
+    where it stopped. A lease renewed while the job runs keeps two workers
+    from running it at once; `start` resumes unfinished jobs and keeps
+    retrying any no worker holds.
+    """
+
+    def __init__(
+        self,
+        store: BackfillJobStore,
+        influx: InfluxStorage,
+        fred: FredClient,
+        concurrency: int = 4,
+        page_size: int = 10_000,
+        batch_points: int = 5_000,
+        lease: int = 60,
+    ):
+        self.store = store
+        self.influx = influx
+        self.fred = fred
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.batch_points = batch_points
+        self.lease = lease
+        self.worker_id = uuid.uuid4().hex
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._sweeper: asyncio.Task | None = None
+
+    async def submit(self, series_ids: list[str], start: str | None = None) -> str:
+        job_id = uuid.uuid4().hex
+        await self.store.create(job_id, list(dict.fromkeys(series_ids)), start)
+        if await self.store.claim(job_id, self.worker_id, self.lease):
+            self._start(job_id)
+        return job_id
+
+    async def start(self) -> None:
+        """Resume unfinished jobs now and every `lease` seconds after."""
+        await self.resume()
+        self._sweeper = keep_resuming(self.resume, self.lease)
+
+    async def resume(self) -> list[str]:
+        """Start the unfinished jobs no worker holds, e.g. after a crash or
+        redeploy; returns the ids taken."""
+        resumed = []
+        for job_id in await self.store.active():
+            if job_id in self._tasks:
+                continue
+            if await self.store.claim(job_id, self.worker_id, self.lease):
+                logger.info("Resuming backfill job %s", job_id)
+                self._start(job_id)
+                resumed.append(job_id)
+        return resumed
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait for this worker's jobs; True once none are running."""
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        return not self._tasks
+
+    def _start(self, job_id: str) -> None:
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: str) -> None:
+        try:
+            async with held(self.store, job_id, self.worker_id, self.lease):
+                await self._backfill(job_id)
+        except LeaseLost:
+            logger.warning("Backfill job %s taken over by another worker", job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Left active with the lease released; the next sweep retries it
+            logger.exception("Backfill job %s interrupted", job_id)
+
+    async def _backfill(self, job_id: str) -> None:
+        meta = await self.store.meta(job_id)
+        progress = await self.store.progress(job_id)
+        limit = asyncio.Semaphore(self.concurrency)
+        failed = False
+
+        async def run_series(series_id: str) -> None:
+            nonlocal failed
+            checkpoint = progress.get(series_id) or new_checkpoint()
+            if checkpoint["done"]:
+                return
+
+            async def save(state: dict) -> None:
+                await self.store.checkpoint(job_id, series_id, state)
+
+            async with limit:
+                try:
+                    await backfill_series(
+                        self.fred,
+                        self.influx,
+                        series_id,
+                        checkpoint,
+                        save,
+                        start=meta["start"],
+                        page_size=self.page_size,
+                        batch_points=self.batch_points,
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    failed = True
+                    logger.exception("Backfill of %s failed", series_id)
+                    state = await self.store.progress(job_id)
+                    await save(
+                        {
+                            **state.get(series_id, checkpoint),
+                            "error": f"Upstream error from FRED: {e}",
+                        }
+                    )
+
+        await asyncio.gather(*(run_series(s) for s in meta["series"]))
+        await self.store.finish(job_id, "failed" if failed else "done")
+
+    async def close(self) -> None:
+        """Stop this worker's jobs, releasing their leases for a peer."""
+        tasks = list(self._tasks.values())
+        if self._sweeper is not None:
+            tasks.append(self._sweeper)
+            self._sweeper = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def build_runner(cache: RedisCache, influx: InfluxStorage) -> BackfillRunner:
+    return BackfillRunner(
+        BackfillJobStore(cache),
+        influx,
+        FredClient(api_key=settings.FRED_API_KEY, priority=Priority.BACKGROUND),
+        concurrency=settings.FRED_BACKFILL_CONCURRENCY,
+        page_size=settings.FRED_BACKFILL_PAGE_SIZE,
+        batch_points=settings.INFLUXDB_BATCH_POINTS,
+    )
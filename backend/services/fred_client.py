@@ -1,50 +1,168 @@
-from typing import Any
-
-import httpx
+import asyncio
+import ssl
+import time
+from collections.abc import Awaitable, Callable
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
+from core.config import settings
+from core.metrics import FRED_REQUEST_SECONDS, bound
+from core.tracing import span
 from models.indicators import IndicatorPoint, IndicatorSeries
+from services.fred_quota import FredQuota, quota_key
+from services.llm_limiter import Priority
+from services.resilience import Upstream, upstream
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+_quota: FredQuota | None = None
+
+
+@cache
+def _ssl_context() -> ssl.SSLContext:
+    """The CA bundle httpx would load for every new client; loading it takes
+    tens of milliseconds of blocking CPU, so it is built once per process."""
+    import certifi
+
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def quota() -> FredQuota | None:
+    """The limiter keeping FRED requests under FRED_RPM, or None when
+    FRED_RPM is 0. Backfills run at BACKGROUND priority, so live polls and
+    API misses are admitted first. Counted per process until `share_quota`
+    is called."""
+    global _quota
+    if settings.FRED_RPM <= 0:
+        return None
+    if _quota is None:
+        _quota = FredQuota(settings.FRED_RPM)
+    return _quota
 
-FRED_BASE_URL = "https://api.stlouisfed.org/fred"
+
+def share_quota(redis: "Redis") -> None:
+    """Count FRED requests against FRED_RPM across every worker using
+    FRED_API_KEY, through Redis; called once at startup."""
+    global _quota
+    if settings.FRED_RPM > 0:
+        _quota = FredQuota(settings.FRED_RPM, redis, quota_key(settings.FRED_API_KEY))
 
 
 class FredClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, priority: Priority = Priority.INTERACTIVE):
         self.api_key = api_key
+        self.priority = priority
+        self.upstream = upstream("fred")
 
     async def _get(
-        self, endpoint: str, params: dict[str, str] | None = None
+        self, endpoint: str, params: dict[str, str] | None = None, bulk: bool = False
     ) -> dict[str, Any]:
-        url = f"{FRED_BASE_URL}/{endpoint}"
+        """GET a FRED endpoint under the quota. `bulk` requests (backfill
+        pages) go through their own upstream: a fixed timeout, no hedging and
+        a separate breaker, so they neither stretch nor trip the one live
+        polls rely on."""
+        url = f"{settings.FRED_BASE_URL}/{endpoint}"
         request_params: dict[str, str] = {
             "api_key": self.api_key,
             "file_type": "json",
         }
         if params:
             request_params.update(params)
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=request_params)
-            response.raise_for_status()
-            return response.json()
+
+        import httpx
+
+        async def attempt() -> dict[str, Any]:
+            async with httpx.AsyncClient(verify=_ssl_context()) as client:
+                response = await client.get(url, params=request_params)
+                response.raise_for_status()
+                return response.json()
+
+        target = upstream("fred_backfill") if bulk else self.upstream
+        limiter = quota()
+        if limiter is None:
+            return await self._call(endpoint, attempt, target, not bulk)
+
+        attempts = 0
+
+        async def charged() -> dict[str, Any]:
+            # The first attempt runs in the caller's slot; a hedge is a
+            # request of its own and takes another
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                return await attempt()
+            async with limiter.acquire(self.priority):
+                return await attempt()
+
+        async with limiter.acquire(self.priority):
+            return await self._call(endpoint, charged, target, not bulk)
+
+    async def _call(
+        self,
+        endpoint: str,
+        attempt: Callable[[], Awaitable[dict[str, Any]]],
+        target: Upstream,
+        idempotent: bool,
+    ) -> dict[str, Any]:
+        start, outcome = time.perf_counter(), "error"
+        try:
+            with span(f"fred.{endpoint.replace('/', '.')}"):
+                data = await target.call(attempt, idempotent=idempotent)
+            outcome = "ok"
+            return data
+        finally:
+            bound(FRED_REQUEST_SECONDS, endpoint, outcome).observe(
+                time.perf_counter() - start
+            )
 
     async def get_series_info(self, series_id: str) -> dict[str, Any]:
         data = await self._get("series", {"series_id": series_id})
         return data["seriess"][0]
 
+    async def get_next_release_date(self, series_id: str, start: str) -> str | None:
+        """First scheduled release date on or after `start` (YYYY-MM-DD) of the
+        release that publishes `series_id`, None when FRED lists none."""
+        releases = (await self._get("series/release", {"series_id": series_id}))[
+            "releases"
+        ]
+        if not releases:
+            return None
+        data = await self._get(
+            "release/dates",
+            {
+                "release_id": str(releases[0]["id"]),
+                "realtime_start": start,
+                "include_release_dates_with_no_data": "true",
+                "sort_order": "asc",
+                "limit": "1",
+            },
+        )
+        dates = data["release_dates"]
+        return dates[0]["date"] if dates else None
+
     async def get_observations(
         self,
         series_id: str,
         start_date: str | None = None,
         end_date: str | None = None,
+        info: dict[str, Any] | None = None,
     ) -> IndicatorSeries:
-        info = await self.get_series_info(series_id)
-
+        """Observations with series metadata; pass `info` when it was
+        already fetched to skip the metadata request."""
         obs_params: dict[str, str] = {"series_id": series_id}
         if start_date:
             obs_params["observation_start"] = start_date
         if end_date:
             obs_params["observation_end"] = end_date
 
-        obs_data = await self._get("series/observations", obs_params)
+        if info is None:
+            info, obs_data = await asyncio.gather(
+                self.get_series_info(series_id),
+                self._get("series/observations", obs_params),
+            )
+        else:
+            obs_data = await self._get("series/observations", obs_params)
 
         points = [
             IndicatorPoint(date=obs["date"], value=float(obs["value"]))
@@ -59,3 +177,24 @@ class FredClient:
             frequency=info["frequency"],
             data=points,
         )
+
+    async def get_observation_page(
+        self,
+        series_id: str,
+        offset: int = 0,
+        limit: int = 10_000,
+        start_date: str | None = None,
+    ) -> dict[str, Any]:
+        """One page of raw observations, oldest first: FRED's response with
+        `count` (total observations) and `observations` (`date`, `value`
+        strings, "." for missing). Used for backfills, where building
+        IndicatorPoints for whole histories is wasted work."""
+        params = {
+            "series_id": series_id,
+            "sort_order": "asc",
+            "offset": str(offset),
+            "limit": str(limit),
+        }
+        if start_date:
+            params["observation_start"] = start_date
+        return await self._get("series/observations", params, bulk=True)
@@ -0,0 +1,101 @@
+"""The FRED API key's request quota, counted across every worker using it.
+
+    fred:quota:{key digest}   zset  one member per request started in the
+                                    last `window` seconds, scored by its
+                                    start time (unix seconds)
+
+A request is first admitted by an in-process limiter, which orders this
+worker's callers by priority and never lets the worker alone exceed the
+quota. It then takes a slot in the shared window, waiting for the oldest
+request to age out while the window is full. Priority therefore orders
+requests within a worker; across workers the window is first come, first
+served. Slots are taken under WATCH/MULTI rather than Lua so they also run
+against fakeredis in tests. Without Redis, or while it is unreachable, the
+quota is enforced per worker only.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from core.http_cache import digest
+from services.llm_limiter import LLMRateLimiter, Priority
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+def quota_key(api_key: str) -> str:
+    return f"fred:quota:{digest(api_key.encode())[:16]}"
+
+
+class FredQuota:
+    def __init__(
+        self,
+        rpm: int,
+        redis: "Redis | None" = None,
+        key: str = "fred:quota",
+        window: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rpm = rpm
+        self.redis = redis
+        self.key = key
+        self.window = window
+        self._clock = clock
+        # Each request is one token; no cap on requests in flight
+        self._local = LLMRateLimiter(
+            rpm=rpm, tpm=rpm, max_concurrency=rpm, window=window
+        )
+
+    @asynccontextmanager
+    async def acquire(
+        self, priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[None]:
+        """Wait until a request may start; hold the block while it runs."""
+        async with self._local.acquire(1, priority):
+            if self.redis is not None:
+                await self._take_shared_slot()
+            yield
+
+    async def _take_shared_slot(self) -> None:
+        from redis.exceptions import RedisError, WatchError
+
+        member = uuid.uuid4().hex
+        while True:
+            try:
+                wait = await self._try_slot(member)
+            except WatchError:
+                continue
+            except RedisError as exc:
+                logger.warning("Shared FRED quota unavailable: %s", exc)
+                return
+            if wait is None:
+                return
+            await asyncio.sleep(wait)
+
+    async def _try_slot(self, member: str) -> float | None:
+        """Record a request start; when the window is full, return the
+        seconds until its oldest request ages out instead."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(self.key)
+            now = self._clock()
+            since = now - self.window
+            if await pipe.zcount(self.key, f"({since}", "+inf") >= self.rpm:
+                [(_, oldest)] = await pipe.zrangebyscore(
+                    self.key, f"({since}", "+inf", start=0, num=1, withscores=True
+                )
+                await pipe.unwatch()
+                return max(oldest - since, 0.01)
+            pipe.multi()
+            pipe.zremrangebyscore(self.key, "-inf", since)
+            pipe.zadd(self.key, {member: now})
+            pipe.expire(self.key, int(self.window) + 1)
+            await pipe.execute()
+        return None
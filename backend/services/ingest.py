@@ -0,0 +1,184 @@
+"""In-process event pipeline between fetchers and what consumes their data.
+
+Fetchers publish `Observation`s and return to polling; storage writes,
+cache updates, anomaly detection, risk scoring and live broadcast run as
+stages, each with its own bounded queue and worker task, so a slow stage
+only delays itself. When a stage's queue is full, `publish` waits for room
+(backpressure on the fetcher) unless the stage is lossy, in which case its
+oldest queued observation is dropped. Consumers are added with `add_stage`
+without touching the fetchers.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from core.config import settings
+from core.metrics import (
+    INGEST_BLOCKED_SECONDS,
+    INGEST_EVENTS,
+    INGEST_QUEUE_DEPTH,
+    INGEST_STAGE_SECONDS,
+    bound,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Observation:
+    """The latest observation of a series as a fetcher saw it.
+
+    `series` is the full series payload when the fetcher has one, with `ttl`
+    the time it should stay cached. `new` is False when this date was
+    already published by an earlier poll."""
+
+    source: str
+    series_id: str
+    date: str | None
+    value: float | None
+    regions: tuple[str, ...] = ()
+    series: dict[str, Any] | None = None
+    ttl: int | None = None
+    new: bool = True
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.series_id}"
+
+
+Handler = Callable[[list[Observation]], Awaitable[None]]
+
+
+class Stage:
+    """One consumer: a bounded queue drained by a worker in batches.
+
+    The handler gets up to `batch` observations per call. With a `linger`,
+    the worker waits that long for a partial batch to fill, trading latency
+    for fewer, larger calls (storage writes)."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        max_queue: int = 1000,
+        batch: int = 1,
+        linger: float = 0.0,
+        lossy: bool = False,
+    ):
+        self.name = name
+        self.handler = handler
+        self.batch = batch
+        self.linger = linger
+        self.lossy = lossy
+        self.queue: asyncio.Queue[Observation] = asyncio.Queue(max_queue)
+        self._ok = bound(INGEST_EVENTS, name, "ok")
+        self._errors = bound(INGEST_EVENTS, name, "error")
+        self._dropped = bound(INGEST_EVENTS, name, "dropped")
+        self._seconds = bound(INGEST_STAGE_SECONDS, name)
+        self._depth = bound(INGEST_QUEUE_DEPTH, name)
+        self._blocked = bound(INGEST_BLOCKED_SECONDS, name)
+
+    async def put(self, event: Observation) -> None:
+        if self.queue.full():
+            if self.lossy:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self._dropped.inc()
+            else:
+                start = time.perf_counter()
+                await self.queue.put(event)
+                self._blocked.inc(time.perf_counter() - start)
+                self._depth.set(self.queue.qsize())
+                return
+        self.queue.put_nowait(event)
+        self._depth.set(self.queue.qsize())
+
+    async def _next_batch(self) -> list[Observation]:
+        batch = [await self.queue.get()]
+        if self.linger and self.queue.qsize() < self.batch - 1:
+            await asyncio.sleep(self.linger)
+        while len(batch) < self.batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            self._depth.set(self.queue.qsize())
+            start = time.perf_counter()
+            try:
+                await self.handler(batch)
+                self._ok.inc(len(batch))
+            except Exception:
+                self._errors.inc(len(batch))
+                logger.exception(
+                    "Ingest stage %s failed on %d observation(s)", self.name, len(batch)
+                )
+            finally:
+                self._seconds.observe(time.perf_counter() - start)
+                for _ in batch:
+                    self.queue.task_done()
+
+
+class IngestPipeline:
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self.stages: dict[str, Stage] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._started = False
+
+    def add_stage(
+        self,
+        name: str,
+        handler: Handler,
+        batch: int = 1,
+        linger: float = 0.0,
+        lossy: bool = False,
+    ) -> Stage:
+        """Register a consumer of every published observation; lossy stages
+        drop their oldest queued observation instead of applying
+        backpressure."""
+        if name in self.stages:
+            raise ValueError(f"Ingest stage {name!r} already registered")
+        stage = Stage(name, handler, self.max_queue, batch, linger, lossy)
+        self.stages[name] = stage
+        if self._started:
+            self._start(stage)
+        return stage
+
+    async def start(self) -> None:
+        self._started = True
+        for stage in self.stages.values():
+            self._start(stage)
+
+    def _start(self, stage: Stage) -> None:
+        self._tasks[stage.name] = asyncio.create_task(stage.run())
+
+    async def publish(self, event: Observation) -> None:
+        for stage in self.stages.values():
+            await stage.put(event)
+
+    async def join(self) -> None:
+        """Wait until every published observation has been handled."""
+        await asyncio.gather(*(s.queue.join() for s in self.stages.values()))
+
+    async def close(self, timeout: float | None = None) -> None:
+        """Give the stages up to `timeout` seconds (INGEST_DRAIN_SECONDS by
+        default) to handle what is queued, then stop them."""
+        if timeout is None:
+            timeout = settings.INGEST_DRAIN_SECONDS
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except TimeoutError:
+            pending = sum(s.queue.qsize() for s in self.stages.values())
+            logger.warning("Dropping %d queued observation(s) on shutdown", pending)
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._started = False
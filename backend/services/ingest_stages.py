@@ -0,0 +1,194 @@
+"""The consumers the backend runs on the ingest pipeline."""
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from core.config import settings
+from models.risk import RegionRiskInput
+from services.anomaly_detector import WelfordDetector
+from services.ingest import Handler, IngestPipeline, Observation
+from services.live_hub import LiveHub
+from services.risk_engine import RiskEngine
+from storage.influxdb import InfluxStorage
+from storage.redis_cache import RedisCache
+from storage.region_summary import (
+    add_anomaly,
+    indicator_summary,
+    set_risk,
+    update_indicator,
+)
+from storage.series_cache import SERIES_TTL, store_series
+
+
+def _cpi_yoy(e: Observation) -> float | None:
+    summary = indicator_summary(e.series) if e.series else None
+    return summary["yoy_pct"] if summary else None
+
+
+# RegionRiskInput fields fed by FRED series, and how each is read from an
+# observation. Shipping inputs stay neutral until a source publishes them.
+RISK_INPUTS: dict[str, tuple[str, Callable[[Observation], float | None]]] = {
+    "CPIAUCSL": ("cpi_change", _cpi_yoy),
+    "UNRATE": ("unemployment_rate", lambda e: e.value),
+}
+NEUTRAL_SHIPPING = {"bdi_change": 0.0, "port_congestion": 0.0}
+
+
+def _timestamp(day: str) -> datetime:
+    return datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+
+
+def write_points(influx: InfluxStorage) -> Handler:
+    """Batched InfluxDB writes, one request per measurement. Points are
+    stamped with their observation date, so a re-poll overwrites the same
+    point (as backfills do) instead of adding one per run."""
+
+    async def handle(events: list[Observation]) -> None:
+        by_measurement: dict[str, list] = {}
+        for e in events:
+            if e.date is None or e.value is None:
+                continue
+            by_measurement.setdefault(e.source, []).append(
+                ({"series_id": e.series_id}, _timestamp(e.date), {"value": e.value})
+            )
+        for measurement, rows in by_measurement.items():
+            await influx.write_points(measurement, rows)
+
+    return handle
+
+
+def cache_series(cache: RedisCache) -> Handler:
+    """Cached series bodies and region summary entries. Only the newest
+    observation of each series in a batch is written."""
+
+    async def handle(events: list[Observation]) -> None:
+        latest = {e.key: e for e in events if e.series is not None}
+        for e in latest.values():
+            await store_series(cache, e.series_id, e.series, ttl=e.ttl or SERIES_TTL)
+            await update_indicator(cache, e.regions, e.series)
+
+    return handle
+
+
+class AnomalyStage:
+    """Runs new observations through the detector; alerts go to the region
+    summaries and the `anomalies` channel."""
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        detector: WelfordDetector,
+        hub: LiveHub | None = None,
+    ):
+        self.cache = cache
+        self.detector = detector
+        self.hub = hub
+
+    async def __call__(self, events: list[Observation]) -> None:
+        for e in events:
+            if not e.new or e.value is None:
+                continue
+            result = self.detector.update(e.key, e.value)
+            if not result.is_anomaly:
+                continue
+            alert = {
+                "key": result.key,
+                "value": result.value,
+                "mean": result.mean,
+                "z_score": result.z_score,
+                "severity": result.severity,
+                "date": e.date,
+            }
+            await add_anomaly(self.cache, e.regions, alert)
+            if self.hub is not None:
+                await self.hub.publish("anomalies", "alert", alert)
+
+
+class RiskStage:
+    """Recomputes the risk score of an observation's regions when one of
+    their RISK_INPUTS moves, once every input has been seen."""
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        engine: RiskEngine,
+        hub: LiveHub | None = None,
+    ):
+        self.cache = cache
+        self.engine = engine
+        self.hub = hub
+        self._inputs: dict[str, dict[str, float]] = {}
+
+    async def __call__(self, events: list[Observation]) -> None:
+        changed: set[str] = set()
+        for e in events:
+            if e.series_id not in RISK_INPUTS:
+                continue
+            field, read = RISK_INPUTS[e.series_id]
+            value = read(e)
+            if value is None:
+                continue
+            for region in e.regions:
+                inputs = self._inputs.setdefault(region, {})
+                if inputs.get(field) != value:
+                    inputs[field] = value
+                    changed.add(region)
+        for region in sorted(changed):
+            inputs = self._inputs[region]
+            if len(inputs) < len(RISK_INPUTS):
+                continue
+            score = self.engine.calculate(
+                RegionRiskInput(region_code=region, **inputs, **NEUTRAL_SHIPPING)
+            )
+            await set_risk(self.cache, score)
+            if self.hub is not None:
+                await self.hub.publish(
+                    "risk",
+                    "update",
+                    score.model_dump(),
+                    coalesce_key=f"risk:{region}",
+                )
+
+
+def broadcast(hub: LiveHub) -> Handler:
+    """Series snapshots on `series:<id>` and new points on `indicators`."""
+
+    async def handle(events: list[Observation]) -> None:
+        for e in events:
+            if e.series is not None:
+                await hub.publish_series(e.series)
+            if e.new and e.date is not None:
+                await hub.publish(
+                    "indicators",
+                    "update",
+                    {"series_id": e.series_id, "date": e.date, "value": e.value},
+                    coalesce_key=f"indicators:{e.series_id}",
+                )
+
+    return handle
+
+
+def build_pipeline(
+    influx: InfluxStorage,
+    cache: RedisCache,
+    hub: LiveHub | None = None,
+    detector: WelfordDetector | None = None,
+) -> IngestPipeline:
+    """The pipeline with the standard stages. All but the live broadcast see
+    every observation (backpressure when behind); a client that misses a
+    push catches up from the next series snapshot, so that stage may drop."""
+    pipeline = IngestPipeline(max_queue=settings.INGEST_QUEUE_SIZE)
+    pipeline.add_stage(
+        "storage",
+        write_points(influx),
+        batch=settings.INFLUXDB_BATCH_POINTS,
+        linger=settings.INGEST_FLUSH_SECONDS,
+    )
+    pipeline.add_stage("cache", cache_series(cache), batch=100)
+    pipeline.add_stage(
+        "anomaly", AnomalyStage(cache, detector or WelfordDetector(), hub), batch=100
+    )
+    pipeline.add_stage("risk", RiskStage(cache, RiskEngine(), hub), batch=100)
+    if hub is not None:
+        pipeline.add_stage("broadcast", broadcast(hub), batch=100, lossy=True)
+    return pipeline
@@ -0,0 +1,86 @@
+"""Keeping a background job's run lease while the job runs.
+
+`held` renews the lease every `lease / 3` seconds for as long as the run
+takes, independent of how long single steps (a queued LLM call, a large
+InfluxDB page) sit waiting. If a renewal finds another worker holding the
+lease, the run is cancelled and LeaseLost raised in its place, so two
+workers never keep going on the same job. On exit the lease is released,
+so a restarted worker, or a peer, can pick the job up without waiting for
+it to expire. `keep_resuming` retries jobs no worker holds on a timer,
+which is how jobs of a worker that died without releasing get picked up.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(Exception):
+    """Another worker took over the job while it was running here."""
+
+
+class LeaseStore(Protocol):
+    async def claim(self, job_id: str, owner: str, lease: int) -> bool: ...
+
+    async def release(self, job_id: str, owner: str) -> bool: ...
+
+
+@asynccontextmanager
+async def held(
+    store: LeaseStore, job_id: str, owner: str, lease: int
+) -> AsyncIterator[None]:
+    """Run the body under a lease the caller has already claimed."""
+    task = asyncio.current_task()
+    lost = False
+
+    async def renew() -> None:
+        nonlocal lost
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                if await store.claim(job_id, owner, lease):
+                    continue
+            except Exception as exc:
+                # Keep running; the lease survives until it actually expires
+                logger.warning("Lease renewal for job %s failed: %s", job_id, exc)
+                continue
+            lost = True
+            task.cancel()
+            return
+
+    renewer = asyncio.create_task(renew())
+    try:
+        yield
+    except asyncio.CancelledError:
+        if not lost:
+            raise
+        task.uncancel()
+        raise LeaseLost(job_id) from None
+    finally:
+        renewer.cancel()
+        if not lost:
+            try:
+                await store.release(job_id, owner)
+            except Exception as exc:
+                logger.warning("Could not release lease on job %s: %s", job_id, exc)
+
+
+def keep_resuming(
+    resume: Callable[[], Awaitable[object]], every: float
+) -> asyncio.Task:
+    """Call `resume` every `every` seconds until the returned task is
+    cancelled."""
+
+    async def loop() -> None:
+        while True:
+            await asyncio.sleep(every)
+            try:
+                await resume()
+            except Exception:
+                logger.exception("Resuming background jobs failed")
+
+    return asyncio.create_task(loop())
@@ -0,0 +1,101 @@
+"""Incremental parser for a streamed flat JSON object of strings and string lists."""
+
+import json
+from dataclasses import dataclass
+
+
+@dataclass
+class StreamEvent:
+    key: str | None
+    value: str  # the error message for "error" events
+    index: int | None  # position in the list, None for a plain string field
+    kind: str = "value"  # "value" | "error"
+
+
+class IncrementalObjectParser:
+    """Emit each string value of a top-level JSON object as soon as it closes.
+
+    Understands objects shaped like `{"k": "v", "xs": ["a", "b"]}` arriving
+    in arbitrary chunks; anything before the first `{` (prose, code fences)
+    is skipped. Only string values are reported; the complete text is kept
+    in `text` so the caller can validate the whole document at the end. A
+    string that does not decode (a bad escape) is reported as an "error"
+    event and parsing continues after it.
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._raw: list[str] = []
+        self._key: str | None = None
+        self._expect_key = True
+        self._index = 0
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> list[StreamEvent]:
+        self._chunks.append(chunk)
+        events = []
+        for ch in chunk:
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    event = self._decode_string()
+                    if event is not None:
+                        events.append(event)
+                    continue
+                self._raw.append(ch)
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._raw = []
+            elif ch in "[{":
+                self._depth += 1
+                if self._depth == 2:
+                    self._index = 0
+            elif ch in "]}":
+                self._depth -= 1
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+        return events
+
+    def _decode_string(self) -> StreamEvent | None:
+        try:
+            value = json.loads(f'"{"".join(self._raw)}"')
+        except json.JSONDecodeError as exc:
+            if self._depth == 1 and self._expect_key:
+                self._key = None  # the values that follow belong to no known key
+            return StreamEvent(self._key, f"Malformed string: {exc}", None, "error")
+        return self._close_string(value)
+
+    def _close_string(self, value: str) -> StreamEvent | None:
+        if self._depth == 1:
+            if self._expect_key:
+                self._key = value
+                return None
+            return StreamEvent(self._key, value, None)
+        if self._depth == 2 and self._key is not None:
+            self._index += 1
+            return StreamEvent(self._key, value, self._index - 1)
+        return None
+
+    def document(self) -> str:
+        """The streamed text from the first `{` to the last `}`."""
+        start, end = self.text.find("{"), self.text.rfind("}")
+        return self.text[start : end + 1] if start != -1 else self.text
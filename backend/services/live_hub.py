@@ -0,0 +1,284 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from services.series_log import SeriesLog
+
+logger = logging.getLogger(__name__)
+
+REDIS_FANOUT_CHANNEL = "live:fanout"
+RELAY_RETRY_SECONDS = 2.0
+SERIES_CHANNEL_PREFIX = "series:"
+
+SnapshotLoader = Callable[[str], Awaitable[dict[str, Any] | None]]
+
+
+def encode_message(channel: str, event: str, data: Any) -> str:
+    """Encode a server push in the `{channel, event, data, timestamp}` wire shape."""
+    return json.dumps(
+        {
+            "channel": channel,
+            "event": event,
+            "data": data,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+    )
+
+
+class Subscriber:
+    """One connected client: its channel set and a bounded outbound queue.
+
+    Messages carrying a coalesce key replace any still-queued message with the
+    same key, so a slow client only ever receives the latest state for it.
+    When the queue is full the oldest message is dropped.
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self.channels: set[str] = set()
+        self.dropped = 0
+        self._max_queue = max_queue
+        self._queue: deque[tuple[str | None, str]] = deque()
+        self._ready = asyncio.Event()
+
+    def offer(self, payload: str, coalesce_key: str | None = None) -> None:
+        if coalesce_key is not None:
+            for i, (key, _) in enumerate(self._queue):
+                if key == coalesce_key:
+                    del self._queue[i]
+                    self.dropped += 1
+                    break
+        if len(self._queue) >= self._max_queue:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append((coalesce_key, payload))
+        self._ready.set()
+
+    async def get(self) -> str:
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()[1]
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+
+class LiveHub:
+    """Channel-based broadcast hub behind /ws/live.
+
+    Each publish is encoded once and handed to every local subscriber of the
+    channel. When a Redis client is attached, publishes are also relayed over
+    pub/sub so clients connected to other workers receive them.
+
+    `series:<id>` channels carry a versioned snapshot followed by deltas. A
+    reconnecting client passes the last version it applied and is replayed
+    from the per-channel ring, or sent a fresh snapshot if it is too old.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 256,
+        redis: Any | None = None,
+        snapshot_loader: SnapshotLoader | None = None,
+        ring_size: int = 64,
+    ):
+        self._max_queue = max_queue
+        self._redis = redis
+        self._snapshot_loader = snapshot_loader
+        self._ring_size = ring_size
+        self._channels: dict[str, set[Subscriber]] = {}
+        self._series: dict[str, SeriesLog] = {}
+        self._worker_id = uuid.uuid4().hex
+        self._relay_task: asyncio.Task | None = None
+
+    def connect(self) -> Subscriber:
+        return Subscriber(max_queue=self._max_queue)
+
+    def disconnect(self, sub: Subscriber) -> None:
+        self.unsubscribe(sub, list(sub.channels))
+
+    def subscribe(self, sub: Subscriber, channels: list[str]) -> None:
+        for channel in channels:
+            self._channels.setdefault(channel, set()).add(sub)
+            sub.channels.add(channel)
+
+    def unsubscribe(self, sub: Subscriber, channels: list[str]) -> None:
+        for channel in channels:
+            subs = self._channels.get(channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._channels[channel]
+            sub.channels.discard(channel)
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._channels.get(channel, ()))
+
+    async def publish(
+        self,
+        channel: str,
+        event: str,
+        data: Any,
+        coalesce_key: str | None = None,
+    ) -> int:
+        """Broadcast to local subscribers and relay to other workers.
+
+        Returns the number of local subscribers the message was queued for.
+        """
+        payload = encode_message(channel, event, data)
+        delivered = self._deliver(channel, payload, coalesce_key)
+        await self._relay(channel, payload, coalesce_key)
+        return delivered
+
+    async def publish_series(self, series: dict[str, Any]) -> None:
+        """Publish a full series as a snapshot or as a delta against the last one.
+
+        Nothing is sent when the series is unchanged.
+        """
+        channel = f"{SERIES_CHANNEL_PREFIX}{series['series_id']}"
+        log = self._series.get(channel)
+        if log is None:
+            log = self._series[channel] = SeriesLog(self._ring_size)
+
+        delta = log.diff(series)
+        if delta is None:
+            return
+        if not delta:
+            log.reset(series)
+            payload = encode_message(channel, "snapshot", log.snapshot_data())
+            log.cache_snapshot(payload)
+        else:
+            base = log.version
+            log.apply(delta)
+            payload = encode_message(
+                channel,
+                "delta",
+                {"version": log.version, "base_version": base, **delta},
+            )
+            log.record(base, log.version, payload)
+
+        self._deliver(channel, payload, None)
+        await self._relay(channel, payload, None)
+
+    async def catch_up(
+        self, sub: Subscriber, channel: str, since: int | None = None
+    ) -> None:
+        """Bring a newly subscribed client up to date on a series channel.
+
+        A log is only kept for channels whose series exists (in the hub
+        already or per the snapshot loader), so subscribing to arbitrary
+        channel names creates no server state."""
+        log = self._series.get(channel)
+        if log is not None and since is not None and log.version:
+            replay = log.replay_since(since)
+            if replay is not None:
+                for payload in replay:
+                    sub.offer(payload)
+                return
+
+        if log is None or not log.known:
+            if self._snapshot_loader is None:
+                return
+            series = await self._snapshot_loader(
+                channel[len(SERIES_CHANNEL_PREFIX) :]
+            )
+            if series is None:
+                return
+            # A publish may have created the log while the loader ran
+            log = self._series.get(channel)
+            if log is None:
+                log = self._series[channel] = SeriesLog(self._ring_size)
+            if not log.known:
+                log.fill(series)
+
+        payload = log.cached_snapshot()
+        if payload is None:
+            payload = encode_message(channel, "snapshot", log.snapshot_data())
+            log.cache_snapshot(payload)
+        sub.offer(payload)
+
+    async def _relay(
+        self, channel: str, payload: str, coalesce_key: str | None
+    ) -> None:
+        if self._redis is None:
+            return
+        envelope = "\n".join([self._worker_id, channel, coalesce_key or "", payload])
+        try:
+            await self._redis.publish(REDIS_FANOUT_CHANNEL, envelope)
+        except Exception:
+            logger.exception("Failed to relay live message on %s", channel)
+
+    def _apply_remote_series(self, channel: str, payload: str) -> None:
+        """Mirror another worker's series update into the local log."""
+        msg = json.loads(payload)
+        data = msg["data"]
+        log = self._series.get(channel)
+        if log is None:
+            log = self._series[channel] = SeriesLog(self._ring_size)
+
+        if msg["event"] == "snapshot":
+            log.reset(data["series"], version=data["version"])
+            log.cache_snapshot(payload)
+            return
+
+        if log.known and log.version == data["base_version"]:
+            log.apply(data, version=data["version"])
+        else:
+            log.invalidate(data["version"])
+        log.record(data["base_version"], data["version"], payload)
+
+    def _deliver(self, channel: str, payload: str, coalesce_key: str | None) -> int:
+        subs = self._channels.get(channel)
+        if not subs:
+            return 0
+        for sub in subs:
+            sub.offer(payload, coalesce_key)
+        return len(subs)
+
+    async def start(self) -> None:
+        """Start consuming relayed messages from other workers."""
+        if self._redis is not None and self._relay_task is None:
+            self._relay_task = asyncio.create_task(self._relay_loop())
+
+    async def _relay_loop(self) -> None:
+        while True:
+            try:
+                await self._consume_relay()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live relay disconnected, retrying")
+                await asyncio.sleep(RELAY_RETRY_SECONDS)
+
+    async def _consume_relay(self) -> None:
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(REDIS_FANOUT_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                raw = message["data"]
+                if isinstance(raw, bytes):
+                    raw = raw.decode()
+                origin, channel, key, payload = raw.split("\n", 3)
+                if origin == self._worker_id:
+                    continue
+                if channel.startswith(SERIES_CHANNEL_PREFIX):
+                    self._apply_remote_series(channel, payload)
+                self._deliver(channel, payload, key or None)
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            self._relay_task = None
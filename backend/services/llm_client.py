@@ -1,23 +1,152 @@
-from groq import AsyncGroq
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from core.metrics import (
+    LLM_QUEUE_SECONDS,
+    LLM_QUEUED,
+    LLM_REQUEST_SECONDS,
+    LLM_TOKENS,
+    bound,
+)
+from core.tracing import traced
+from services.llm_limiter import Grant, LLMRateLimiter, Priority
+from services.resilience import upstream
+
+DEFAULT_MODEL = "llama-3.1-70b-versatile"
+DEFAULT_TEMPERATURE = 0.3
+MAX_TOKENS = 2000
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough prompt size (~4 chars per token) plus the completion budget."""
+    return sum(len(t) for t in texts) // 4 + MAX_TOKENS
 
 
 class LLMClient:
-    def __init__(self, api_key: str):
-        self.client = AsyncGroq(api_key=api_key)
+    """Groq chat client. One instance is shared per app so calls reuse the
+    connection pool and pass through the same `limiter`, if any. Calls go
+    through the process-wide "groq" circuit breaker and are never hedged
+    (completions are neither cheap nor idempotent). Streams are timed to
+    their first chunk, so they keep a latency history ("groq_stream") apart
+    from the one full completions' timeout derives from."""
+
+    def __init__(
+        self,
+        api_key: str,
+        limiter: LLMRateLimiter | None = None,
+        max_connections: int = 10,
+    ):
+        # The Groq SDK is slow to import; load it only when a client is built
+        import httpx
+        from groq import AsyncGroq
+
+        self.client = AsyncGroq(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                )
+            ),
+        )
+        self.limiter = limiter
+        self.upstream = upstream("groq")
+        self.stream_upstream = upstream("groq_stream")
 
+    @traced("llm.chat")
     async def chat(
         self,
         system_prompt: str,
         user_prompt: str,
-        model: str = "llama-3.1-70b-versatile",
+        model: str = DEFAULT_MODEL,
+        temperature: float = DEFAULT_TEMPERATURE,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> str:
-        response = await self.client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            max_tokens=2000,
-        )
-        return response.choices[0].message.content or ""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        tokens = estimate_tokens(system_prompt, user_prompt)
+        async with self._admit(tokens, priority) as grant:
+            start, outcome = time.perf_counter(), "error"
+            try:
+                response = await self.upstream.call(
+                    lambda: self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=MAX_TOKENS,
+                    )
+                )
+                outcome = "ok"
+            finally:
+                bound(LLM_REQUEST_SECONDS, "chat", outcome).observe(
+                    time.perf_counter() - start
+                )
+            usage = getattr(response, "usage", None)
+            if grant is not None and usage is not None and usage.total_tokens:
+                grant.record(usage.total_tokens)
+            return response.choices[0].message.content or ""
+
+    async def chat_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = DEFAULT_MODEL,
+        temperature: float = DEFAULT_TEMPERATURE,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[str]:
+        """Yield completion text deltas as the model produces them."""
+        tokens = estimate_tokens(system_prompt, user_prompt)
+        async with self._admit(tokens, priority):
+            start, outcome = time.perf_counter(), "error"
+            try:
+                # The breaker and timeout cover the wait for the first bytes
+                stream = await self.stream_upstream.call(
+                    lambda: self.client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        temperature=temperature,
+                        max_tokens=MAX_TOKENS,
+                        stream=True,
+                    )
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                outcome = "ok"
+            finally:
+                bound(LLM_REQUEST_SECONDS, "stream", outcome).observe(
+                    time.perf_counter() - start
+                )
+
+    @asynccontextmanager
+    async def _admit(
+        self, tokens: int, priority: Priority
+    ) -> AsyncIterator[Grant | None]:
+        if self.limiter is None:
+            yield None
+            return
+        LLM_QUEUED.inc()
+        admitted = False
+        try:
+            async with self.limiter.acquire(tokens, priority) as grant:
+                admitted = True
+                LLM_QUEUED.dec()
+                bound(LLM_QUEUE_SECONDS, priority.name.lower()).observe(
+                    grant.queued_seconds
+                )
+                try:
+                    yield grant
+                finally:
+                    LLM_TOKENS.inc(grant.tokens)
+        finally:
+            if not admitted:
+                LLM_QUEUED.dec()
+
+    async def close(self) -> None:
+        await self.client.close()
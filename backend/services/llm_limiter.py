@@ -0,0 +1,139 @@
+"""Priority-ordered admission for LLM calls under RPM / TPM / concurrency limits."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """Lower runs first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+@dataclass
+class Grant:
+    """One admitted call; `record` replaces the token estimate with actual usage."""
+
+    started: float
+    tokens: int
+    queued_seconds: float = 0.0
+
+    def record(self, tokens: int) -> None:
+        self.tokens = tokens
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    enqueued: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class LLMRateLimiter:
+    """Admit calls highest-priority first while keeping, over a sliding
+    `window`, at most `rpm` call starts and `tpm` tokens, and at most
+    `max_concurrency` calls in flight.
+
+    Token counts are estimates at admission and are corrected through
+    `Grant.record` once the provider reports usage. A single call larger
+    than `tpm` is still admitted once the window is empty, so it cannot
+    wedge the queue.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int,
+        window: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.window = window
+        self._clock = clock
+        self._waiting: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._recent: deque[Grant] = deque()
+        self._active = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for w in self._waiting if not w.future.done())
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @asynccontextmanager
+    async def acquire(
+        self, tokens: int, priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[Grant]:
+        """Wait for admission; the slot is held until the block exits."""
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(priority, next(self._seq), tokens, self._clock(), future)
+        heapq.heappush(self._waiting, waiter)
+        self._pump()
+        try:
+            grant = await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+            raise
+        try:
+            yield grant
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._pump()
+
+    def _pump(self) -> None:
+        now = self._clock()
+        while self._recent and self._recent[0].started <= now - self.window:
+            self._recent.popleft()
+        while self._waiting:
+            waiter = self._waiting[0]
+            if waiter.future.done():
+                heapq.heappop(self._waiting)
+                continue
+            if self._active >= self.max_concurrency:
+                return
+            used = sum(g.tokens for g in self._recent)
+            if self._recent and (
+                len(self._recent) >= self.rpm or used + waiter.tokens > self.tpm
+            ):
+                self._wake_at(self._recent[0].started + self.window - now)
+                return
+            heapq.heappop(self._waiting)
+            grant = Grant(started=now, tokens=waiter.tokens)
+            grant.queued_seconds = now - waiter.enqueued
+            self._recent.append(grant)
+            self._active += 1
+            waiter.future.set_result(grant)
+
+    def _wake_at(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(
+            max(delay, 0.0), self._on_timer
+        )
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._pump()
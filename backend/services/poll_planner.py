@@ -0,0 +1,149 @@
+"""Per-series poll scheduling from frequency, release calendar and update history.
+
+State lives in one Redis hash, `poll:fred`, field per series:
+
+    due           epoch seconds of the next poll
+    frequency     FRED frequency string ("Monthly", "Quarterly", ...)
+    last_updated  FRED `last_updated` at the previous poll
+    updates       epoch seconds at which `last_updated` changed (newest last)
+    next_release  next scheduled release date (YYYY-MM-DD) if FRED has one
+
+A poll costs one `series` request; observations are only fetched when
+`last_updated` moved. The next poll is placed just before the expected
+release and then repeated every `fast` seconds, backing off the longer a
+release is overdue. A poll is planned first and committed once its
+observations are fetched and published, so a failed fetch leaves the
+series due and the release is picked up on the next run.
+"""
+
+import logging
+import re
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from services.fred_client import FredClient
+from storage.redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+POLL_KEY = "poll:fred"
+POLL_TTL = 30 * 86400
+MAX_UPDATES = 8
+DAY = 86400.0
+# Seconds between releases by FRED frequency prefix ("Monthly, End of Period")
+_PERIODS = (
+    ("Daily", DAY),
+    ("Weekly", 7 * DAY),
+    ("Biweekly", 14 * DAY),
+    ("Monthly", 30 * DAY),
+    ("Quarterly", 91 * DAY),
+    ("Semiannual", 182 * DAY),
+    ("Annual", 365 * DAY),
+)
+
+
+def period_for(frequency: str) -> float:
+    return next((p for prefix, p in _PERIODS if frequency.startswith(prefix)), DAY)
+
+
+def parse_last_updated(value: str) -> float:
+    """Epoch seconds of a FRED timestamp such as "2024-01-26 07:51:02-06"."""
+    if re.search(r"[+-]\d\d$", value):
+        value += "00"
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S%z").timestamp()
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(value, high))
+
+
+def expected_release(state: dict[str, Any], now: float) -> float | None:
+    """When the next update should land: the scheduled release date if it
+    is still ahead, else the last update plus the typical gap between
+    updates (or the nominal period before there is a history)."""
+    release = state.get("next_release")
+    if release:
+        start = datetime.fromisoformat(release).replace(tzinfo=timezone.utc)
+        if start.timestamp() + DAY > now:
+            return start.timestamp()
+    updates = state.get("updates") or []
+    if not updates:
+        return None
+    gaps = [b - a for a, b in zip(updates, updates[1:])]
+    gap = statistics.median(gaps) if gaps else period_for(state["frequency"])
+    return updates[-1] + gap
+
+
+def next_poll(state: dict[str, Any], now: float, fast: float) -> float:
+    period = period_for(state["frequency"])
+    expected = expected_release(state, now)
+    if expected is None:
+        return now + _clamp(period / 8, fast, DAY)
+    lead = _clamp(period * 0.02, fast, DAY)
+    if now < expected - lead:
+        # Sleep until the release window, but re-check at least every half period
+        return min(expected - lead, now + period / 2)
+    overdue = max(now - expected, 0.0)
+    return now + _clamp(overdue / 4, fast, period / 4)
+
+
+@dataclass(slots=True)
+class Poll:
+    """A planned poll. `changed` tells whether the series moved since the
+    last committed poll, `ttl` how long its cached copy must live to last
+    until the next one; `state` is saved by `PollPlanner.commit`."""
+
+    series_id: str
+    changed: bool
+    ttl: int
+    state: dict[str, Any]
+
+
+class PollPlanner:
+    def __init__(
+        self,
+        cache: RedisCache,
+        fred: FredClient,
+        fast: float = 900.0,
+        clock=time.time,
+    ):
+        self.cache = cache
+        self.fred = fred
+        self.fast = fast
+        self._clock = clock
+
+    async def due(self, series_ids: list[str]) -> list[str]:
+        """Series whose next poll time has passed (or that were never polled)."""
+        states = await self.cache.hgetall(POLL_KEY)
+        now = self._clock()
+        return [s for s in series_ids if s not in states or states[s]["due"] <= now]
+
+    async def plan(self, series_id: str, info: dict[str, Any]) -> Poll:
+        """Schedule the next poll from `info` (FRED series metadata) without
+        saving it; `commit` once the poll has been handled."""
+        now = self._clock()
+        state = await self.cache.hget(POLL_KEY, series_id) or {"updates": []}
+        changed = state.get("last_updated") != info["last_updated"]
+        state["frequency"] = info["frequency"]
+        if changed:
+            state["last_updated"] = info["last_updated"]
+            updated = parse_last_updated(info["last_updated"])
+            state["updates"] = [*state["updates"], updated][-MAX_UPDATES:]
+            state["next_release"] = await self._next_release(series_id, now)
+        state["due"] = next_poll(state, now, self.fast)
+        return Poll(series_id, changed, int(state["due"] - now + 2 * self.fast), state)
+
+    async def commit(self, poll: Poll) -> None:
+        await self.cache.hset(POLL_KEY, poll.series_id, poll.state, ttl=POLL_TTL)
+
+    async def _next_release(self, series_id: str, now: float) -> str | None:
+        # Called right after an update, so today's release (if any) is done
+        after = datetime.fromtimestamp(now, timezone.utc).date() + timedelta(days=1)
+        try:
+            return await self.fred.get_next_release_date(series_id, after.isoformat())
+        except Exception:
+            logger.warning("No release calendar for FRED %s", series_id)
+            return None
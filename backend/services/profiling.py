@@ -0,0 +1,178 @@
+"""In-process profiling for a running worker: a stack sampler and an
+event-loop watchdog. Both watch the event-loop thread from a helper
+thread, so they also see code that blocks the loop.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from types import FrameType
+from typing import Any
+
+from core.metrics import LOOP_LAG_SECONDS, LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _stack(frame: FrameType | None) -> tuple[str, ...]:
+    """Frame labels from the outermost call down to `frame`."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+class SamplingProfiler:
+    """Sample the stack of one thread every `interval` seconds.
+
+    Output is either folded stacks (`a;b;c 12` per line, for flamegraph.pl
+    or speedscope's import) or a speedscope "sampled" profile.
+    """
+
+    def __init__(self, interval: float = 0.005, max_seconds: float = 300.0):
+        self.interval = interval
+        self.max_seconds = max_seconds  # a forgotten profiler stops itself
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.started: float | None = None
+        self.duration = 0.0
+        self._target: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, thread_id: int | None = None) -> None:
+        """Sample `thread_id` (default: the calling thread, i.e. the loop)."""
+        if self.running:
+            raise RuntimeError("Profiler already running")
+        self._target = thread_id or threading.get_ident()
+        self.samples.clear()
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        deadline = self.started + self.max_seconds
+        while not self._stop.wait(self.interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.samples[_stack(frame)] += 1
+
+    def folded(self) -> str:
+        lines = (f"{';'.join(s)} {n}" for s, n in self.samples.most_common())
+        return "\n".join(lines)
+
+    def speedscope(self, name: str = "worker") -> dict[str, Any]:
+        frames: dict[str, int] = {}
+        samples, weights = [], []
+        for stack, count in self.samples.items():
+            samples.append([frames.setdefault(label, len(frames)) for label in stack])
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": label} for label in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{name} (pid {os.getpid()})",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+class LoopWatchdog:
+    """Measure event-loop lag and log what is blocking the loop.
+
+    A heartbeat task on the loop records when it last ran. A helper thread
+    checks the heartbeat every `interval`; once it is older than
+    `threshold`, the loop thread's current stack (the slow callback) is
+    logged, once per stall. Lag per heartbeat goes to `loop_lag_seconds`.
+    """
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = 0
+        self.max_lag = 0.0
+        self._beat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - expected, 0.0)
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            self._beat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            blocked = time.monotonic() - beat
+            if blocked < self.threshold or reported == beat:
+                continue
+            reported = beat
+            self.stalls += 1
+            LOOP_STALLS.inc()
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            logger.warning(
+                "Event loop blocked for %.0f ms; loop thread is at:\n%s",
+                blocked * 1000,
+                stack,
+            )
@@ -0,0 +1,265 @@
+"""Circuit breakers, latency-derived timeouts and hedged calls for upstream APIs.
+
+One `Upstream` per external service (see `upstream()`) is shared by every
+client instance in the process, so the API handlers and scheduled jobs
+see the same breaker state and latency history. Calls whose latency is
+not comparable to the service's usual ones get an Upstream of their own
+(`groq_stream` times only the first chunk; `fred_backfill` pages are
+orders of magnitude larger), so they do not skew its timeout.
+
+- Breaker: after `failure_threshold` consecutive faults the circuit opens
+  and calls fail fast with CircuitOpenError for `reset_timeout` seconds;
+  then one probe call is let through (half-open) and its outcome closes
+  or re-opens the circuit. Client errors (4xx other than 429) are the
+  caller's fault and do not count.
+- Timeout: a multiple of the observed p99 latency, kept between
+  `min_timeout` and `max_timeout` (the latter until enough samples exist).
+- Hedging: for idempotent calls, a second attempt starts once the first
+  has run past the observed p95; whichever succeeds first wins.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from core.config import settings
+from core.metrics import UPSTREAM_CALLS, UPSTREAM_CIRCUIT_STATE, UPSTREAM_HEDGES
+
+T = TypeVar("T")
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """The upstream's circuit is open; `retry_after` seconds until a probe."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} circuit open, retry in {retry_after:.0f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class UpstreamTimeoutError(TimeoutError):
+    pass
+
+
+def is_fault(exc: BaseException) -> bool:
+    """Whether an exception says the upstream is unhealthy (vs a bad request).
+
+    Status errors from httpx and the Groq SDK both carry `.response`."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return True
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._state_gauge = UPSTREAM_CIRCUIT_STATE.labels(name)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() >= self._reopen_at:
+            self._set(HALF_OPEN)
+        return self._state
+
+    @property
+    def _reopen_at(self) -> float:
+        return self._opened_at + self.reset_timeout
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError; in half-open state only one
+        probe is admitted until it reports back."""
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probing):
+            retry_after = max(self._reopen_at - self._clock(), 1)
+            raise CircuitOpenError(self.name, retry_after)
+        if state == HALF_OPEN:
+            self._probing = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        self._set(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            self._probing = False
+            self._opened_at = self._clock()
+            self._set(OPEN)
+
+    def release(self) -> None:
+        """A call ended without a verdict (cancelled); free the probe slot."""
+        self._probing = False
+
+    def _set(self, state: str) -> None:
+        self._state = state
+        self._state_gauge.set(_STATE_VALUES[state])
+
+
+class LatencyTracker:
+    """Percentiles over the last `size` successful call latencies."""
+
+    def __init__(self, size: int = 256, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """None until `min_samples` latencies have been seen."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Upstream:
+    def __init__(
+        self,
+        name: str,
+        breaker: CircuitBreaker | None = None,
+        min_timeout: float = 1.0,
+        max_timeout: float = 10.0,
+        timeout_multiplier: float = 4.0,
+        hedge: bool = False,
+    ):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.latency = LatencyTracker()
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.hedge = hedge
+        self._calls = {
+            outcome: UPSTREAM_CALLS.labels(name, outcome)
+            for outcome in ("ok", "error", "timeout", "rejected")
+        }
+        self._hedges = UPSTREAM_HEDGES.labels(name)
+
+    def timeout(self) -> float:
+        p99 = self.latency.percentile(0.99)
+        if p99 is None:
+            return self.max_timeout
+        scaled = p99 * self.timeout_multiplier
+        return min(max(scaled, self.min_timeout), self.max_timeout)
+
+    async def call(
+        self, factory: Callable[[], Awaitable[T]], idempotent: bool = False
+    ) -> T:
+        """Run `factory()` under the breaker and timeout, hedging it when
+        `idempotent` and hedging is enabled for this upstream."""
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._calls["rejected"].inc()
+            raise
+        timeout = self.timeout()
+        hedge_after = None
+        if idempotent and self.hedge:
+            hedge_after = self.latency.percentile(0.95)
+        start = time.perf_counter()
+        try:
+            if hedge_after is None:
+                attempt = factory()
+            else:
+                attempt = self._hedged(factory, hedge_after)
+            result = await asyncio.wait_for(attempt, timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            self._calls["timeout"].inc()
+            raise UpstreamTimeoutError(
+                f"{self.name} did not answer within {timeout:.1f}s"
+            ) from None
+        except Exception as exc:
+            if is_fault(exc):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            self._calls["error"].inc()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        self.latency.observe(time.perf_counter() - start)
+        self.breaker.record_success()
+        self._calls["ok"].inc()
+        return result
+
+    async def _hedged(self, factory: Callable[[], Awaitable[T]], delay: float) -> T:
+        tasks = {asyncio.ensure_future(factory())}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self._hedges.inc()
+                tasks.add(asyncio.ensure_future(factory()))
+            error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_upstreams: dict[str, Upstream] = {}
+
+
+def upstream(name: str) -> Upstream:
+    """The process-wide Upstream for `name` ("fred", "fred_backfill", "groq"
+    or "groq_stream")."""
+    if name not in _upstreams:
+        _upstreams[name] = _build(name)
+    return _upstreams[name]
+
+
+def _build(name: str) -> Upstream:
+    if name == "groq_stream":
+        # Own latency history, but a Groq outage opens the circuit for both
+        return Upstream(
+            name, upstream("groq").breaker, max_timeout=settings.LLM_TIMEOUT_SECONDS
+        )
+    breaker = CircuitBreaker(
+        name,
+        failure_threshold=settings.UPSTREAM_FAILURE_THRESHOLD,
+        reset_timeout=settings.UPSTREAM_RESET_SECONDS,
+    )
+    if name == "fred_backfill":
+        # A fixed timeout, and a breaker of its own so a struggling backfill
+        # does not fail live polls fast
+        timeout = settings.FRED_BACKFILL_TIMEOUT_SECONDS
+        return Upstream(name, breaker, min_timeout=timeout, max_timeout=timeout)
+    if name == "fred":
+        return Upstream(
+            name,
+            breaker,
+            max_timeout=settings.FRED_TIMEOUT_SECONDS,
+            hedge=settings.FRED_HEDGE,
+        )
+    return Upstream(name, breaker, max_timeout=settings.LLM_TIMEOUT_SECONDS)
@@ -0,0 +1,126 @@
+import time
+from collections import deque
+from typing import Any
+
+META_FIELDS = ("series_id", "title", "units", "frequency")
+
+
+def _next_version(previous: int) -> int:
+    """Versions are millisecond timestamps, so they stay unique across restarts."""
+    return max(previous + 1, time.time_ns() // 1_000_000)
+
+
+class SeriesLog:
+    """Versioned state of one live series channel plus a bounded replay ring.
+
+    The ring holds encoded deltas as `(base_version, version, payload)` so a
+    reconnecting client can be replayed forward from the version it last
+    applied. Clients whose version has fallen out of the ring get a snapshot.
+    """
+
+    def __init__(self, ring_size: int = 64):
+        self.version = 0
+        self.meta: dict[str, Any] = {}
+        self.points: dict[str, float | None] | None = None
+        self._ring: deque[tuple[int, int, str]] = deque(maxlen=ring_size)
+        self._snapshot_cache: tuple[int, str] | None = None
+
+    @property
+    def known(self) -> bool:
+        """False when the local points are unknown and a snapshot must be loaded."""
+        return self.points is not None
+
+    def diff(self, series: dict[str, Any]) -> dict[str, Any] | None:
+        """Compare a full series against the current state.
+
+        Returns `{"appended": [...], "revised": [...]}`, an empty dict when a
+        fresh snapshot is required (first sight, metadata change or removed
+        points), or None when nothing changed.
+        """
+        meta = {k: series[k] for k in META_FIELDS}
+        if self.points is None or meta != self.meta:
+            return {}
+
+        incoming = {p["date"]: p["value"] for p in series["data"]}
+        if not self.points.keys() <= incoming.keys():
+            return {}
+
+        last_date = max(self.points) if self.points else ""
+        appended, revised = [], []
+        for date, value in incoming.items():
+            if date not in self.points:
+                if date < last_date:
+                    return {}
+                appended.append({"date": date, "value": value})
+            elif self.points[date] != value:
+                revised.append({"date": date, "value": value})
+
+        if not appended and not revised:
+            return None
+        return {"appended": appended, "revised": revised}
+
+    def reset(self, series: dict[str, Any], version: int | None = None) -> int:
+        """Replace the whole state, dropping the replay ring."""
+        self.meta = {k: series[k] for k in META_FIELDS}
+        self.points = {p["date"]: p["value"] for p in series["data"]}
+        self.version = version if version is not None else _next_version(self.version)
+        self._ring.clear()
+        self._snapshot_cache = None
+        return self.version
+
+    def fill(self, series: dict[str, Any]) -> None:
+        """Load points for an unknown state without touching version or ring."""
+        self.meta = {k: series[k] for k in META_FIELDS}
+        self.points = {p["date"]: p["value"] for p in series["data"]}
+        if not self.version:
+            self.version = _next_version(0)
+        self._snapshot_cache = None
+
+    def invalidate(self, version: int) -> None:
+        """Forget local points after missing an update from another worker."""
+        self.points = None
+        self.version = version
+        self._ring.clear()
+        self._snapshot_cache = None
+
+    def apply(self, delta: dict[str, Any], version: int | None = None) -> int:
+        """Apply appended/revised points and advance the version."""
+        for point in delta["revised"]:
+            self.points[point["date"]] = point["value"]
+        for point in delta["appended"]:
+            self.points[point["date"]] = point["value"]
+        self.version = version if version is not None else _next_version(self.version)
+        self._snapshot_cache = None
+        return self.version
+
+    def record(self, base_version: int, version: int, payload: str) -> None:
+        self._ring.append((base_version, version, payload))
+
+    def replay_since(self, version: int) -> list[str] | None:
+        """Encoded deltas after `version`, or None if it is no longer replayable."""
+        if version == self.version:
+            return []
+        for i, (base, _, _) in enumerate(self._ring):
+            if base == version:
+                return [payload for _, _, payload in list(self._ring)[i:]]
+        return None
+
+    def snapshot_data(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "series": {
+                **self.meta,
+                "data": [
+                    {"date": date, "value": value}
+                    for date, value in sorted(self.points.items())
+                ],
+            },
+        }
+
+    def cached_snapshot(self) -> str | None:
+        if self._snapshot_cache and self._snapshot_cache[0] == self.version:
+            return self._snapshot_cache[1]
+        return None
+
+    def cache_snapshot(self, payload: str) -> None:
+        self._snapshot_cache = (self.version, payload)
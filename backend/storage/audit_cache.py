@@ -0,0 +1,180 @@
+"""Redis layout for cached LLM audit reports.
+
+Exact tier: `audit:{digest}` holds the report for a normalized
+(system prompt, user prompt, model, temperature, context) tuple. The user
+prompt describes the audited business; `context` is the market data block
+sent along with it, kept apart so it does not drown out the description.
+
+Semantic tier (optional): the normalized user prompt's 64-bit SimHash is
+split into eight 8-bit bands, and each band indexes the entry in a set
+`audit:sim:{scope}:{band}:{value}`. Fingerprints within
+SIMHASH_MAX_DISTANCE bits necessarily share a band, so one SMEMBERS per
+band finds every candidate. `scope` covers everything but the user prompt,
+so reports are never reused across models, temperatures, system prompts
+or market data.
+
+Lookups are counted in `audit:stats:{exact,semantic,miss}` so the hit rate
+is shared by all workers.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Any
+
+from core.http_cache import digest
+from storage.redis_cache import RedisCache
+
+AUDIT_TTL = 86400
+SIMHASH_BANDS = 8
+SIMHASH_MAX_DISTANCE = 6  # must stay below SIMHASH_BANDS
+STATS_KINDS = ("exact", "semantic", "miss")
+
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Unicode-normalize, casefold and collapse whitespace."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word bigrams (single words for very short text)."""
+    words = _WORD.findall(text)
+    features = (
+        [f"{a} {b}" for a, b in zip(words, words[1:])] if len(words) >= 2 else words
+    )
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(
+            hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big"
+        )
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def _bands(fingerprint: int) -> list[int]:
+    width = 64 // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [fingerprint >> (i * width) & mask for i in range(SIMHASH_BANDS)]
+
+
+def _context_field(context: str) -> list[str]:
+    # Absent rather than empty without context, so those keys are unchanged
+    return [digest(normalize(context).encode())] if context else []
+
+
+def audit_key(entry: str) -> str:
+    return f"audit:{entry}"
+
+
+def stats_key(kind: str) -> str:
+    return f"audit:stats:{kind}"
+
+
+class AuditCache:
+    """Content-addressed cache of audit reports with an optional near-duplicate tier."""
+
+    def __init__(self, cache: RedisCache, ttl: int = AUDIT_TTL, semantic: bool = False):
+        self.cache = cache
+        self.ttl = ttl
+        self.semantic = semantic
+
+    @staticmethod
+    def entry_for(
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        temperature: float,
+        context: str = "",
+    ) -> str:
+        fields = [normalize(system_prompt), normalize(user_prompt), model, temperature]
+        return digest(json.dumps(fields + _context_field(context)).encode())
+
+    @staticmethod
+    def _scope(
+        system_prompt: str, model: str, temperature: float, context: str = ""
+    ) -> str:
+        fields = [normalize(system_prompt), model, temperature]
+        return digest(json.dumps(fields + _context_field(context)).encode())
+
+    def _band_keys(self, scope: str, fingerprint: int) -> list[str]:
+        return [
+            f"audit:sim:{scope}:{i}:{band:02x}"
+            for i, band in enumerate(_bands(fingerprint))
+        ]
+
+    async def lookup(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        temperature: float,
+        context: str = "",
+    ) -> tuple[dict[str, Any] | None, str]:
+        """Return (report, kind) where kind is "exact", "semantic" or "miss"."""
+        entry = self.entry_for(system_prompt, user_prompt, model, temperature, context)
+        report = await self.cache.get(audit_key(entry))
+        kind = "exact"
+        if report is None and self.semantic:
+            report = await self._nearest(
+                system_prompt, user_prompt, model, temperature, context
+            )
+            kind = "semantic"
+        if report is None:
+            kind = "miss"
+        await self.cache.incr(stats_key(kind))
+        return report, kind
+
+    async def _nearest(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        temperature: float,
+        context: str,
+    ) -> dict[str, Any] | None:
+        fingerprint = simhash(normalize(user_prompt))
+        scope = self._scope(system_prompt, model, temperature, context)
+        candidates: dict[str, int] = {}
+        for key in self._band_keys(scope, fingerprint):
+            for member in await self.cache.smembers(key):
+                hex_print, _, entry = member.decode().partition(":")
+                candidates[entry] = (int(hex_print, 16) ^ fingerprint).bit_count()
+        for entry, distance in sorted(candidates.items(), key=lambda c: c[1]):
+            if distance > SIMHASH_MAX_DISTANCE:
+                break
+            report = await self.cache.get(audit_key(entry))
+            if report is not None:
+                return report
+        return None
+
+    async def store(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        temperature: float,
+        report: dict[str, Any],
+        context: str = "",
+    ) -> None:
+        entry = self.entry_for(system_prompt, user_prompt, model, temperature, context)
+        await self.cache.set_raw(
+            audit_key(entry), json.dumps(report).encode(), ttl=self.ttl, stale=False
+        )
+        if self.semantic:
+            fingerprint = simhash(normalize(user_prompt))
+            scope = self._scope(system_prompt, model, temperature, context)
+            member = f"{fingerprint:016x}:{entry}"
+            for key in self._band_keys(scope, fingerprint):
+                await self.cache.sadd(key, member, ttl=self.ttl)
+
+    async def stats(self) -> dict[str, float]:
+        counts = await self.cache.get_many([stats_key(k) for k in STATS_KINDS])
+        result = {k: int(c or 0) for k, c in zip(STATS_KINDS, counts)}
+        total = sum(result.values())
+        hits = result["exact"] + result["semantic"]
+        return {**result, "hit_rate": hits / total if total else 0.0}
@@ -0,0 +1,137 @@
+"""Redis layout for batch audit jobs.
+
+    audit:job:{id}            hash  status, total, unique, created, order
+                                    (JSON list of item keys, one per
+                                    submitted request)
+    audit:job:{id}:items      hash  item key -> AuditRequest JSON (deduped)
+    audit:job:{id}:completed  set   item keys with a stored result
+    audit:job:{id}:results    list  result JSON in completion order
+    audit:job:{id}:owner      str   worker currently running the job (lease)
+    audit:jobs:active         set   job ids not yet finished
+
+A result is appended and its key marked completed in one MULTI, watched
+on the completed set and skipped if the key is already in it, so after a
+crash exactly the items without a result are run again, and an item
+finished by two workers around a lease handover is listed once.
+"""
+
+import json
+import time
+from typing import Any
+
+from storage import job_lease
+from storage.redis_cache import RedisCache
+
+JOB_TTL = 7 * 86400
+ACTIVE_KEY = "audit:jobs:active"
+
+
+def job_key(job_id: str) -> str:
+    return f"audit:job:{job_id}"
+
+
+class AuditJobStore:
+    def __init__(self, cache: RedisCache, ttl: int = JOB_TTL):
+        self.redis = cache.redis
+        self.ttl = ttl
+
+    async def create(
+        self, job_id: str, order: list[str], items: dict[str, dict[str, Any]]
+    ) -> None:
+        key = job_key(job_id)
+        meta = {
+            "status": "running",
+            "total": len(order),
+            "unique": len(items),
+            "created": time.time(),
+            "order": json.dumps(order),
+        }
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=meta)
+            pipe.hset(
+                f"{key}:items",
+                mapping={k: json.dumps(v) for k, v in items.items()},
+            )
+            pipe.expire(key, self.ttl)
+            pipe.expire(f"{key}:items", self.ttl)
+            pipe.sadd(ACTIVE_KEY, job_id)
+            await pipe.execute()
+
+    async def meta(self, job_id: str) -> dict[str, Any] | None:
+        raw = await self.redis.hgetall(job_key(job_id))
+        if not raw:
+            return None
+        meta = {k.decode(): v.decode() for k, v in raw.items()}
+        return {
+            "status": meta["status"],
+            "total": int(meta["total"]),
+            "unique": int(meta["unique"]),
+            "created": float(meta["created"]),
+            "order": json.loads(meta["order"]),
+        }
+
+    async def pending(self, job_id: str) -> dict[str, dict[str, Any]]:
+        """Items that have no stored result yet."""
+        key = job_key(job_id)
+        items = await self.redis.hgetall(f"{key}:items")
+        done = await self.redis.smembers(f"{key}:completed")
+        return {
+            k.decode(): json.loads(v) for k, v in items.items() if k not in done
+        }
+
+    async def complete(
+        self, job_id: str, item_key: str, result: dict[str, Any]
+    ) -> bool:
+        """Store the item's result; False if it already had one."""
+        from redis.exceptions import WatchError
+
+        key = job_key(job_id)
+        done = f"{key}:completed"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(done)
+                    if await pipe.sismember(done, item_key):
+                        await pipe.unwatch()
+                        return False
+                    pipe.multi()
+                    pipe.sadd(done, item_key)
+                    pipe.rpush(
+                        f"{key}:results", json.dumps({"key": item_key, **result})
+                    )
+                    pipe.expire(done, self.ttl)
+                    pipe.expire(f"{key}:results", self.ttl)
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+
+    async def completed(self, job_id: str) -> int:
+        return await self.redis.llen(f"{job_key(job_id)}:results")
+
+    async def results(
+        self, job_id: str, cursor: int, limit: int
+    ) -> list[dict[str, Any]]:
+        raws = await self.redis.lrange(
+            f"{job_key(job_id)}:results", cursor, cursor + limit - 1
+        )
+        return [json.loads(raw) for raw in raws]
+
+    async def finish(self, job_id: str, status: str = "done") -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key(job_id), "status", status)
+            pipe.srem(ACTIVE_KEY, job_id)
+            pipe.delete(f"{job_key(job_id)}:owner")
+            await pipe.execute()
+
+    async def active(self) -> list[str]:
+        return [job_id.decode() for job_id in await self.redis.smembers(ACTIVE_KEY)]
+
+    async def claim(self, job_id: str, owner: str, lease: int) -> bool:
+        """Take (or renew) the run lease; False if another worker holds it."""
+        return await job_lease.claim(
+            self.redis, f"{job_key(job_id)}:owner", owner, lease
+        )
+
+    async def release(self, job_id: str, owner: str) -> bool:
+        return await job_lease.release(self.redis, f"{job_key(job_id)}:owner", owner)
@@ -0,0 +1,100 @@
+"""Redis layout for FRED backfill jobs.
+
+    backfill:job:{id}           hash  status, created, start (observation
+                                      start date or ""), series (JSON list)
+    backfill:job:{id}:progress  hash  series id -> checkpoint JSON
+    backfill:job:{id}:owner     str   worker currently running the job (lease)
+    backfill:jobs:active        set   job ids not yet finished
+
+A checkpoint is `{"offset", "count", "points", "done", "error"}`: `offset`
+observations of the series (oldest first) are in InfluxDB. It is written
+after every Influx batch, so a resumed job refetches from the first
+observation not yet written.
+"""
+
+import json
+import time
+from typing import Any
+
+from storage import job_lease
+from storage.redis_cache import RedisCache
+
+JOB_TTL = 7 * 86400
+ACTIVE_KEY = "backfill:jobs:active"
+
+
+def job_key(job_id: str) -> str:
+    return f"backfill:job:{job_id}"
+
+
+def new_checkpoint() -> dict[str, Any]:
+    return {"offset": 0, "count": None, "points": 0, "done": False, "error": None}
+
+
+class BackfillJobStore:
+    def __init__(self, cache: RedisCache, ttl: int = JOB_TTL):
+        self.redis = cache.redis
+        self.ttl = ttl
+
+    async def create(
+        self, job_id: str, series_ids: list[str], start: str | None
+    ) -> None:
+        key = job_key(job_id)
+        meta = {
+            "status": "running",
+            "created": time.time(),
+            "start": start or "",
+            "series": json.dumps(series_ids),
+        }
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=meta)
+            pipe.hset(
+                f"{key}:progress",
+                mapping={s: json.dumps(new_checkpoint()) for s in series_ids},
+            )
+            pipe.expire(key, self.ttl)
+            pipe.expire(f"{key}:progress", self.ttl)
+            pipe.sadd(ACTIVE_KEY, job_id)
+            await pipe.execute()
+
+    async def meta(self, job_id: str) -> dict[str, Any] | None:
+        raw = await self.redis.hgetall(job_key(job_id))
+        if not raw:
+            return None
+        meta = {k.decode(): v.decode() for k, v in raw.items()}
+        return {
+            "status": meta["status"],
+            "created": float(meta["created"]),
+            "start": meta["start"] or None,
+            "series": json.loads(meta["series"]),
+        }
+
+    async def progress(self, job_id: str) -> dict[str, dict[str, Any]]:
+        raw = await self.redis.hgetall(f"{job_key(job_id)}:progress")
+        return {k.decode(): json.loads(v) for k, v in raw.items()}
+
+    async def checkpoint(
+        self, job_id: str, series_id: str, state: dict[str, Any]
+    ) -> None:
+        await self.redis.hset(
+            f"{job_key(job_id)}:progress", series_id, json.dumps(state)
+        )
+
+    async def finish(self, job_id: str, status: str = "done") -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key(job_id), "status", status)
+            pipe.srem(ACTIVE_KEY, job_id)
+            pipe.delete(f"{job_key(job_id)}:owner")
+            await pipe.execute()
+
+    async def active(self) -> list[str]:
+        return [job_id.decode() for job_id in await self.redis.smembers(ACTIVE_KEY)]
+
+    async def claim(self, job_id: str, owner: str, lease: int) -> bool:
+        """Take (or renew) the run lease; False if another worker holds it."""
+        return await job_lease.claim(
+            self.redis, f"{job_key(job_id)}:owner", owner, lease
+        )
+
+    async def release(self, job_id: str, owner: str) -> bool:
+        return await job_lease.release(self.redis, f"{job_key(job_id)}:owner", owner)
@@ -0,0 +1,45 @@
+"""Run leases for background jobs (audit batches, FRED backfills).
+
+    {job key}:owner   str  id of the worker running the job, expiring after
+                           `lease` seconds unless renewed
+
+Renewal and release only touch the key while it still names the caller,
+checked under WATCH/MULTI rather than Lua so they also run against
+fakeredis in tests.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+async def _if_owner(redis: "Redis", key: str, owner: str, action: Callable) -> bool:
+    """Apply `action` to a MULTI pipeline only while `key` holds `owner`."""
+    from redis.exceptions import WatchError
+
+    async with redis.pipeline(transaction=True) as pipe:
+        await pipe.watch(key)
+        if await pipe.get(key) != owner.encode():
+            await pipe.unwatch()
+            return False
+        pipe.multi()
+        action(pipe)
+        try:
+            await pipe.execute()
+        except WatchError:
+            return False
+    return True
+
+
+async def claim(redis: "Redis", key: str, owner: str, lease: int) -> bool:
+    """Take (or renew) the lease; False if another worker holds it."""
+    if await redis.set(key, owner, nx=True, ex=lease):
+        return True
+    return await _if_owner(redis, key, owner, lambda pipe: pipe.expire(key, lease))
+
+
+async def release(redis: "Redis", key: str, owner: str) -> bool:
+    """Hand the lease back so another worker can take the job right away."""
+    return await _if_owner(redis, key, owner, lambda pipe: pipe.delete(key))
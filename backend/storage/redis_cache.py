@@ -1,7 +1,13 @@
 import json
 from typing import Any
 
-import redis.asyncio as redis
+from core.metrics import CACHE_LOOKUPS, bound
+from core.tracing import traced
+
+
+def _record(key: str, result: str) -> None:
+    """Count a read under the key's prefix ("fred", "audit", "region", ...)."""
+    bound(CACHE_LOOKUPS, key.partition(":")[0], result).inc()
 
 
 class RedisCache:
@@ -9,35 +15,112 @@ class RedisCache:
     STALE_TTL = 86400  # 24h stale backup
 
     def __init__(self, url: str):
+        from redis import asyncio as redis  # deferred: costly to import
+
         self.redis = redis.from_url(url, decode_responses=False)
 
+    @traced("redis.get")
     async def get(self, key: str) -> Any | None:
         """Get and JSON parse, return None on miss."""
         raw = await self.redis.get(key)
+        _record(key, "miss" if raw is None else "hit")
         if raw is None:
             return None
         return json.loads(raw)
 
+    @traced("redis.get_many")
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        """Fetch several keys in one MGET round-trip, None for each miss."""
+        if not keys:
+            return []
+        raws = await self.redis.mget(keys)
+        for key, raw in zip(keys, raws):
+            _record(key, "miss" if raw is None else "hit")
+        return [json.loads(raw) if raw is not None else None for raw in raws]
+
+    @traced("redis.get_raw")
+    async def get_raw(self, key: str) -> bytes | None:
+        """Get the stored bytes without decoding, None on miss."""
+        raw = await self.redis.get(key)
+        _record(key, "miss" if raw is None else "hit")
+        return raw
+
     async def set(self, key: str, data: Any, ttl: int = 300) -> None:
         """JSON serialize, set with TTL, also set stale backup with STALE_TTL."""
-        encoded = json.dumps(data).encode()
+        await self.set_raw(key, json.dumps(data).encode(), ttl=ttl)
+
+    @traced("redis.set_raw")
+    async def set_raw(
+        self, key: str, encoded: bytes, ttl: int = 300, stale: bool = True
+    ) -> None:
+        """Set already-encoded bytes with TTL, plus the stale backup unless disabled."""
         await self.redis.set(key, encoded, ex=ttl)
-        await self.redis.set(
-            f"{self.STALE_PREFIX}{key}", encoded, ex=self.STALE_TTL
-        )
+        if stale:
+            await self.redis.set(
+                f"{self.STALE_PREFIX}{key}", encoded, ex=self.STALE_TTL
+            )
 
+    @traced("redis.get_with_stale")
     async def get_with_stale(self, key: str) -> tuple[Any | None, bool]:
         """Try primary first, then stale backup. Returns (data, is_stale)."""
         raw = await self.redis.get(key)
         if raw is not None:
+            _record(key, "hit")
             return json.loads(raw), False
 
         stale_raw = await self.redis.get(f"{self.STALE_PREFIX}{key}")
         if stale_raw is not None:
+            _record(key, "stale")
             return json.loads(stale_raw), True
 
+        _record(key, "miss")
         return None, False
 
+    async def hget(self, key: str, field: str) -> Any | None:
+        """Get and JSON parse one field of a hash, None on miss."""
+        raw = await self.hget_raw(key, field)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    @traced("redis.hget_raw")
+    async def hget_raw(self, key: str, field: str) -> bytes | None:
+        """Get one field of a hash without decoding, None on miss."""
+        raw = await self.redis.hget(key, field)
+        _record(key, "miss" if raw is None else "hit")
+        return raw
+
+    @traced("redis.hgetall")
+    async def hgetall(self, key: str) -> dict[str, Any]:
+        """All fields of a hash, JSON parsed; empty dict on miss."""
+        raw = await self.redis.hgetall(key)
+        return {f.decode(): json.loads(v) for f, v in raw.items()}
+
+    async def hset(self, key: str, field: str, data: Any, ttl: int = 300) -> None:
+        """JSON serialize into one field of a hash and (re)arm the hash TTL."""
+        await self.hset_raw(key, field, json.dumps(data).encode(), ttl=ttl)
+
+    @traced("redis.hset_raw")
+    async def hset_raw(
+        self, key: str, field: str, encoded: bytes, ttl: int = 300
+    ) -> None:
+        """Set already-encoded bytes into one field of a hash and (re)arm its TTL."""
+        await self.redis.hset(key, field, encoded)
+        await self.redis.expire(key, ttl)
+
+    async def sadd(self, key: str, member: str, ttl: int = 300) -> None:
+        """Add a member to a set and (re)arm the set TTL."""
+        await self.redis.sadd(key, member)
+        await self.redis.expire(key, ttl)
+
+    async def smembers(self, key: str) -> list[bytes]:
+        return list(await self.redis.smembers(key))
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """Atomically increment a counter (no TTL); returns the new value."""
+        return await self.redis.incrby(key, amount)
+
+    @traced("redis.delete")
     async def delete(self, key: str) -> None:
         """Delete both primary and stale keys."""
         await self.redis.delete(key, f"{self.STALE_PREFIX}{key}")
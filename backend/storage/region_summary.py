@@ -0,0 +1,111 @@
+"""Redis layout for precomputed per-region market summaries.
+
+Each region is one hash, `region:{code}:summary`, so a reader gets
+everything about a region in a single HGETALL:
+
+    indicator:{series_id}   latest value, change and YoY of a cached series
+    risk                    latest RiskScore for the region
+    anomalies               most recent detector alerts, newest first
+
+Writers (ingest pipeline stages) update single fields as data arrives; nothing here
+is computed on the read path.
+"""
+
+import json
+from typing import Any
+
+from models.risk import RiskScore
+from storage.redis_cache import RedisCache
+
+SUMMARY_TTL = 7 * 86400
+MAX_ANOMALIES = 10
+# Observations per year by FRED frequency prefix ("Monthly, End of Period")
+_PER_YEAR = (("Weekly", 52), ("Monthly", 12), ("Quarterly", 4), ("Annual", 1))
+
+
+def summary_key(region: str) -> str:
+    return f"region:{region}:summary"
+
+
+def _pct(new: float | None, old: float | None) -> float | None:
+    if new is None or old is None or old == 0:
+        return None
+    return round((new - old) / abs(old) * 100, 2)
+
+
+def indicator_summary(series: dict[str, Any]) -> dict[str, Any] | None:
+    """Latest observation of a series with its change vs the prior point and
+    vs a year earlier (for weekly and coarser series)."""
+    points = [p for p in series["data"] if p["value"] is not None]
+    if not points:
+        return None
+    latest = points[-1]
+    per_year = next(
+        (n for prefix, n in _PER_YEAR if series["frequency"].startswith(prefix)), None
+    )
+    year_ago = None
+    if per_year and len(points) > per_year:
+        year_ago = points[-1 - per_year]["value"]
+    previous = points[-2]["value"] if len(points) > 1 else None
+    return {
+        "series_id": series["series_id"],
+        "title": series["title"],
+        "units": series["units"],
+        "date": latest["date"],
+        "value": latest["value"],
+        "change_pct": _pct(latest["value"], previous),
+        "yoy_pct": _pct(latest["value"], year_ago),
+    }
+
+
+async def update_indicator(
+    cache: RedisCache, regions: tuple[str, ...], series: dict[str, Any]
+) -> None:
+    summary = indicator_summary(series)
+    if summary is None:
+        return
+    for region in regions:
+        await cache.hset(
+            summary_key(region),
+            f"indicator:{series['series_id']}",
+            summary,
+            ttl=SUMMARY_TTL,
+        )
+
+
+async def set_risk(cache: RedisCache, score: RiskScore) -> None:
+    await cache.hset(
+        summary_key(score.region_code), "risk", score.model_dump(), ttl=SUMMARY_TTL
+    )
+
+
+async def add_anomaly(
+    cache: RedisCache, regions: tuple[str, ...], anomaly: dict[str, Any]
+) -> None:
+    """Prepend an alert to each region's recent anomalies. The list is
+    rewritten under WATCH, so concurrent writers retry rather than
+    overwrite each other's alerts."""
+    from redis.exceptions import WatchError
+
+    for region in regions:
+        key = summary_key(region)
+        async with cache.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.hget(key, "anomalies")
+                    recent = [anomaly, *(json.loads(raw) if raw else [])]
+                    pipe.multi()
+                    pipe.hset(key, "anomalies", json.dumps(recent[:MAX_ANOMALIES]))
+                    pipe.expire(key, SUMMARY_TTL)
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    continue
+
+
+async def get_summaries(
+    cache: RedisCache, regions: list[str]
+) -> dict[str, dict[str, Any]]:
+    """Summary hash per region (empty dict when nothing is stored)."""
+    return {region: await cache.hgetall(summary_key(region)) for region in regions}
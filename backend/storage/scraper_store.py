@@ -1,14 +1,29 @@
+import bisect
+import heapq
 import json
 import os
 import uuid
+from urllib.parse import urlsplit
 
 from models.scraper import ScraperConfig
 
 
+def _host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
 class ScraperStore:
     def __init__(self, path: str):
         self.path = path
         self._scrapers: dict[str, ScraperConfig] = {}
+        # Bumped on every mutation; with the per-instance epoch it tags listings
+        self._epoch = uuid.uuid4().hex[:8]
+        self._version = 0
+        # Secondary indexes, kept in sync by _index/_unindex
+        self._ids: list[str] = []  # sorted, drives cursor pagination
+        self._by_host: dict[str, set[str]] = {}
+        self._by_active: dict[bool, set[str]] = {True: set(), False: set()}
+        self._by_schedule: list[tuple[int, str]] = []  # sorted (minutes, id)
         self._load()
 
     def _load(self) -> None:
@@ -18,6 +33,7 @@ class ScraperStore:
                 for item in raw:
                     sc = ScraperConfig(**item)
                     self._scrapers[sc.id] = sc
+                    self._index(sc)
 
     def _save(self) -> None:
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
@@ -26,18 +42,91 @@ class ScraperStore:
                 [s.model_dump() for s in self._scrapers.values()], f, indent=2
             )
 
+    def _index(self, sc: ScraperConfig) -> None:
+        bisect.insort(self._ids, sc.id)
+        self._by_host.setdefault(_host_of(sc.url), set()).add(sc.id)
+        self._by_active[sc.active].add(sc.id)
+        bisect.insort(self._by_schedule, (sc.schedule_minutes, sc.id))
+
+    def _unindex(self, sc: ScraperConfig) -> None:
+        i = bisect.bisect_left(self._ids, sc.id)
+        if i < len(self._ids) and self._ids[i] == sc.id:
+            del self._ids[i]
+        host = _host_of(sc.url)
+        ids = self._by_host.get(host)
+        if ids is not None:
+            ids.discard(sc.id)
+            if not ids:
+                del self._by_host[host]
+        self._by_active[sc.active].discard(sc.id)
+        entry = (sc.schedule_minutes, sc.id)
+        j = bisect.bisect_left(self._by_schedule, entry)
+        if j < len(self._by_schedule) and self._by_schedule[j] == entry:
+            del self._by_schedule[j]
+
+    @property
+    def version(self) -> str:
+        return f"{self._epoch}.{self._version}"
+
     def create(self, config: ScraperConfig) -> ScraperConfig:
         config.id = uuid.uuid4().hex[:12]
         self._scrapers[config.id] = config
+        self._index(config)
+        self._version += 1
         self._save()
         return config
 
     def list_all(self) -> list[ScraperConfig]:
         return list(self._scrapers.values())
 
+    def query(
+        self,
+        active: bool | None = None,
+        host: str | None = None,
+        min_schedule: int | None = None,
+        max_schedule: int | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> tuple[list[ScraperConfig], str | None]:
+        """Return one page of scrapers ordered by id, plus the cursor for the next page.
+
+        Filters are resolved against the secondary indexes, so the cost scales
+        with the size of the matching set rather than the whole store.
+        """
+        candidates: list[set[str]] = []
+        if active is not None:
+            candidates.append(self._by_active[active])
+        if host is not None:
+            candidates.append(self._by_host.get(host.lower(), set()))
+        if min_schedule is not None or max_schedule is not None:
+            lo = 0
+            hi = len(self._by_schedule)
+            if min_schedule is not None:
+                lo = bisect.bisect_left(self._by_schedule, (min_schedule,))
+            if max_schedule is not None:
+                hi = bisect.bisect_left(self._by_schedule, (max_schedule + 1,))
+            candidates.append({sid for _, sid in self._by_schedule[lo:hi]})
+
+        if not candidates:
+            start = bisect.bisect_right(self._ids, cursor) if cursor else 0
+            page_ids = self._ids[start : start + limit + 1]
+        else:
+            candidates.sort(key=len)
+            matched = candidates[0].intersection(*candidates[1:])
+            page_ids = heapq.nsmallest(
+                limit + 1,
+                (sid for sid in matched if cursor is None or sid > cursor),
+            )
+
+        next_cursor = page_ids[limit - 1] if len(page_ids) > limit else None
+        return [self._scrapers[sid] for sid in page_ids[:limit]], next_cursor
+
     def get(self, scraper_id: str) -> ScraperConfig | None:
         return self._scrapers.get(scraper_id)
 
     def delete(self, scraper_id: str) -> None:
-        self._scrapers.pop(scraper_id, None)
+        sc = self._scrapers.pop(scraper_id, None)
+        if sc is not None:
+            self._unindex(sc)
+            self._version += 1
         self._save()
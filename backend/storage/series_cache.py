@@ -0,0 +1,71 @@
+"""Redis layout for cached FRED series and results derived from them."""
+
+from typing import Any
+
+from core.http_cache import digest
+from core.wire_format import JSON, encode_series
+from storage.redis_cache import RedisCache
+
+SERIES_TTL = 900  # matches the 15-minute fetch cadence
+
+
+def series_key(series_id: str) -> str:
+    return f"fred:{series_id}"
+
+
+def etag_key(series_id: str) -> str:
+    """Version tag of the cached series, hashed once when it is written."""
+    return f"fred:{series_id}:etag"
+
+
+def derived_key(series_id: str) -> str:
+    """Hash of transformed variants (downsampled, resampled) keyed by params."""
+    return f"fred:{series_id}:derived"
+
+
+async def store_series(
+    cache: RedisCache, series_id: str, series: dict[str, Any], ttl: int = SERIES_TTL
+) -> str:
+    """Cache a full series with its version tag and drop variants derived
+    from the previous version. Returns the new version tag.
+
+    `ttl` can exceed the default when the fetcher knows the series will not
+    be polled again sooner (see services.poll_planner).
+
+    The body is written before the tag, so a concurrent reader can at worst
+    pair an old tag with a new body and refetch, never the reverse. It is
+    encoded exactly as the JSON responses are, so a version tag always
+    stands for one byte sequence whether it was served from Redis or
+    re-encoded on a miss.
+    """
+    encoded = encode_series(series, JSON)
+    version = digest(encoded)
+    await cache.set_raw(series_key(series_id), encoded, ttl=ttl)
+    await cache.set_raw(
+        etag_key(series_id),
+        version.encode(),
+        ttl=max(ttl, RedisCache.STALE_TTL),
+        stale=False,
+    )
+    await cache.delete(derived_key(series_id))
+    if ttl >= RedisCache.STALE_TTL:
+        await _keep_stale_copy(cache, series_id, ttl)
+    return version
+
+
+async def touch_series(cache: RedisCache, series_id: str, ttl: int) -> None:
+    """Keep an unchanged cached series (and its tag) alive for `ttl` more seconds."""
+    await cache.redis.expire(series_key(series_id), ttl)
+    await cache.redis.expire(etag_key(series_id), max(ttl, RedisCache.STALE_TTL))
+    await _keep_stale_copy(cache, series_id, ttl)
+
+
+async def _keep_stale_copy(cache: RedisCache, series_id: str, ttl: int) -> None:
+    """Let the stale backup outlive the body, for fallback when FRED is down."""
+    stale_key = f"{RedisCache.STALE_PREFIX}{series_key(series_id)}"
+    await cache.redis.expire(stale_key, ttl + RedisCache.STALE_TTL)
+
+
+async def get_series_version(cache: RedisCache, series_id: str) -> str | None:
+    raw = await cache.get_raw(etag_key(series_id))
+    return raw.decode() if raw is not None else None
@@ -1,5 +1,10 @@
+from types import SimpleNamespace
+
+import fakeredis
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from storage.redis_cache import RedisCache
 
 
 @pytest.fixture
@@ -12,3 +17,43 @@ def mock_influx_query_api():
     api = AsyncMock()
     api.query = AsyncMock(return_value=[])
     return api
+
+
+@pytest.fixture
+def fake_cache():
+    """RedisCache backed by an in-process fakeredis server."""
+    with patch(
+        "redis.asyncio.from_url", return_value=fakeredis.FakeAsyncRedis()
+    ):
+        return RedisCache("redis://fake")
+
+
+class StubGroqStream:
+    """Local stand-in for a Groq streaming completion: yields `text` in
+    `chunk_size` pieces shaped like `ChatCompletionChunk`, counting reads."""
+
+    def __init__(self, text: str, chunk_size: int = 7):
+        self.chunks = [
+            text[i : i + chunk_size] for i in range(0, len(text), chunk_size)
+        ]
+        self.consumed = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            delta = SimpleNamespace(content=chunk)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+@pytest.fixture
+def groq_stream_stub():
+    """Factory patching an LLMClient so streamed completions replay `text`."""
+
+    def install(llm, text: str, chunk_size: int = 7) -> StubGroqStream:
+        stream = StubGroqStream(text, chunk_size)
+        llm.client = MagicMock()
+        llm.client.chat.completions.create = AsyncMock(return_value=stream)
+        llm.client.close = AsyncMock()
+        return stream
+
+    return install
@@ -0,0 +1,121 @@
+"""Tests for the admin surface (/api/admin: profiling, backfill; X-Trace)."""
+
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from core import security
+from main import app
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def admin_token():
+    with patch.object(security.settings, "ADMIN_TOKEN", TOKEN):
+        yield {"X-Admin-Token": TOKEN}
+
+
+async def _client() -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_admin_api_is_hidden_without_configured_token():
+    async with await _client() as ac:
+        response = await ac.post("/api/admin/profile/start")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_admin_api_rejects_wrong_token(admin_token):
+    async with await _client() as ac:
+        response = await ac.post(
+            "/api/admin/profile/start", headers={"X-Admin-Token": "nope"}
+        )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_profile_start_stop_returns_folded_stacks(admin_token):
+    async with await _client() as ac:
+        started = await ac.post(
+            "/api/admin/profile/start",
+            params={"interval_ms": 1},
+            headers=admin_token,
+        )
+        again = await ac.post("/api/admin/profile/start", headers=admin_token)
+        stopped = await ac.post(
+            "/api/admin/profile/stop", params={"fmt": "folded"}, headers=admin_token
+        )
+
+    assert started.status_code == 202
+    assert started.json()["interval_ms"] == 1
+    assert again.status_code == 409
+    assert stopped.status_code == 200
+    assert stopped.headers["content-type"].startswith("text/plain")
+
+
+@pytest.mark.asyncio
+async def test_trace_header_returns_server_timing(admin_token, fake_cache):
+    await fake_cache.set("region:americas:summary", {})
+    with patch("api.audit.get_cache", return_value=fake_cache):
+        async with await _client() as ac:
+            traced = await ac.get(
+                "/api/audit/cache/stats", headers={"X-Trace": "1", **admin_token}
+            )
+            untraced = await ac.get(
+                "/api/audit/cache/stats", headers={"X-Trace": "1"}
+            )
+
+    assert traced.status_code == 200
+    assert "redis.get_many" in traced.headers["Server-Timing"]
+    assert "Server-Timing" not in untraced.headers
+
+
+@pytest.mark.asyncio
+async def test_backfill_submit_and_status(admin_token, fake_cache):
+    from unittest.mock import AsyncMock
+
+    from services.backfill_jobs import BackfillRunner
+    from storage.backfill_jobs import BackfillJobStore
+
+    fred = AsyncMock()
+    fred.get_observation_page.return_value = {
+        "count": 2,
+        "observations": [
+            {"date": "2000-01-01", "value": "1.0"},
+            {"date": "2000-02-01", "value": "."},
+        ],
+    }
+    influx = AsyncMock()
+    influx.write_batch.return_value = 1
+    runner = BackfillRunner(BackfillJobStore(fake_cache), influx, fred)
+
+    with patch("api.admin.get_backfill", return_value=runner):
+        async with await _client() as ac:
+            submitted = await ac.post(
+                "/api/admin/backfill",
+                json={"series_ids": ["GDP", "GDP"]},
+                headers=admin_token,
+            )
+            await runner.wait()
+            job_id = submitted.json()["job_id"]
+            status = await ac.get(f"/api/admin/backfill/{job_id}", headers=admin_token)
+            missing = await ac.get("/api/admin/backfill/nope", headers=admin_token)
+
+    assert submitted.status_code == 202
+    assert submitted.json()["total"] == 1  # duplicates collapsed
+    body = status.json()
+    assert body["status"] == "done"
+    assert body["completed"] == 1 and body["points"] == 1
+    assert body["series"][0] == {
+        "series_id": "GDP",
+        "offset": 2,
+        "count": 2,
+        "points": 1,
+        "done": True,
+        "error": None,
+    }
+    assert missing.status_code == 404
@@ -1,5 +1,6 @@
 """Tests for POST /api/audit endpoint."""
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, patch
 
@@ -8,6 +9,9 @@ from httpx import ASGITransport, AsyncClient
 
 from main import app
 from models.audit import SWOTReport
+from services.audit_engine import AuditEngine
+from services.audit_jobs import AuditJobRunner
+from storage.audit_jobs import AuditJobStore
 
 
 @pytest.fixture
@@ -25,7 +29,7 @@ def valid_swot_report():
 async def test_post_audit(valid_swot_report):
     """Mock get_audit_engine, verify 200 + body has strengths/threats."""
     mock_engine = AsyncMock()
-    mock_engine.analyze.return_value = valid_swot_report
+    mock_engine.analyze_cached.return_value = (valid_swot_report, "off")
 
     with patch("api.audit.get_audit_engine", return_value=mock_engine):
         transport = ASGITransport(app=app)
@@ -46,7 +50,68 @@ async def test_post_audit(valid_swot_report):
     assert "threats" in body
     assert len(body["threats"]) == 1
     assert "risk_summary" in body
-    mock_engine.analyze.assert_awaited_once()
+    assert "X-Cache" not in response.headers
+    mock_engine.analyze_cached.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_post_audit_repeat_is_served_from_cache(valid_swot_report, fake_cache):
+    """A byte-identical request is answered from Redis without calling the LLM."""
+    payload = {
+        "model_description": "SaaS platform for supply chain analytics",
+        "target_market": "US manufacturing sector",
+        "industry": "Technology",
+    }
+    llm = AsyncMock(return_value=valid_swot_report.model_dump_json())
+
+    with (
+        patch("api.audit.get_cache", return_value=fake_cache),
+        patch("services.audit_engine.AuditEngine._call_llm", llm),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = await ac.post("/api/audit", json=payload)
+            second = await ac.post("/api/audit", json=payload)
+            stats = await ac.get("/api/audit/cache/stats")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["X-Cache-Match"] == "exact"
+    assert second.json() == first.json()
+    llm.assert_awaited_once()
+    assert stats.json() == {"exact": 1, "semantic": 0, "miss": 1, "hit_rate": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_post_audit_open_circuit_is_503():
+    from services.resilience import CircuitOpenError
+
+    mock_engine = AsyncMock()
+    mock_engine.analyze_cached.side_effect = CircuitOpenError("groq", 20)
+
+    with patch("api.audit.get_audit_engine", return_value=mock_engine):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/audit",
+                json={
+                    "model_description": "SaaS platform for supply chain analytics",
+                    "target_market": "US manufacturing sector",
+                    "industry": "Technology",
+                },
+            )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "20"
+
+
+@pytest.mark.asyncio
+async def test_audit_cache_stats_without_cache():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/api/audit/cache/stats")
+
+    assert response.status_code == 503
 
 
 @pytest.mark.asyncio
@@ -63,3 +128,101 @@ async def test_post_audit_missing_field():
         )
 
     assert response.status_code == 422
+
+
+def _sse_events(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_post_audit_stream(valid_swot_report, groq_stream_stub):
+    """stream=true answers with SSE items, then the validated report."""
+    engine = AuditEngine(api_key="test-key")
+    groq_stream_stub(engine._llm, valid_swot_report.model_dump_json())
+
+    with patch("api.audit.get_audit_engine", return_value=engine):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/audit",
+                params={"stream": "true"},
+                json={
+                    "model_description": "SaaS platform for supply chain analytics",
+                    "target_market": "US manufacturing sector",
+                    "industry": "Technology",
+                },
+            )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [e for e, _ in events].count("item") == 5
+    assert events[0][1]["value"] == "Strong technology stack"
+    assert events[-1] == (
+        "report",
+        {"report": valid_swot_report.model_dump(), "cache": "off"},
+    )
+    # the engine built its own client for this request and closed it
+    engine._llm.client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_post_audit_stream_reports_error_event(groq_stream_stub):
+    engine = AuditEngine(api_key="test-key")
+    groq_stream_stub(engine._llm, "not json at all")
+
+    with patch("api.audit.get_audit_engine", return_value=engine):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/audit",
+                params={"stream": "true"},
+                json={"model_description": "x", "target_market": "y", "industry": "z"},
+            )
+
+    [(event, data)] = _sse_events(response.text)
+    assert event == "error"
+    assert data["detail"].startswith("Upstream error from LLM")
+
+
+@pytest.mark.asyncio
+async def test_audit_batch_job(valid_swot_report, fake_cache):
+    """Submit a batch, then page through results by cursor."""
+    engine = AuditEngine(api_key="test-key")
+    engine._call_llm = AsyncMock(return_value=valid_swot_report.model_dump_json())
+    runner = AuditJobRunner(AuditJobStore(fake_cache), engine)
+    item = {"model_description": "x", "target_market": "y", "industry": "z"}
+    other = {**item, "industry": "Energy"}
+
+    with patch("api.audit.get_audit_jobs", return_value=runner):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            submitted = await ac.post(
+                "/api/audit/batch", json={"items": [item, other, item]}
+            )
+            job_id = submitted.json()["job_id"]
+            await asyncio.gather(*list(runner._tasks.values()))
+            first = await ac.get(f"/api/audit/batch/{job_id}", params={"limit": 1})
+            rest = await ac.get(
+                f"/api/audit/batch/{job_id}",
+                params={"cursor": first.json()["next_cursor"]},
+            )
+            missing = await ac.get("/api/audit/batch/unknown")
+
+    assert submitted.status_code == 202
+    assert submitted.json()["total"] == 3
+    assert submitted.json()["unique"] == 2
+    body = first.json()
+    assert body["status"] == "done"
+    assert body["completed"] == 2
+    assert len(body["results"]) == 1
+    indices = sorted(
+        tuple(r["indices"]) for r in body["results"] + rest.json()["results"]
+    )
+    assert indices == [(0, 2), (1,)]
+    assert rest.json()["next_cursor"] == 2
+    assert missing.status_code == 404
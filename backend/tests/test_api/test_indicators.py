@@ -1,10 +1,20 @@
+import json
 from unittest.mock import AsyncMock, patch
 
+import msgpack
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from api import indicators
+from core.wire_format import JSON, encode_series
 from main import app
 from models.indicators import IndicatorPoint, IndicatorSeries
+from storage.series_cache import store_series
+
+
+@pytest.fixture(autouse=True)
+def clear_payload_cache():
+    indicators._payloads.clear()
 
 
 @pytest.mark.asyncio
@@ -82,3 +92,309 @@ async def test_get_fred_series_not_found():
     body = response.json()
     assert "FRED" in body["detail"]
     assert "series not found" in body["detail"]
+
+
+def _series_dict(series_id: str) -> dict:
+    return IndicatorSeries(
+        series_id=series_id,
+        title=f"{series_id} title",
+        units="Units",
+        frequency="Monthly",
+        data=[
+            IndicatorPoint(date="2024-01-01", value=1.0),
+            IndicatorPoint(date="2024-02-01", value=2.0),
+        ],
+    ).model_dump()
+
+
+@pytest.mark.asyncio
+async def test_batch_reads_cache_and_fetches_only_misses():
+    """Hits come from one multi-get; misses are fetched and written back."""
+    cache = AsyncMock()
+    cache.get_many.return_value = [_series_dict("GDP"), None]
+
+    mock_client = AsyncMock()
+    mock_client.get_observations.return_value = IndicatorSeries(**_series_dict("UNRATE"))
+
+    with (
+        patch("api.indicators.get_cache", return_value=cache),
+        patch("api.indicators.get_fred_client", return_value=mock_client),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/indicators/batch",
+                json={"series_ids": ["GDP", "UNRATE", "GDP"], "start": "2024-02-01"},
+            )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body["series"]) == {"GDP", "UNRATE"}
+    assert body["series"]["GDP"]["data"] == [{"date": "2024-02-01", "value": 2.0}]
+    assert body["errors"] == {}
+    cache.get_many.assert_awaited_once_with(["fred:GDP", "fred:UNRATE"])
+    mock_client.get_observations.assert_awaited_once_with("UNRATE")
+    cache.set_raw.assert_any_await(
+        "fred:UNRATE", encode_series(_series_dict("UNRATE"), JSON), ttl=900
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_ndjson_with_per_series_errors():
+    mock_client = AsyncMock()
+
+    async def side_effect(sid):
+        if sid == "BAD":
+            raise Exception("series not found")
+        return IndicatorSeries(**_series_dict(sid))
+
+    mock_client.get_observations.side_effect = side_effect
+
+    with (
+        patch("api.indicators.get_cache", return_value=None),
+        patch("api.indicators.get_fred_client", return_value=mock_client),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/indicators/batch",
+                params={"stream": "true"},
+                json={"series_ids": ["GDP", "BAD"]},
+            )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    by_id = {line["series_id"]: line for line in lines}
+    assert len(by_id["GDP"]["data"]) == 2
+    assert "series not found" in by_id["BAD"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_empty_list():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/indicators/batch", json={"series_ids": []})
+
+    assert response.status_code == 422
+
+
+def _daily_series() -> dict:
+    return {
+        **_series_dict("DGS10"),
+        "frequency": "Daily",
+        "data": [
+            {"date": f"2024-01-{d:02d}", "value": float(d)} for d in range(1, 32)
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_downsamples_and_caches_variant(fake_cache):
+    """Reduced variants are computed once from the cached series, then served
+    as stored bytes for that version."""
+    version = await store_series(fake_cache, "DGS10", _daily_series())
+    params = {"freq": "weekly", "agg": "last", "max_points": 3}
+
+    with patch("api.indicators.get_cache", return_value=fake_cache):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = await ac.get("/api/indicators/fred/DGS10", params=params)
+            indicators._payloads.clear()
+            with patch("api.indicators._apply_transform") as transform:
+                second = await ac.get("/api/indicators/fred/DGS10", params=params)
+
+    assert first.status_code == 200
+    body = first.json()
+    assert body["frequency"] == "Weekly"
+    assert len(body["data"]) == 3
+    assert body["data"][-1] == {"date": "2024-01-29", "value": 31.0}
+    assert first.headers["ETag"].startswith(f'"{version}-')
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    transform.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_returns_stored_bytes(fake_cache):
+    """The plain series is served byte-for-byte from the cache, no re-encoding."""
+    version = await store_series(fake_cache, "GDP", _series_dict("GDP"))
+    mock_client = AsyncMock()
+
+    with (
+        patch("api.indicators.get_cache", return_value=fake_cache),
+        patch("api.indicators.get_fred_client", return_value=mock_client),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/api/indicators/fred/GDP")
+
+    assert response.status_code == 200
+    assert response.content == await fake_cache.get_raw("fred:GDP")
+    assert response.headers["ETag"] == f'"{version}"'
+    assert response.headers["content-type"] == "application/json"
+    mock_client.get_observations.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_rejects_unknown_freq():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/api/indicators/fred/GDP", params={"freq": "hourly"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_not_modified_skips_body():
+    """A matching If-None-Match is answered from the version tag alone."""
+    cache = AsyncMock()
+    cache.get_raw.return_value = b"v1"
+    mock_client = AsyncMock()
+
+    with (
+        patch("api.indicators.get_cache", return_value=cache),
+        patch("api.indicators.get_fred_client", return_value=mock_client),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/api/indicators/fred/GDP",
+                headers={"If-None-Match": '"v1"', "Accept-Encoding": "identity"},
+            )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == '"v1"'
+    assert "stale-while-revalidate" in response.headers["Cache-Control"]
+    cache.get_raw.assert_awaited_once_with("fred:GDP:etag")
+    mock_client.get_observations.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_fetches_and_tags_on_cache_miss(fake_cache):
+    mock_client = AsyncMock()
+    mock_client.get_observations.return_value = IndicatorSeries(**_series_dict("GDP"))
+
+    with (
+        patch("api.indicators.get_cache", return_value=fake_cache),
+        patch("api.indicators.get_fred_client", return_value=mock_client),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = await ac.get("/api/indicators/fred/GDP")
+            ranged = await ac.get(
+                "/api/indicators/fred/GDP", params={"start": "2024-02-01"}
+            )
+            revalidated = await ac.get(
+                "/api/indicators/fred/GDP",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+    mock_client.get_observations.assert_awaited_once_with("GDP")
+    version = (await fake_cache.get_raw("fred:GDP:etag")).decode()
+    assert first.headers["ETag"] == f'"{version}"'
+    # the miss serves the bytes other workers will read back from Redis
+    assert first.content == await fake_cache.get_raw("fred:GDP")
+    assert ranged.headers["ETag"].startswith(f'"{version}-')
+    assert len(ranged.json()["data"]) == 1
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_negotiates_columnar_and_msgpack(fake_cache):
+    """Each representation gets its own strong ETag and is cached separately."""
+    await store_series(fake_cache, "GDP", _series_dict("GDP"))
+
+    with patch("api.indicators.get_cache", return_value=fake_cache):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            rows = await ac.get("/api/indicators/fred/GDP")
+            columnar = await ac.get(
+                "/api/indicators/fred/GDP",
+                headers={"Accept": "application/vnd.globalpulse.columnar+json"},
+            )
+            packed = await ac.get(
+                "/api/indicators/fred/GDP", headers={"Accept": "application/msgpack"}
+            )
+            indicators._payloads.clear()
+            packed_again = await ac.get(
+                "/api/indicators/fred/GDP", headers={"Accept": "application/msgpack"}
+            )
+
+    assert columnar.headers["content-type"] == (
+        "application/vnd.globalpulse.columnar+json"
+    )
+    assert columnar.json()["dates"] == ["2024-01-01", "2024-02-01"]
+    assert columnar.json()["values"] == [1.0, 2.0]
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(packed.content)["dates"] == ["2024-01-01", "2024-02-01"]
+    assert packed_again.content == packed.content
+    etags = {r.headers["ETag"] for r in (rows, columnar, packed)}
+    assert len(etags) == 3
+    assert all("Accept" in r.headers["Vary"] for r in (rows, columnar, packed))
+
+
+@pytest.mark.asyncio
+async def test_batch_columnar_representation():
+    cache = AsyncMock()
+    cache.get_many.return_value = [_series_dict("GDP")]
+
+    with patch("api.indicators.get_cache", return_value=cache):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/indicators/batch",
+                json={"series_ids": ["GDP"]},
+                headers={"Accept": "application/vnd.globalpulse.columnar+json"},
+            )
+
+    assert response.status_code == 200
+    assert response.json()["series"]["GDP"]["values"] == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_serves_stale_copy_when_fred_fails(fake_cache):
+    await store_series(fake_cache, "GDP", _series_dict("GDP"))
+    await fake_cache.redis.delete("fred:GDP")  # fresh copy expired, backup remains
+    mock_client = AsyncMock()
+    mock_client.get_observations.side_effect = RuntimeError("FRED down")
+
+    with (
+        patch("api.indicators.get_cache", return_value=fake_cache),
+        patch("api.indicators.get_fred_client", return_value=mock_client),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/api/indicators/fred/GDP", headers={"Accept-Encoding": "identity"}
+            )
+            batch = await ac.post(
+                "/api/indicators/batch", json={"series_ids": ["GDP"]}
+            )
+
+    assert response.status_code == 200
+    assert response.headers["X-Stale"] == "true"
+    assert "ETag" not in response.headers
+    assert response.json()["data"] == _series_dict("GDP")["data"]
+    assert batch.headers["X-Stale"] == "GDP"
+    assert batch.json()["errors"] == {}
+
+
+@pytest.mark.asyncio
+async def test_get_fred_series_open_circuit_without_fallback_is_503():
+    from services.resilience import CircuitOpenError
+
+    mock_client = AsyncMock()
+    mock_client.get_observations.side_effect = CircuitOpenError("fred", 12)
+
+    with (
+        patch("api.indicators.get_cache", return_value=None),
+        patch("api.indicators.get_fred_client", return_value=mock_client),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/api/indicators/fred/GDP")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "12"
@@ -0,0 +1,87 @@
+"""Tests for GET /api/scrapers listing."""
+
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from main import app
+from models.scraper import ScraperConfig
+from storage.scraper_store import ScraperStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ScraperStore(str(tmp_path / "scrapers.json"))
+    for i in range(3):
+        s.create(
+            ScraperConfig(
+                name=f"s{i}",
+                url=f"https://host{i % 2}.example.com/data",
+                selector=".x",
+                schedule_minutes=15 * (i + 1),
+                active=i != 2,
+            )
+        )
+    with patch("api.scrapers.get_store", return_value=s):
+        yield s
+
+
+@pytest.mark.asyncio
+async def test_list_scrapers_paginates(store):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get("/api/scrapers", params={"limit": 2})
+        cursor = first.headers["X-Next-Cursor"]
+        second = await ac.get("/api/scrapers", params={"limit": 2, "cursor": cursor})
+
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    names = {s["name"] for s in first.json() + second.json()}
+    assert names == {"s0", "s1", "s2"}
+
+
+@pytest.mark.asyncio
+async def test_list_scrapers_filters(store):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/api/scrapers",
+            params={"active": "true", "host": "host0.example.com"},
+        )
+
+    assert response.status_code == 200
+    assert [s["name"] for s in response.json()] == ["s0"]
+
+
+@pytest.mark.asyncio
+async def test_list_scrapers_rejects_bad_limit(store):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/api/scrapers", params={"limit": 0})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_scrapers_etag_revalidation(store):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get("/api/scrapers")
+        etag = first.headers["ETag"]
+        unchanged = await ac.get("/api/scrapers", headers={"If-None-Match": etag})
+
+        store.create(
+            ScraperConfig(
+                name="new", url="https://x.example.com", selector=".x", schedule_minutes=5
+            )
+        )
+        changed = await ac.get("/api/scrapers", headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 4
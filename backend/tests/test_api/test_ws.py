@@ -0,0 +1,49 @@
+"""Tests for the /ws/live WebSocket route."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from main import app
+from services.live_hub import LiveHub
+
+
+def _wait_for_subscriber(hub: LiveHub, channel: str, count: int = 1) -> None:
+    deadline = time.monotonic() + 2.0
+    while hub.subscriber_count(channel) != count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_subscribe_and_receive_broadcast():
+    hub = LiveHub()
+    with patch("api.ws.get_hub", return_value=hub):
+        client = TestClient(app)
+        with client.websocket_connect("/ws/live") as ws:
+            ws.send_text("not json")  # malformed commands are ignored
+            # a bare string is not split into one channel per character
+            ws.send_json({"action": "subscribe", "channels": "indicators"})
+            ws.send_json({"action": "subscribe", "channels": ["indicators"]})
+            _wait_for_subscriber(hub, "indicators")
+            assert hub.subscriber_count("i") == 0
+            ws.portal.call(hub.publish, "indicators", "update", {"series_id": "GDP"})
+            msg = ws.receive_json()
+
+            ws.send_json({"action": "unsubscribe", "channels": ["indicators"]})
+            _wait_for_subscriber(hub, "indicators", count=0)
+
+    assert msg["channel"] == "indicators"
+    assert msg["event"] == "update"
+    assert msg["data"] == {"series_id": "GDP"}
+    assert hub.subscriber_count("indicators") == 0
+
+
+def test_rejects_when_hub_not_started():
+    with patch("api.ws.get_hub", return_value=None):
+        client = TestClient(app)
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect("/ws/live"):
+                pass
+    assert exc.value.code == 1013
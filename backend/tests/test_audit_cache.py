@@ -0,0 +1,118 @@
+import pytest
+
+from storage.audit_cache import AuditCache, normalize, simhash
+
+SYSTEM = "You are a business model analyst."
+MODEL = "llama-3.1-70b-versatile"
+REPORT = {
+    "strengths": ["a"],
+    "weaknesses": ["b"],
+    "opportunities": ["c"],
+    "threats": ["d"],
+    "risk_summary": "e",
+}
+PROMPT = (
+    "Perform a SWOT analysis for the following business model.\n\n"
+    "Business description: SaaS platform for supply chain analytics with "
+    "real-time supplier risk scoring and automated alerts for procurement teams\n"
+    "Target market: US manufacturing sector\nIndustry: Technology\n"
+)
+
+
+def test_normalize_collapses_case_and_whitespace():
+    assert normalize("  Hello\n\tWORLD  ") == normalize("hello world")
+    assert normalize("ＳａａＳ") == "saas"
+
+
+def test_simhash_is_close_for_near_duplicates():
+    a = simhash(normalize(PROMPT))
+    b = simhash(normalize(PROMPT.replace("automated alerts", "automatic alerts")))
+    c = simhash(normalize("Industry: Agriculture. Target market: Kenyan smallholders"))
+    assert (a ^ b).bit_count() < (a ^ c).bit_count()
+
+
+@pytest.mark.asyncio
+async def test_exact_hit_ignores_formatting(fake_cache):
+    cache = AuditCache(fake_cache)
+    await cache.store(SYSTEM, PROMPT, MODEL, 0.3, REPORT)
+
+    hit, kind = await cache.lookup(SYSTEM, "  " + PROMPT.upper(), MODEL, 0.3)
+    miss, miss_kind = await cache.lookup(SYSTEM, PROMPT, MODEL, 0.7)
+
+    assert (hit, kind) == (REPORT, "exact")
+    assert (miss, miss_kind) == (None, "miss")
+    entry = cache.entry_for(SYSTEM, PROMPT, MODEL, 0.3)
+    assert await fake_cache.redis.ttl(f"audit:{entry}") > 0
+
+
+@pytest.mark.asyncio
+async def test_semantic_tier_reuses_near_duplicate(fake_cache):
+    cache = AuditCache(fake_cache, semantic=True)
+    await cache.store(SYSTEM, PROMPT, MODEL, 0.3, REPORT)
+    near = PROMPT.replace("procurement teams", "procurement team")
+
+    hit, kind = await cache.lookup(SYSTEM, near, MODEL, 0.3)
+    other_model, other_kind = await cache.lookup(SYSTEM, near, "other-model", 0.3)
+
+    assert (hit, kind) == (REPORT, "semantic")
+    assert (other_model, other_kind) == (None, "miss")
+
+
+@pytest.mark.asyncio
+async def test_semantic_tier_is_off_by_default(fake_cache):
+    cache = AuditCache(fake_cache)
+    await cache.store(SYSTEM, PROMPT, MODEL, 0.3, REPORT)
+
+    hit, kind = await cache.lookup(SYSTEM, PROMPT + " Also B2B.", MODEL, 0.3)
+
+    assert (hit, kind) == (None, "miss")
+
+
+@pytest.mark.asyncio
+async def test_stats_report_hit_rate(fake_cache):
+    cache = AuditCache(fake_cache)
+    assert (await cache.stats())["hit_rate"] == 0.0
+
+    await cache.store(SYSTEM, PROMPT, MODEL, 0.3, REPORT)
+    await cache.lookup(SYSTEM, PROMPT, MODEL, 0.3)
+    await cache.lookup(SYSTEM, PROMPT, MODEL, 0.3)
+    await cache.lookup(SYSTEM, "unrelated", MODEL, 0.3)
+
+    assert await cache.stats() == {
+        "exact": 2,
+        "semantic": 0,
+        "miss": 1,
+        "hit_rate": 2 / 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_context_does_not_make_businesses_alike(fake_cache):
+    cache = AuditCache(fake_cache, semantic=True)
+    context = "\n".join(
+        f"Indicator {i} (SERIES{i}): {i}.5 Percent as of 2024-05-01, +0.2% YoY"
+        for i in range(12)
+    )
+
+    def prompt(description: str) -> str:
+        return (
+            "Perform a SWOT analysis for the following business model.\n\n"
+            f"Business description: {description}\n"
+            "Target market: Vietnam\nIndustry: Retail\n"
+        )
+
+    await cache.store(SYSTEM, prompt("Coffee shop"), MODEL, 0.3, REPORT, context)
+
+    other, kind = await cache.lookup(
+        SYSTEM, prompt("Dental clinic"), MODEL, 0.3, context
+    )
+    same, same_kind = await cache.lookup(
+        SYSTEM, prompt("Coffee shop"), MODEL, 0.3, context
+    )
+    no_data, no_data_kind = await cache.lookup(
+        SYSTEM, prompt("Coffee shop"), MODEL, 0.3
+    )
+
+    assert (other, kind) == (None, "miss")
+    assert (same, same_kind) == (REPORT, "exact")
+    assert (no_data, no_data_kind) == (None, "miss")
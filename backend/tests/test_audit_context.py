@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from models.risk import RiskScore
+from services.audit_context import AuditContextBuilder, resolve_region
+from storage.region_summary import (
+    add_anomaly,
+    indicator_summary,
+    set_risk,
+    update_indicator,
+)
+
+
+def _monthly(series_id: str, values: list[float]) -> dict:
+    return {
+        "series_id": series_id,
+        "title": f"{series_id} title",
+        "units": "Percent",
+        "frequency": "Monthly",
+        "data": [
+            {"date": f"{2023 + i // 12}-{i % 12 + 1:02d}-01", "value": v}
+            for i, v in enumerate(values)
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "market,region",
+    [
+        ("越南", "seasia"),
+        ("Vietnam and Thailand", "seasia"),
+        ("US manufacturing sector", "americas"),
+        ("South American retailers", "latam"),
+        ("Germany", "europe"),
+        ("small business owners", "global"),
+        ("南非", "africa"),
+    ],
+)
+def test_resolve_region(market, region):
+    assert resolve_region(market) == region
+
+
+def test_indicator_summary_changes():
+    summary = indicator_summary(_monthly("UNRATE", [4.0] * 12 + [5.0, 5.5]))
+    assert summary["value"] == 5.5
+    assert summary["date"] == "2024-02-01"
+    assert summary["change_pct"] == 10.0
+    assert summary["yoy_pct"] == 37.5
+
+
+@pytest.mark.asyncio
+async def test_context_orders_risk_anomalies_then_indicators(fake_cache):
+    unrate = _monthly("UNRATE", [4, 5])
+    await update_indicator(fake_cache, ("americas", "global"), unrate)
+    alert = {
+        "key": "fred:UNRATE",
+        "value": 5.0,
+        "z_score": 3.2,
+        "severity": "critical",
+        "date": "2023-02-01",
+    }
+    await add_anomaly(fake_cache, ("americas",), alert)
+    await set_risk(
+        fake_cache,
+        RiskScore(region_code="americas", overall=41.5, breakdown={"inflation": 20.0}),
+    )
+
+    context = await AuditContextBuilder(fake_cache).build("US retail")
+    lines = context.splitlines()
+
+    assert lines[0] == "Risk score americas: 41.5/100 (inflation 20)"
+    assert lines[1].startswith("Anomaly 2023-02-01: fred:UNRATE = 5")
+    assert lines[2] == (
+        "UNRATE title (UNRATE): 5 Percent as of 2023-02-01, +25.00% vs prior"
+    )
+    assert len(lines) == 3  # the identical global indicator line is not repeated
+
+
+@pytest.mark.asyncio
+async def test_context_falls_back_to_global_and_respects_budget(fake_cache):
+    for sid in ("GDP", "CPIAUCSL", "UNRATE", "FEDFUNDS"):
+        await update_indicator(fake_cache, ("global",), _monthly(sid, [1, 2]))
+
+    full = await AuditContextBuilder(fake_cache).build("Vietnam")
+    short = await AuditContextBuilder(fake_cache, max_tokens=40).build("Vietnam")
+
+    assert len(full.splitlines()) == 4
+    assert 0 < len(short.splitlines()) < 4
+
+
+@pytest.mark.asyncio
+async def test_context_is_empty_without_summaries(fake_cache):
+    assert await AuditContextBuilder(fake_cache).build("Vietnam") == ""
+
+
+@pytest.mark.asyncio
+async def test_concurrent_anomalies_are_all_kept(fake_cache):
+    alerts = [{"key": f"fred:S{i}", "severity": "low"} for i in range(6)]
+
+    await asyncio.gather(*(add_anomaly(fake_cache, ("global",), a) for a in alerts))
+
+    stored = (await fake_cache.hgetall("region:global:summary"))["anomalies"]
+    assert sorted(a["key"] for a in stored) == sorted(a["key"] for a in alerts)
@@ -55,3 +55,96 @@ async def test_audit_handles_malformed_llm_response(audit_request):
 
     with pytest.raises(ValueError, match="parse"):
         await engine.analyze(audit_request)
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_items_before_completion_finishes(
+    audit_request, valid_swot_json, groq_stream_stub
+):
+    """Items arrive while the stubbed completion is still streaming."""
+    engine = AuditEngine(api_key="test-key")
+    stream = groq_stream_stub(engine._llm, valid_swot_json, chunk_size=5)
+
+    events = []
+    consumed_at_first_item = None
+    async for event, data in engine.stream(audit_request):
+        if event == "item" and consumed_at_first_item is None:
+            consumed_at_first_item = stream.consumed
+        events.append((event, data))
+
+    assert consumed_at_first_item < len(stream.chunks) // 2
+    items = [d for e, d in events if e == "item"]
+    assert items[0] == {
+        "field": "strengths",
+        "index": 0,
+        "value": "Strong technology stack",
+    }
+    assert [d["field"] for d in items].count("strengths") == 2
+    assert events[-2][0] == "summary"
+    assert events[-1][0] == "report"
+    assert SWOTReport(**events[-1][1]["report"]).threats == [
+        "Intense competition from incumbents"
+    ]
+    kwargs = engine._llm.client.chat.completions.create.await_args.kwargs
+    assert kwargs["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_invalid_final_document(audit_request, groq_stream_stub):
+    engine = AuditEngine(api_key="test-key")
+    groq_stream_stub(engine._llm, '{"strengths": ["a"], "weaknesses": ["b"]}')
+
+    with pytest.raises(ValueError, match="parse"):
+        async for _ in engine.stream(audit_request):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_with_error_on_bad_item(audit_request, groq_stream_stub):
+    engine = AuditEngine(api_key="test-key")
+    groq_stream_stub(engine._llm, '{"strengths": ["ok", "bad \\x"], "threats": []}')
+
+    events = [event async for event in engine.stream(audit_request)]
+
+    assert [e for e, _ in events] == ["item", "error"]
+    assert events[-1][1]["detail"].startswith("Upstream error from LLM: Malformed")
+
+
+@pytest.mark.asyncio
+async def test_audit_prompt_includes_market_context(audit_request, valid_swot_json):
+    context = AsyncMock()
+    context.build.return_value = "Unemployment (UNRATE): 4.1 Percent as of 2024-05-01"
+    engine = AuditEngine(api_key="test-key", context=context)
+    engine._call_llm = AsyncMock(return_value=valid_swot_json)
+
+    await engine.analyze(audit_request)
+
+    context.build.assert_awaited_once_with("US manufacturing sector")
+    prompt = engine._call_llm.await_args.args[0]
+    assert "Latest market data" in prompt
+    assert prompt.endswith("Unemployment (UNRATE): 4.1 Percent as of 2024-05-01\n")
+
+
+@pytest.mark.asyncio
+async def test_audit_proceeds_when_context_fails(audit_request, valid_swot_json):
+    context = AsyncMock()
+    context.build.side_effect = ConnectionError("redis down")
+    engine = AuditEngine(api_key="test-key", context=context)
+    engine._call_llm = AsyncMock(return_value=valid_swot_json)
+
+    report = await engine.analyze(audit_request)
+
+    assert report.threats
+    assert "Latest market data" not in engine._call_llm.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_close_only_releases_own_client():
+    shared = AsyncMock()
+    await AuditEngine(api_key="test-key", llm=shared).close()
+    shared.close.assert_not_awaited()
+
+    engine = AuditEngine(api_key="test-key")
+    engine._llm.close = AsyncMock()
+    await engine.close()
+    engine._llm.close.assert_awaited_once()
@@ -0,0 +1,174 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from models.audit import AuditRequest
+from services.audit_engine import AuditEngine
+from services.audit_jobs import AuditJobRunner
+from storage.audit_cache import AuditCache, audit_key
+from storage.audit_jobs import AuditJobStore
+
+SWOT = json.dumps(
+    {
+        "strengths": ["s"],
+        "weaknesses": ["w"],
+        "opportunities": ["o"],
+        "threats": ["t"],
+        "risk_summary": "r",
+    }
+)
+
+
+def _request(name: str) -> AuditRequest:
+    return AuditRequest(
+        model_description=name, target_market="Vietnam", industry="Retail"
+    )
+
+
+@pytest.fixture
+def runner(fake_cache):
+    engine = AuditEngine(api_key="test-key")
+    engine._call_llm = AsyncMock(return_value=SWOT)
+    return AuditJobRunner(AuditJobStore(fake_cache), engine, concurrency=2)
+
+
+async def _drain(runner: AuditJobRunner) -> None:
+    await asyncio.gather(*list(runner._tasks.values()))
+
+
+@pytest.mark.asyncio
+async def test_submit_dedupes_and_stores_results(runner):
+    items = [_request("A"), _request("B"), _request("  a ")]
+    job_id = await runner.submit(items)
+    await _drain(runner)
+
+    meta = await runner.store.meta(job_id)
+    assert (meta["status"], meta["total"], meta["unique"]) == ("done", 3, 2)
+    assert runner.engine._call_llm.await_count == 2
+    results = await runner.store.results(job_id, 0, 10)
+    assert len(results) == 2
+    assert all(r["report"]["risk_summary"] == "r" for r in results)
+    assert meta["order"][0] == meta["order"][2]
+    assert await runner.store.active() == []
+
+
+@pytest.mark.asyncio
+async def test_resume_runs_only_missing_items(runner):
+    items = [_request("A"), _request("B")]
+    order = [runner.item_key(r) for r in items]
+    job_id = "crashed"
+    await runner.store.create(
+        job_id, order, {k: r.model_dump() for k, r in zip(order, items)}
+    )
+    await runner.store.complete(job_id, order[0], {"report": None, "error": "x"})
+
+    await runner.resume()
+    await _drain(runner)
+
+    assert runner.engine._call_llm.await_count == 1
+    assert await runner.store.completed(job_id) == 2
+    assert (await runner.store.meta(job_id))["status"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_failed_items_are_recorded(runner):
+    runner.engine._call_llm.return_value = "not json"
+    job_id = await runner.submit([_request("A")])
+    await _drain(runner)
+
+    [result] = await runner.store.results(job_id, 0, 10)
+    assert result["report"] is None
+    assert result["error"].startswith("Upstream error from LLM")
+
+
+@pytest.mark.asyncio
+async def test_job_leased_by_another_worker_is_skipped(runner):
+    items = [_request("A")]
+    order = [runner.item_key(items[0])]
+    await runner.store.create("busy", order, {order[0]: items[0].model_dump()})
+    assert await runner.store.claim("busy", "other-worker", lease=60)
+
+    await runner.resume()
+    await _drain(runner)
+
+    runner.engine._call_llm.assert_not_awaited()
+    assert await runner.store.active() == ["busy"]
+
+
+@pytest.mark.asyncio
+async def test_item_keys_match_the_cache_entries(fake_cache):
+    context = AsyncMock()
+    context.build.return_value = "Risk score VN: 40.0/100"
+    engine = AuditEngine(
+        api_key="test-key", cache=AuditCache(fake_cache), context=context
+    )
+    engine._call_llm = AsyncMock(return_value=SWOT)
+    runner = AuditJobRunner(AuditJobStore(fake_cache), engine)
+
+    job_id = await runner.submit([_request("A")])
+    await _drain(runner)
+
+    assert "Risk score VN" in engine._call_llm.await_args.args[0]
+    [key] = (await runner.store.meta(job_id))["order"]
+    assert await fake_cache.get(audit_key(key)) is not None
+
+
+@pytest.mark.asyncio
+async def test_result_is_stored_once(runner):
+    await runner.store.create("j", ["k"], {"k": {}})
+
+    assert await runner.store.complete("j", "k", {"report": None, "error": "a"})
+    assert not await runner.store.complete("j", "k", {"report": None, "error": "b"})
+
+    assert await runner.store.results("j", 0, 10) == [
+        {"key": "k", "report": None, "error": "a"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_closed_worker_hands_its_job_to_the_next(runner):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow(prompt):
+        started.set()
+        await release.wait()
+        return SWOT
+
+    runner.engine._call_llm = AsyncMock(side_effect=slow)
+    job_id = await runner.submit([_request("A")])
+    await started.wait()
+    await runner.close()
+
+    successor = AuditJobRunner(runner.store, runner.engine)
+    release.set()
+    await successor.start()
+    await _drain(successor)
+    await successor.close()
+
+    assert (await runner.store.meta(job_id))["status"] == "done"
+    assert await runner.store.completed(job_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_stops_the_run(runner):
+    runner.lease = 1
+    cancelled = asyncio.Event()
+
+    async def hang(prompt):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cancelled.set()
+
+    runner.engine._call_llm = AsyncMock(side_effect=hang)
+    job_id = await runner.submit([_request("A")])
+    await runner.store.redis.set(f"audit:job:{job_id}:owner", "other-worker")
+
+    await asyncio.wait_for(cancelled.wait(), 2)
+    await _drain(runner)
+
+    assert await runner.store.completed(job_id) == 0
+    assert await runner.store.active() == [job_id]
+    assert await runner.store.redis.get(f"audit:job:{job_id}:owner") == b"other-worker"
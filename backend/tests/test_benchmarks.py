@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.harness import Benchmark, Result, compare, load, run, save
+from benchmarks.load import _shares, percentile
+from benchmarks.stubs import StubStats, fred_app, serve
+from core.config import settings
+from services.fred_client import FredClient
+
+
+def _result(name: str, ops: float, threshold: float = 0.2) -> Result:
+    return Result(name, ops, ops, rounds=3, threshold=threshold)
+
+
+def test_compare_flags_only_losses_beyond_threshold(tmp_path):
+    path = tmp_path / "baseline.json"
+    save([_result("a", 100), _result("b", 100, threshold=0.5)], path)
+
+    current = [_result("a", 79), _result("b", 60), _result("c", 1)]
+    by_name = {c.name: c for c in compare(current, load(path))}
+
+    assert by_name["a"].regressed
+    assert not by_name["b"].regressed  # within its own 50% threshold
+    assert by_name["c"].baseline is None and not by_name["c"].regressed
+    assert not compare(current, load(path), threshold=0.25)[0].regressed
+
+
+def test_save_keeps_entries_not_rerun(tmp_path):
+    path = tmp_path / "baseline.json"
+    save([_result("a", 100), _result("b", 50)], path)
+    save([_result("a", 120)], path)
+
+    baseline = load(path)
+    assert baseline["a"]["ops_per_sec"] == 120
+    assert baseline["b"]["ops_per_sec"] == 50
+
+
+@pytest.mark.asyncio
+async def test_run_reports_throughput_of_best_round():
+    result = await run(Benchmark("noop", lambda env: 1000), env=None, rounds=3)
+    assert result.rounds == 3
+    assert result.ops_per_sec >= result.median_ops_per_sec > 0
+
+
+@pytest.mark.asyncio
+async def test_fred_stub_serves_the_real_client():
+    stats = StubStats()
+    async with serve(fred_app(stats, points=25)) as url:
+        with patch.object(settings, "FRED_BASE_URL", f"{url}/fred"):
+            series = await FredClient(api_key="bench").get_observations("GDP")
+
+    assert series.series_id == "GDP"
+    assert len(series.data) == 25
+    assert stats.by_path == {"/fred/series": 1, "/fred/series/observations": 1}
+
+
+def test_load_users_split_across_generator_processes():
+    assert _shares(10, 3) == [(0, 4, 10), (4, 3, 10), (7, 3, 10)]
+    assert _shares(2, 4) == [(0, 1, 2), (1, 1, 2)]
+    assert percentile([0.3, 0.1, 0.2, 0.4], 0.5) == 0.3
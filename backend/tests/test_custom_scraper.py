@@ -47,3 +47,54 @@ class TestScraperStore:
         )
         store2 = ScraperStore(path)
         assert len(store2.list_all()) == 1
+
+
+def _make(name: str, url: str, minutes: int, active: bool = True) -> ScraperConfig:
+    return ScraperConfig(
+        name=name, url=url, selector=".x", schedule_minutes=minutes, active=active
+    )
+
+
+class TestScraperQuery:
+    def test_paginates_with_cursor(self, store):
+        for i in range(5):
+            store.create(_make(f"s{i}", "https://example.com", 60))
+
+        page1, cursor = store.query(limit=2)
+        page2, cursor2 = store.query(cursor=cursor, limit=2)
+        page3, cursor3 = store.query(cursor=cursor2, limit=2)
+
+        ids = [s.id for s in page1 + page2 + page3]
+        assert len(ids) == 5
+        assert ids == sorted(ids)
+        assert cursor3 is None
+
+    def test_filters_use_indexes(self, store):
+        a = store.create(_make("a", "https://Data.Example.com/x", 15))
+        store.create(_make("b", "https://other.org/y", 15))
+        c = store.create(_make("c", "https://data.example.com/z", 120, active=False))
+
+        by_host, _ = store.query(host="data.example.com")
+        assert {s.id for s in by_host} == {a.id, c.id}
+
+        active_only, _ = store.query(host="data.example.com", active=True)
+        assert [s.id for s in active_only] == [a.id]
+
+        slow, _ = store.query(min_schedule=60, max_schedule=120)
+        assert [s.id for s in slow] == [c.id]
+
+    def test_delete_removes_from_indexes(self, store):
+        created = store.create(_make("gone", "https://example.com", 30))
+        store.delete(created.id)
+
+        assert store.query(host="example.com") == ([], None)
+        assert store.query(active=True) == ([], None)
+        assert store.query(min_schedule=30, max_schedule=30) == ([], None)
+
+    def test_indexes_rebuilt_on_load(self, tmp_path):
+        path = str(tmp_path / "scrapers.json")
+        ScraperStore(path).create(_make("p", "https://example.com", 45, active=False))
+
+        reloaded = ScraperStore(path)
+        page, _ = reloaded.query(active=False, min_schedule=45)
+        assert len(page) == 1
@@ -0,0 +1,86 @@
+import numpy as np
+
+from services.downsampling import lttb, minmax, resample, transform_points
+
+
+def _daily(n: int, start: str = "2020-01-01") -> list[dict]:
+    dates = np.arange(np.datetime64(start), np.datetime64(start) + n)
+    return [
+        {"date": str(d), "value": float(np.sin(i / 10.0) * 100)}
+        for i, d in enumerate(dates)
+    ]
+
+
+class TestLTTB:
+    def test_returns_requested_count_with_endpoints(self):
+        x = np.arange(10_000, dtype=float)
+        y = np.sin(x / 50.0)
+        idx = lttb(x, y, 500)
+        assert len(idx) == 500
+        assert idx[0] == 0 and idx[-1] == 9_999
+        assert np.all(np.diff(idx) > 0)
+
+    def test_keeps_spike(self):
+        x = np.arange(1_000, dtype=float)
+        y = np.zeros(1_000)
+        y[437] = 50.0
+        assert 437 in lttb(x, y, 50)
+
+    def test_short_input_unchanged(self):
+        x = np.arange(5, dtype=float)
+        assert list(lttb(x, x, 10)) == [0, 1, 2, 3, 4]
+
+
+class TestMinMax:
+    def test_keeps_extremes_within_budget(self):
+        x = np.arange(1_000, dtype=float)
+        y = np.random.default_rng(0).normal(size=1_000)
+        idx = minmax(x, y, 100)
+        assert len(idx) <= 100
+        assert int(y.argmax()) in idx
+        assert int(y.argmin()) in idx
+        assert idx[0] == 0 and idx[-1] == 999
+
+
+class TestResample:
+    def test_monthly_mean_last_sum(self):
+        dates = np.array(
+            ["2024-01-05", "2024-01-20", "2024-02-03"], dtype="datetime64[D]"
+        )
+        values = np.array([1.0, 3.0, 10.0])
+
+        labels, means = resample(dates, values, "monthly", "mean")
+        assert labels.astype(str).tolist() == ["2024-01-01", "2024-02-01"]
+        assert means.tolist() == [2.0, 10.0]
+        assert resample(dates, values, "monthly", "last")[1].tolist() == [3.0, 10.0]
+        assert resample(dates, values, "monthly", "sum")[1].tolist() == [4.0, 10.0]
+
+    def test_weekly_periods_start_on_monday(self):
+        # 2024-01-01 was a Monday
+        dates = np.array(
+            ["2024-01-01", "2024-01-07", "2024-01-08"], dtype="datetime64[D]"
+        )
+        labels, values = resample(dates, np.array([1.0, 2.0, 3.0]), "weekly", "sum")
+        assert labels.astype(str).tolist() == ["2024-01-01", "2024-01-08"]
+        assert values.tolist() == [3.0, 3.0]
+
+    def test_quarterly(self):
+        dates = np.array(
+            ["2024-02-01", "2024-03-01", "2024-04-01"], dtype="datetime64[D]"
+        )
+        labels, _ = resample(dates, np.array([1.0, 2.0, 3.0]), "quarterly", "mean")
+        assert labels.astype(str).tolist() == ["2024-01-01", "2024-04-01"]
+
+
+def test_transform_points_resamples_then_downsamples_and_drops_nulls():
+    points = _daily(3_000)
+    points[10]["value"] = None
+
+    monthly = transform_points(points, freq="monthly", agg="last")
+    assert len(monthly) == 99
+    assert monthly[0]["date"] == "2020-01-01"
+
+    reduced = transform_points(points, max_points=200)
+    assert len(reduced) == 200
+    assert reduced[-1] == points[-1]
+    assert all(p["value"] is not None for p in reduced)
@@ -0,0 +1,172 @@
+import asyncio
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from fetchers.fred_backfill import backfill_series
+from services.backfill_jobs import BackfillRunner
+from storage.backfill_jobs import BackfillJobStore, new_checkpoint
+
+
+def _history(n: int) -> list[dict[str, str]]:
+    first = date(2000, 1, 1)
+    return [
+        {
+            "date": (first + timedelta(days=i)).isoformat(),
+            "value": "." if i % 10 == 9 else str(i),
+        }
+        for i in range(n)
+    ]
+
+
+def _fred(history: list[dict[str, str]], fail_at: int | None = None) -> AsyncMock:
+    async def page(series_id, offset=0, limit=10_000, start_date=None):
+        if offset == fail_at:
+            raise RuntimeError("boom")
+        return {"count": len(history), "observations": history[offset : offset + limit]}
+
+    fred = AsyncMock()
+    fred.get_observation_page.side_effect = page
+    return fred
+
+
+def _influx() -> AsyncMock:
+    influx = AsyncMock()
+    influx.write_batch.side_effect = lambda measurement, tags, rows: len(rows)
+    return influx
+
+
+@pytest.mark.asyncio
+async def test_backfill_pages_and_checkpoints_every_batch():
+    fred, influx = _fred(_history(25)), _influx()
+    saved = []
+
+    async def save(state):
+        saved.append(dict(state))
+
+    final = await backfill_series(
+        fred, influx, "GDP", new_checkpoint(), save, page_size=10, batch_points=4
+    )
+
+    offsets = [c.args[1] for c in fred.get_observation_page.await_args_list]
+    assert offsets == [0, 10, 20]
+    assert [s["offset"] for s in saved] == [4, 8, 10, 14, 18, 20, 24, 25, 25]
+    assert final == {
+        "offset": 25,
+        "count": 25,
+        "points": 23,
+        "done": True,
+        "error": None,
+    }
+
+    measurement, tags, rows = influx.write_batch.await_args_list[0].args
+    assert (measurement, tags) == ("fred", {"series_id": "GDP"})
+    assert rows[0][0].isoformat() == "2000-01-01T00:00:00+00:00"
+    assert rows[0][1] == {"value": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_checkpoint():
+    fred, influx = _fred(_history(25)), _influx()
+    checkpoint = {**new_checkpoint(), "offset": 14, "count": 25, "points": 13}
+
+    final = await backfill_series(
+        fred, influx, "GDP", checkpoint, AsyncMock(), page_size=10
+    )
+
+    assert fred.get_observation_page.await_args_list[0].args[1] == 14
+    assert final["offset"] == 25
+    assert final["points"] == 13 + 10  # dates 14..24 minus one missing value
+
+
+@pytest.mark.asyncio
+async def test_runner_records_progress_and_failures(fake_cache):
+    store = BackfillJobStore(fake_cache)
+    fred = _fred(_history(25), fail_at=10)
+    runner = BackfillRunner(store, _influx(), fred, page_size=10, batch_points=5)
+
+    job_id = await runner.submit(["GDP"], start="2000-01-01")
+    assert await runner.wait(timeout=5)
+
+    meta = await store.meta(job_id)
+    progress = await store.progress(job_id)
+    assert meta["status"] == "failed"
+    assert progress["GDP"]["offset"] == 10
+    assert progress["GDP"]["error"] == "Upstream error from FRED: boom"
+    assert await store.active() == []
+    assert fred.get_observation_page.await_args_list[0].args[3] == "2000-01-01"
+
+
+@pytest.mark.asyncio
+async def test_runner_resumes_interrupted_job(fake_cache):
+    store = BackfillJobStore(fake_cache)
+    await store.create("job1", ["GDP", "UNRATE"], None)
+    await store.checkpoint(
+        "job1", "GDP", {**new_checkpoint(), "offset": 25, "count": 25, "done": True}
+    )
+    await store.checkpoint(
+        "job1", "UNRATE", {**new_checkpoint(), "offset": 20, "count": 25}
+    )
+    fred = _fred(_history(25))
+    runner = BackfillRunner(store, _influx(), fred, page_size=10)
+
+    assert await runner.resume() == ["job1"]
+    await runner.wait()
+
+    calls = [(c.args[0], c.args[1]) for c in fred.get_observation_page.await_args_list]
+    assert calls == [("UNRATE", 20)]
+    assert (await store.meta("job1"))["status"] == "done"
+    assert (await store.progress("job1"))["UNRATE"]["done"]
+
+
+def _blocking_fred(history: list[dict[str, str]]) -> tuple[AsyncMock, asyncio.Event]:
+    """A FRED stub whose second page waits until the returned event is set."""
+    release = asyncio.Event()
+    fred = _fred(history)
+    page = fred.get_observation_page.side_effect
+
+    async def gated(series_id, offset=0, limit=10_000, start_date=None):
+        if offset:
+            await release.wait()
+        return await page(series_id, offset, limit, start_date)
+
+    fred.get_observation_page.side_effect = gated
+    return fred, release
+
+
+@pytest.mark.asyncio
+async def test_closed_runner_hands_job_to_a_restarted_one(fake_cache):
+    store = BackfillJobStore(fake_cache)
+    fred, release = _blocking_fred(_history(25))
+    runner = BackfillRunner(store, _influx(), fred, page_size=10)
+    job_id = await runner.submit(["GDP"])
+    while fred.get_observation_page.await_count < 2:
+        await asyncio.sleep(0.01)
+    await runner.close()
+
+    successor = BackfillRunner(store, _influx(), fred, page_size=10)
+    release.set()
+    await successor.start()
+    assert await successor.wait(timeout=5)
+    await successor.close()
+
+    assert (await store.meta(job_id))["status"] == "done"
+    assert (await store.progress(job_id))["GDP"]["offset"] == 25
+
+
+@pytest.mark.asyncio
+async def test_runner_stops_when_its_lease_is_taken(fake_cache):
+    store = BackfillJobStore(fake_cache)
+    fred, _ = _blocking_fred(_history(25))
+    runner = BackfillRunner(store, _influx(), fred, page_size=10, lease=1)
+    job_id = await runner.submit(["GDP"])
+    await fake_cache.redis.set(f"backfill:job:{job_id}:owner", "other-worker")
+
+    assert await runner.wait(timeout=2)
+
+    assert await store.active() == [job_id]
+    assert (await store.progress(job_id))["GDP"]["offset"] == 10
+    assert await fake_cache.redis.get(f"backfill:job:{job_id}:owner") == (
+        b"other-worker"
+    )
@@ -1,7 +1,12 @@
-from unittest.mock import AsyncMock, patch
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
+from core.config import settings
+
 from services.fred_client import FredClient
 
 
@@ -94,3 +99,95 @@ async def test_get_observations_empty(client):
 
     assert result.series_id == "GDP"
     assert result.data == []
+
+
+@pytest.mark.asyncio
+async def test_get_next_release_date(client):
+    async def mock_get(endpoint, params=None):
+        if endpoint == "series/release":
+            return {"releases": [{"id": 10, "name": "Consumer Price Index"}]}
+        return {"release_dates": [{"release_id": 10, "date": "2024-04-10"}]}
+
+    client._get = AsyncMock(side_effect=mock_get)
+
+    assert await client.get_next_release_date("CPIAUCSL", "2024-03-13") == "2024-04-10"
+    params = client._get.call_args_list[1].args[1]
+    assert params["release_id"] == "10"
+    assert params["realtime_start"] == "2024-03-13"
+
+
+@pytest.mark.asyncio
+async def test_get_observation_page(client):
+    client._get = AsyncMock(return_value={"count": 3, "observations": []})
+
+    await client.get_observation_page(
+        "GDP", offset=20, limit=10, start_date="1990-01-01"
+    )
+
+    endpoint, params = client._get.call_args.args
+    assert endpoint == "series/observations"
+    assert client._get.call_args.kwargs == {"bulk": True}
+    assert params == {
+        "series_id": "GDP",
+        "sort_order": "asc",
+        "offset": "20",
+        "limit": "10",
+        "observation_start": "1990-01-01",
+    }
+
+
+def test_quota_is_shared_and_can_be_disabled():
+    from services import fred_client
+
+    with patch.object(fred_client.settings, "FRED_RPM", 0):
+        assert fred_client.quota() is None
+    assert fred_client.quota() is fred_client.quota()
+    assert fred_client.quota().rpm == fred_client.settings.FRED_RPM
+
+
+@pytest.mark.asyncio
+async def test_backfill_pages_use_their_own_unhedged_upstream(client):
+    from services.resilience import upstream
+
+    client._call = AsyncMock(return_value={"count": 0, "observations": []})
+    with patch("services.fred_client.quota", return_value=None):
+        await client.get_observation_page("GDP")
+        await client._get("series", {"series_id": "GDP"})
+
+    (_, _, page_target, page_hedge), (_, _, live_target, live_hedge) = [
+        c.args for c in client._call.call_args_list
+    ]
+    backfill = upstream("fred_backfill")
+    assert (page_target, page_hedge) == (backfill, False)
+    assert (live_target, live_hedge) == (client.upstream, True)
+    assert backfill.breaker is not client.upstream.breaker
+    assert backfill.timeout() == settings.FRED_BACKFILL_TIMEOUT_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_hedged_attempt_takes_its_own_quota_slot(client):
+    slots = 0
+
+    @asynccontextmanager
+    async def acquire(priority):
+        nonlocal slots
+        slots += 1
+        yield
+
+    limiter = MagicMock(acquire=acquire)
+
+    async def hedged(endpoint, attempt, target, idempotent):
+        _, second = await asyncio.gather(attempt(), attempt())
+        return second
+
+    client._call = hedged
+    response = httpx.Response(
+        200, json={"seriess": []}, request=httpx.Request("GET", "https://x.test")
+    )
+    with (
+        patch("services.fred_client.quota", return_value=limiter),
+        patch.object(httpx.AsyncClient, "get", AsyncMock(return_value=response)),
+    ):
+        assert await client._get("series") == {"seriess": []}
+
+    assert slots == 2
@@ -1,9 +1,32 @@
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from core.config import settings
+from core.wire_format import JSON, encode_series
 from models.indicators import IndicatorPoint, IndicatorSeries
 from fetchers.fred_fetcher import fetch_fred_indicators, DEFAULT_SERIES
+from services.ingest_stages import build_pipeline
+
+
+@pytest.fixture(autouse=True)
+def clear_latest_dates():
+    from fetchers import fred_fetcher
+
+    fred_fetcher._latest_dates.clear()
+
+
+async def _pipeline(influx, cache, hub=None, detector=None):
+    """A started pipeline with the standard stages, flushing writes at once."""
+    with patch.object(settings, "INGEST_FLUSH_SECONDS", 0):
+        pipeline = build_pipeline(influx, cache, hub, detector)
+    await pipeline.start()
+    return pipeline
+
+
+def _series_writes(cache) -> list:
+    """set_raw calls that wrote a series body (not its version tag)."""
+    return [c for c in cache.set_raw.call_args_list if c.args[0].count(":") == 1]
 
 
 def _make_series(series_id: str) -> IndicatorSeries:
@@ -31,22 +54,30 @@ async def test_fetches_all_default_series():
         side_effect=lambda sid: _make_series(sid)
     )
 
-    await fetch_fred_indicators(fred, influx, cache)
+    p = await _pipeline(influx, cache)
+    await fetch_fred_indicators(fred, p)
+    await p.close()
 
     # get_observations called once per default series
     assert fred.get_observations.call_count == len(DEFAULT_SERIES)
     for sid in DEFAULT_SERIES:
         fred.get_observations.assert_any_call(sid)
 
-    # write_metric called at least once per series (all have data)
-    assert influx.write_metric.call_count >= len(DEFAULT_SERIES)
-
-    # cache.set called once per series
-    assert cache.set.call_count == len(DEFAULT_SERIES)
+    # latest value of every series written in one batch, stamped with its date
+    influx.write_points.assert_awaited_once()
+    measurement, rows = influx.write_points.call_args.args
+    assert measurement == "fred"
+    assert sorted(tags["series_id"] for tags, _, _ in rows) == sorted(DEFAULT_SERIES)
+    assert {(ts.date().isoformat(), f["value"]) for _, ts, f in rows} == {
+        ("2024-02-01", 101.0)
+    }
+
+    # series body cached once per series
+    assert len(_series_writes(cache)) == len(DEFAULT_SERIES)
     for sid in DEFAULT_SERIES:
-        cache.set.assert_any_call(
+        cache.set_raw.assert_any_call(
             f"fred:{sid}",
-            _make_series(sid).model_dump(),
+            encode_series(_make_series(sid).model_dump(), JSON),
             ttl=900,
         )
 
@@ -69,17 +100,19 @@ async def test_continues_on_single_series_failure():
 
     fred.get_observations = AsyncMock(side_effect=side_effect)
 
-    await fetch_fred_indicators(fred, influx, cache)
+    p = await _pipeline(influx, cache)
+    await fetch_fred_indicators(fred, p)
+    await p.close()
 
     # All series attempted
     assert fred.get_observations.call_count == len(DEFAULT_SERIES)
     # Only non-failing series written (len - 1)
-    assert influx.write_metric.call_count == len(DEFAULT_SERIES) - 1
+    assert len(influx.write_points.call_args.args[1]) == len(DEFAULT_SERIES) - 1
 
 
 @pytest.mark.asyncio
 async def test_skips_write_when_no_data():
-    """If a series returns empty data, write_metric should not be called for it."""
+    """If a series returns empty data, no point is written for it."""
     fred = AsyncMock()
     influx = AsyncMock()
     cache = AsyncMock()
@@ -99,9 +132,120 @@ async def test_skips_write_when_no_data():
 
     fred.get_observations = AsyncMock(side_effect=side_effect)
 
-    await fetch_fred_indicators(fred, influx, cache)
+    p = await _pipeline(influx, cache)
+    await fetch_fred_indicators(fred, p)
+    await p.close()
+
+    # points are only written for series with data (all except GDP)
+    assert len(influx.write_points.call_args.args[1]) == len(DEFAULT_SERIES) - 1
+    # series still cached for all series (even empty ones)
+    assert len(_series_writes(cache)) == len(DEFAULT_SERIES)
+
+
+@pytest.mark.asyncio
+async def test_publishes_only_new_observations_to_hub():
+    """New latest points go to the live hub once; unchanged series stay quiet."""
+    fred = AsyncMock()
+    fred.get_observations = AsyncMock(side_effect=lambda sid: _make_series(sid))
+    hub = AsyncMock()
+    detector = MagicMock()
+    detector.update.return_value = MagicMock(is_anomaly=False)
+
+    p = await _pipeline(AsyncMock(), AsyncMock(), hub, detector)
+    await fetch_fred_indicators(fred, p)
+    await fetch_fred_indicators(fred, p)
+    await p.close()
+
+    assert hub.publish.await_count == len(DEFAULT_SERIES)
+    hub.publish.assert_any_await(
+        "indicators",
+        "update",
+        {"series_id": "GDP", "date": "2024-02-01", "value": 101.0},
+        coalesce_key="indicators:GDP",
+    )
+    assert detector.update.call_count == len(DEFAULT_SERIES)
+
+
+@pytest.mark.asyncio
+async def test_updates_region_summaries(fake_cache):
+    """Each fetched series refreshes its entry in the americas/global summaries."""
+    fred = AsyncMock()
+    fred.get_observations = AsyncMock(side_effect=lambda sid: _make_series(sid))
+
+    p = await _pipeline(AsyncMock(), fake_cache)
+    await fetch_fred_indicators(fred, p)
+    await p.close()
+
+    summary = await fake_cache.hgetall("region:americas:summary")
+    assert set(summary) == {f"indicator:{sid}" for sid in DEFAULT_SERIES}
+    assert summary["indicator:GDP"]["value"] == 101.0
+    assert summary["indicator:GDP"]["change_pct"] == 1.0
+    assert await fake_cache.hgetall("region:global:summary") == summary
+
+
+@pytest.mark.asyncio
+async def test_planner_skips_unchanged_series(fake_cache):
+    """With a planner, only due series are checked and observations are
+    fetched only when FRED's last_updated moved."""
+    from services.poll_planner import PollPlanner
+
+    fred = AsyncMock()
+    fred.get_series_info = AsyncMock(
+        side_effect=lambda sid: {
+            "id": sid,
+            "frequency": "Monthly",
+            "last_updated": "2024-02-14 07:41:02-06",
+        }
+    )
+    fred.get_next_release_date = AsyncMock(return_value=None)
+    fred.get_observations = AsyncMock(side_effect=lambda sid, info: _make_series(sid))
+    now = [1_708_000_000.0]
+    planner = PollPlanner(fake_cache, fred, clock=lambda: now[0])
+    p = await _pipeline(AsyncMock(), fake_cache)
 
-    # write_metric should only be called for series with data (all except GDP)
-    assert influx.write_metric.call_count == len(DEFAULT_SERIES) - 1
-    # cache.set still called for all series (even empty ones)
-    assert cache.set.call_count == len(DEFAULT_SERIES)
+    await fetch_fred_indicators(fred, p, planner=planner)
+    await p.join()
+    assert fred.get_observations.await_count == len(DEFAULT_SERIES)
+    assert await fake_cache.redis.ttl("fred:GDP") > 900
+
+    # Nothing due yet: no upstream calls at all
+    await fetch_fred_indicators(fred, p, planner=planner)
+    assert fred.get_series_info.await_count == len(DEFAULT_SERIES)
+
+    # Due again but unchanged: metadata only
+    now[0] += 40 * 86400
+    await fetch_fred_indicators(fred, p, planner=planner)
+    assert fred.get_series_info.await_count == 2 * len(DEFAULT_SERIES)
+    assert fred.get_observations.await_count == len(DEFAULT_SERIES)
+    await p.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_retried_on_the_next_run(fake_cache):
+    """A release whose observations fail to load is not marked as seen."""
+    from services.poll_planner import PollPlanner
+
+    fred = AsyncMock()
+    fred.get_series_info = AsyncMock(
+        side_effect=lambda sid: {
+            "id": sid,
+            "frequency": "Quarterly",
+            "last_updated": "2024-04-25 07:51:02-05",
+        }
+    )
+    fred.get_next_release_date = AsyncMock(return_value=None)
+    fred.get_observations = AsyncMock(side_effect=RuntimeError("FRED 503"))
+    planner = PollPlanner(fake_cache, fred, clock=lambda: 1_714_100_000.0)
+    p = await _pipeline(AsyncMock(), fake_cache)
+
+    await fetch_fred_indicators(fred, p, planner=planner)
+    assert await planner.due(DEFAULT_SERIES) == DEFAULT_SERIES
+
+    fred.get_observations = AsyncMock(side_effect=lambda sid, info: _make_series(sid))
+    await fetch_fred_indicators(fred, p, planner=planner)
+    await p.join()
+
+    assert fred.get_observations.await_count == len(DEFAULT_SERIES)
+    assert await planner.due(DEFAULT_SERIES) == []
+    assert await fake_cache.get("fred:GDP") is not None
+    await p.close()
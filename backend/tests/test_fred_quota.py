@@ -0,0 +1,50 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from services.fred_quota import FredQuota, quota_key
+
+
+async def _request(quota: FredQuota, started: list[float]) -> None:
+    async with quota.acquire():
+        started.append(time.monotonic())
+
+
+@pytest.mark.asyncio
+async def test_workers_share_one_window(fake_cache):
+    key = quota_key("test-key")
+    workers = [FredQuota(2, fake_cache.redis, key, window=0.3) for _ in range(2)]
+    started: list[float] = []
+    begin = time.monotonic()
+
+    await _request(workers[0], started)
+    await _request(workers[1], started)
+    await _request(workers[1], started)  # each worker alone is under quota
+
+    assert started[1] - begin < 0.2
+    assert started[2] - begin >= 0.25
+    assert await fake_cache.redis.zcard(key) == 1  # aged-out starts trimmed
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_limit_without_redis():
+    redis = MagicMock()
+    redis.pipeline.side_effect = RedisConnectionError("down")
+    quota = FredQuota(1, redis, "fred:quota:test", window=10)
+    started: list[float] = []
+
+    await _request(quota, started)
+    second = asyncio.create_task(_request(quota, started))
+    await asyncio.sleep(0.05)
+
+    assert len(started) == 1  # the per-process window still applies
+    second.cancel()
+    await asyncio.gather(second, return_exceptions=True)
+
+
+def test_quota_key_does_not_expose_the_api_key():
+    assert "secret" not in quota_key("secret")
+    assert quota_key("a") != quota_key("b")
@@ -0,0 +1,24 @@
+from starlette.requests import Request
+
+from core.http_cache import if_none_match, make_etag
+
+
+def _request(if_none_match_header: str | None) -> Request:
+    headers = []
+    if if_none_match_header is not None:
+        headers.append((b"if-none-match", if_none_match_header.encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+def test_make_etag_is_quoted_and_variant_specific():
+    assert make_etag("abc") == '"abc"'
+    assert make_etag("abc", "start=2024") != make_etag("abc", "start=2025")
+    assert make_etag("abc", "start=2024").startswith('"abc-')
+
+
+def test_if_none_match_lists_weak_and_wildcard():
+    etag = make_etag("abc")
+    assert if_none_match(_request('"zzz", W/"abc"'), etag)
+    assert if_none_match(_request("*"), etag)
+    assert not if_none_match(_request('"zzz"'), etag)
+    assert not if_none_match(_request(None), etag)
@@ -0,0 +1,44 @@
+"""Cold-import budget for the app module, measured with `python -X importtime`.
+
+Heavy SDKs are imported where their clients are built (lifespan), so
+importing `main` must not pull them in. Raise IMPORT_BUDGET_MS on slow
+machines rather than loosening the list of deferred packages.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 900))
+DEFERRED = ("groq", "influxdb_client", "aiohttp", "apscheduler", "redis")
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_main_does_not_import_heavy_sdks():
+    imported = _importtime("main")
+    assert [m for m in imported if m.split(".")[0] in DEFERRED] == []
+
+
+def test_main_import_within_budget():
+    # Best of three: the first run may also be writing bytecode caches
+    best = min(_importtime("main")["main"] for _ in range(3))
+    assert best / 1000 < IMPORT_BUDGET_MS
@@ -9,7 +9,7 @@ from storage.influxdb import InfluxStorage
 def storage(mock_influx_write_api, mock_influx_query_api):
     """Create an InfluxStorage instance with mocked APIs."""
     with patch(
-        "storage.influxdb.InfluxDBClientAsync"
+        "influxdb_client.client.influxdb_client_async.InfluxDBClientAsync"
     ) as MockClient:
         instance = MockClient.return_value
         instance.write_api.return_value = mock_influx_write_api
@@ -45,6 +45,19 @@ async def test_write_metric(storage, mock_influx_write_api):
     assert call_kwargs is not None
 
 
+@pytest.mark.asyncio
+async def test_write_metric_records_batch_size(storage, mock_influx_write_api):
+    from prometheus_client import REGISTRY
+
+    mock_influx_write_api.write = AsyncMock()
+    before = REGISTRY.get_sample_value("influx_write_points_sum") or 0.0
+
+    await storage.write_metric("fred", {"series_id": "GDP"}, {"value": 1.0})
+
+    assert REGISTRY.get_sample_value("influx_write_points_sum") == before + 1
+    assert REGISTRY.get_sample_value("influx_write_seconds_count") >= 1
+
+
 @pytest.mark.asyncio
 async def test_query_returns_list(storage, mock_influx_query_api):
     """query_metric should return a list of dicts."""
@@ -70,3 +83,46 @@ async def test_query_returns_list(storage, mock_influx_query_api):
     assert result[0]["time"] == datetime(2025, 1, 1, tzinfo=timezone.utc)
     assert result[0]["value"] == 42.0
     assert result[0]["field"] == "value"
+
+
+@pytest.mark.asyncio
+async def test_write_batch_sends_line_protocol(storage, mock_influx_write_api):
+    mock_influx_write_api.write = AsyncMock()
+
+    written = await storage.write_batch(
+        "fred",
+        {"series_id": "A B"},
+        [
+            (datetime(2000, 1, 1, tzinfo=timezone.utc), {"value": 1.5}),
+            (datetime(2000, 2, 1, tzinfo=timezone.utc), {"value": 2.0}),
+        ],
+    )
+
+    assert written == 2
+    kwargs = mock_influx_write_api.write.call_args.kwargs
+    assert kwargs["record"] == [
+        "fred,series_id=A\\ B value=1.5 946684800",
+        "fred,series_id=A\\ B value=2.0 949363200",
+    ]
+    assert await storage.write_batch("fred", {}, []) == 0
+    mock_influx_write_api.write.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_write_points_tags_each_point(storage, mock_influx_write_api):
+    mock_influx_write_api.write = AsyncMock()
+
+    day = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    written = await storage.write_points(
+        "fred",
+        [
+            ({"series_id": "GDP"}, day, {"value": 1.5}),
+            ({"series_id": "UNRATE"}, day, {"value": 4.0}),
+        ],
+    )
+
+    assert written == 2
+    assert mock_influx_write_api.write.call_args.kwargs["record"] == [
+        "fred,series_id=GDP value=1.5 946684800",
+        "fred,series_id=UNRATE value=4.0 946684800",
+    ]
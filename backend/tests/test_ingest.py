@@ -0,0 +1,171 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from services.anomaly_detector import WelfordDetector
+from services.ingest import IngestPipeline, Observation
+from services.ingest_stages import AnomalyStage, RiskStage, write_points
+from services.risk_engine import RiskEngine
+
+
+def _event(series_id: str = "GDP", value: float = 1.0, **kw) -> Observation:
+    return Observation("fred", series_id, "2024-01-01", value, ("global",), **kw)
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _cpi(yoy_from: float, latest: float) -> dict:
+    data = [{"date": f"2023-{m:02}-01", "value": yoy_from} for m in range(1, 13)]
+    return {
+        "series_id": "CPIAUCSL",
+        "title": "CPI",
+        "units": "Index",
+        "frequency": "Monthly",
+        "data": [*data, {"date": "2024-01-01", "value": latest}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_slow_stage_does_not_stall_publishers_or_other_stages():
+    pipeline = IngestPipeline(max_queue=10)
+    release = asyncio.Event()
+    fast: list[str] = []
+
+    async def slow(events):
+        await release.wait()
+
+    async def record(events):
+        fast.extend(e.series_id for e in events)
+
+    pipeline.add_stage("slow", slow)
+    pipeline.add_stage("fast", record)
+    await pipeline.start()
+
+    for i in range(5):
+        await pipeline.publish(_event(f"S{i}"))
+    await asyncio.wait_for(pipeline.stages["fast"].queue.join(), 1)
+
+    assert fast == [f"S{i}" for i in range(5)]
+    assert pipeline.stages["slow"].queue.qsize() == 4
+    release.set()
+    await pipeline.close(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure_unless_lossy():
+    pipeline = IngestPipeline(max_queue=2)
+    release = asyncio.Event()
+    seen: list[str] = []
+
+    async def blocked(events):
+        await release.wait()
+
+    async def lossy(events):
+        await release.wait()
+        seen.extend(e.series_id for e in events)
+
+    pipeline.add_stage("lossy", lossy, lossy=True)
+    pipeline.add_stage("blocking", blocked)
+    await pipeline.start()
+    dropped = _sample("ingest_events_total", stage="lossy", outcome="dropped")
+
+    # S2 finds both queues full: the lossy stage drops S0, the blocking one
+    # holds the publisher until its worker takes S0
+    for i in range(3):
+        await pipeline.publish(_event(f"S{i}"))
+    publisher = asyncio.create_task(pipeline.publish(_event("S3")))
+    await asyncio.sleep(0.05)
+    assert not publisher.done()  # blocking stage busy with S0, S1/S2 queued
+
+    release.set()
+    await asyncio.wait_for(publisher, 1)
+    await pipeline.publish(_event("S4"))
+    await pipeline.close(timeout=1)
+
+    assert seen == ["S1", "S2", "S3", "S4"]
+    assert _sample("ingest_events_total", stage="lossy", outcome="dropped") > dropped
+    assert _sample("ingest_blocked_seconds_total", stage="blocking") > 0
+
+
+@pytest.mark.asyncio
+async def test_batches_fill_within_linger_and_failures_are_counted():
+    pipeline = IngestPipeline()
+    batches: list[int] = []
+
+    async def handle(events):
+        batches.append(len(events))
+        if len(batches) == 1:
+            raise RuntimeError("storage down")
+
+    pipeline.add_stage("batched", handle, batch=3, linger=0.05)
+    await pipeline.start()
+    errors = _sample("ingest_events_total", stage="batched", outcome="error")
+
+    for i in range(5):
+        await pipeline.publish(_event(f"S{i}"))
+        await asyncio.sleep(0)
+    await pipeline.close(timeout=1)
+
+    assert batches == [3, 2]
+    assert _sample("ingest_events_total", stage="batched", outcome="error") == (
+        errors + 3
+    )
+    assert _sample("ingest_events_total", stage="batched", outcome="ok") >= 2
+    with pytest.raises(ValueError):
+        pipeline.add_stage("batched", handle)
+
+
+@pytest.mark.asyncio
+async def test_write_points_groups_series_into_one_request():
+    influx = AsyncMock()
+
+    await write_points(influx)(
+        [_event("GDP", 1.0), _event("UNRATE", 4.0), _event("NONE", None)]
+    )
+
+    influx.write_points.assert_awaited_once()
+    measurement, rows = influx.write_points.call_args.args
+    assert measurement == "fred"
+    assert [(tags["series_id"], f["value"]) for tags, _, f in rows] == [
+        ("GDP", 1.0),
+        ("UNRATE", 4.0),
+    ]
+    assert rows[0][1].isoformat() == "2024-01-01T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_anomaly_stage_alerts_on_new_outliers(fake_cache):
+    hub = AsyncMock()
+    stage = AnomalyStage(fake_cache, WelfordDetector(min_samples=10), hub)
+
+    await stage([_event(value=100.0 + i % 2) for i in range(20)])
+    await stage([_event(value=500.0, new=False)])  # re-poll: not a sample
+    await stage([_event(value=500.0)])
+
+    summary = await fake_cache.hgetall("region:global:summary")
+    [alert] = summary["anomalies"]
+    assert alert["key"] == "fred:GDP"
+    assert alert["severity"] == "critical"
+    hub.publish.assert_awaited_once_with("anomalies", "alert", alert)
+
+
+@pytest.mark.asyncio
+async def test_risk_stage_scores_once_inputs_are_known(fake_cache):
+    hub = AsyncMock()
+    stage = RiskStage(fake_cache, RiskEngine(), hub)
+
+    await stage([_event("UNRATE", 5.0)])
+    assert "risk" not in await fake_cache.hgetall("region:global:summary")
+
+    await stage([_event("CPIAUCSL", 103.0, series=_cpi(100.0, 103.0))])
+    risk = (await fake_cache.hgetall("region:global:summary"))["risk"]
+    assert risk["breakdown"]["inflation"] == 20.0  # 3% YoY of 15
+    assert risk["breakdown"]["unemployment"] == 20.0  # 5% of 25
+    hub.publish.assert_awaited_once()
+
+    await stage([_event("UNRATE", 5.0)])  # unchanged: no recompute
+    assert hub.publish.await_count == 1
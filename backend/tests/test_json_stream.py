@@ -0,0 +1,69 @@
+import json
+
+from services.json_stream import IncrementalObjectParser
+
+DOC = json.dumps(
+    {
+        "strengths": ['Fast "delivery"', "Low cost, high margin"],
+        "weaknesses": [],
+        "threats": ["Tariffs [2025]"],
+        "risk_summary": "Moderate: {watch} FX",
+    }
+)
+
+
+def _events(chunks):
+    parser = IncrementalObjectParser()
+    events = []
+    for chunk in chunks:
+        events.extend((e.key, e.value, e.index) for e in parser.feed(chunk))
+    return parser, events
+
+
+def test_emits_items_and_fields_in_order():
+    _, events = _events([DOC])
+    assert events == [
+        ("strengths", 'Fast "delivery"', 0),
+        ("strengths", "Low cost, high margin", 1),
+        ("threats", "Tariffs [2025]", 0),
+        ("risk_summary", "Moderate: {watch} FX", None),
+    ]
+
+
+def test_any_chunking_gives_same_events():
+    _, expected = _events([DOC])
+    for size in (1, 2, 5, 13):
+        chunks = [DOC[i : i + size] for i in range(0, len(DOC), size)]
+        assert _events(chunks)[1] == expected
+
+
+def test_item_is_emitted_when_its_quote_closes():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"strengths": ["Fast') == []
+    [event] = parser.feed('", "Che')
+    assert (event.key, event.value, event.index) == ("strengths", "Fast", 0)
+
+
+def test_skips_prose_and_fences_around_document():
+    parser, events = _events(["Here you go:\n```json\n", DOC, "\n```"])
+    assert len(events) == 4
+    assert json.loads(parser.document())["threats"] == ["Tariffs [2025]"]
+
+
+def test_malformed_string_is_an_error_event():
+    parser = IncrementalObjectParser()
+    events = parser.feed('{"strengths": ["bad \\x escape", "ok"], "risk_summary": "r"}')
+
+    assert [(e.kind, e.key) for e in events] == [
+        ("error", "strengths"),
+        ("value", "strengths"),
+        ("value", "risk_summary"),
+    ]
+    assert events[0].value.startswith("Malformed string")
+
+
+def test_text_joins_chunks():
+    parser = IncrementalObjectParser()
+    for ch in DOC:
+        parser.feed(ch)
+    assert parser.text == DOC
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from scheduler import jobs
+from scheduler.jobs import (
+    _timed,
+    pause_scheduler,
+    resume_scheduler,
+    scheduler,
+    start_scheduler,
+    stop_scheduler,
+)
+from scheduler.leader import LeaderElector, StaleLeaderError
+
+
+def _elector(cache, worker_id: str, lease: float = 10.0, **callbacks):
+    return LeaderElector(cache.redis, lease=lease, worker_id=worker_id, **callbacks)
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_leads(fake_cache):
+    a, b = _elector(fake_cache, "a"), _elector(fake_cache, "b")
+
+    await a.step()
+    await b.step()
+
+    assert a.is_leader and not b.is_leader
+    assert await fake_cache.redis.get("leader:scheduler") == b"a:1"
+
+
+@pytest.mark.asyncio
+async def test_release_hands_over_with_a_higher_token(fake_cache):
+    elected, demoted = AsyncMock(), AsyncMock()
+    a = _elector(fake_cache, "a", on_demoted=demoted)
+    b = _elector(fake_cache, "b", on_elected=elected)
+    await a.step()
+
+    await a.close()
+    await b.step()
+
+    demoted.assert_awaited_once()
+    elected.assert_awaited_once()
+    assert b.is_leader and b.token == 2
+
+
+@pytest.mark.asyncio
+async def test_failover_after_lease_expires(fake_cache):
+    demoted = AsyncMock()
+    a = _elector(fake_cache, "a", lease=0.2, on_demoted=demoted)
+    b = _elector(fake_cache, "b", lease=0.2)
+    await a.step()
+
+    await asyncio.sleep(0.3)  # a stalls past its lease
+    await b.step()
+    await a.step()
+
+    assert b.is_leader
+    assert not a.is_leader
+    demoted.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fence_rejects_superseded_leader(fake_cache):
+    a = _elector(fake_cache, "a")
+    b = _elector(fake_cache, "b")
+    await a.step()
+    assert await a.fence() == 1
+
+    # b takes over while a still believes it leads (e.g. a paused process)
+    await fake_cache.redis.delete("leader:scheduler")
+    await b.step()
+    assert await b.fence() == 2
+
+    with pytest.raises(StaleLeaderError):
+        await a.fence()
+
+
+@pytest.mark.asyncio
+async def test_follower_fence_raises(fake_cache):
+    with pytest.raises(StaleLeaderError):
+        await _elector(fake_cache, "a").fence()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_jobs_only_while_leading(fake_cache):
+    run = AsyncMock()
+    leader = _elector(
+        fake_cache, "a", on_elected=resume_scheduler, on_demoted=pause_scheduler
+    )
+    scheduler.add_job(_timed, "date", run_date=datetime.now(), args=["led", run])
+    start_scheduler(leader)
+    await asyncio.sleep(0.05)
+    assert not run.called
+
+    await leader.step()
+    await asyncio.sleep(0.05)
+    run.assert_awaited_once()
+
+    await stop_scheduler(timeout=1)
+    await leader.close()
+    assert jobs._leader is None
+
+
+@pytest.mark.asyncio
+async def test_timed_skips_when_not_leader(fake_cache):
+    run = AsyncMock()
+    jobs._leader = _elector(fake_cache, "a")
+    try:
+        await _timed("fenced", run)
+    finally:
+        jobs._leader = None
+
+    run.assert_not_awaited()
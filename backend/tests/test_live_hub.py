@@ -0,0 +1,231 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services import live_hub
+from services.live_hub import LiveHub, Subscriber
+
+
+class TestSubscriber:
+    def test_drops_oldest_when_full(self):
+        sub = Subscriber(max_queue=2)
+        for i in range(3):
+            sub.offer(f"m{i}")
+        assert sub.pending() == 2
+        assert sub.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesces_by_key(self):
+        sub = Subscriber(max_queue=10)
+        sub.offer("gdp-1", coalesce_key="GDP")
+        sub.offer("cpi-1", coalesce_key="CPI")
+        sub.offer("gdp-2", coalesce_key="GDP")
+
+        assert [await sub.get(), await sub.get()] == ["cpi-1", "gdp-2"]
+        assert sub.dropped == 1
+
+
+class TestLiveHub:
+    @pytest.mark.asyncio
+    async def test_publish_only_reaches_subscribed_channels(self):
+        hub = LiveHub()
+        a, b = hub.connect(), hub.connect()
+        hub.subscribe(a, ["indicators"])
+        hub.subscribe(b, ["anomalies"])
+
+        delivered = await hub.publish("indicators", "update", {"series_id": "GDP"})
+
+        assert delivered == 1
+        msg = json.loads(await a.get())
+        assert msg["channel"] == "indicators"
+        assert msg["event"] == "update"
+        assert msg["data"] == {"series_id": "GDP"}
+        assert "timestamp" in msg
+        assert b.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_and_disconnect(self):
+        hub = LiveHub()
+        sub = hub.connect()
+        hub.subscribe(sub, ["indicators", "risk"])
+        hub.unsubscribe(sub, ["risk"])
+        assert hub.subscriber_count("risk") == 0
+
+        hub.disconnect(sub)
+        assert hub.subscriber_count("indicators") == 0
+        assert await hub.publish("indicators", "update", {}) == 0
+
+    @pytest.mark.asyncio
+    async def test_relays_through_redis_and_skips_own_messages(self):
+        redis = AsyncMock()
+        sender = LiveHub(redis=redis)
+        receiver = LiveHub()
+        sub = receiver.connect()
+        receiver.subscribe(sub, ["indicators"])
+
+        await sender.publish("indicators", "update", {"v": 1}, coalesce_key="k")
+        channel, envelope = redis.publish.await_args.args
+        assert channel == live_hub.REDIS_FANOUT_CHANNEL
+
+        class FakePubSub:
+            async def subscribe(self, _):
+                pass
+
+            async def listen(self):
+                yield {"type": "subscribe", "data": 1}
+                yield {"type": "message", "data": envelope.encode()}
+
+            async def aclose(self):
+                pass
+
+        receiver._redis = AsyncMock()
+        receiver._redis.pubsub = lambda: FakePubSub()
+        await receiver._consume_relay()
+        assert json.loads(await sub.get())["data"] == {"v": 1}
+
+        # The originating worker ignores its own relayed message
+        own = sender.connect()
+        sender.subscribe(own, ["indicators"])
+        sender._redis.pubsub = lambda: FakePubSub()
+        await sender._consume_relay()
+        assert own.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_fanout_to_10k_concurrent_clients():
+    """Load test: 10k local clients each draining their own queue concurrently."""
+    n_clients = 10_000
+    n_messages = 5
+    hub = LiveHub(max_queue=n_messages)
+    subs = [hub.connect() for _ in range(n_clients)]
+    for sub in subs:
+        hub.subscribe(sub, ["indicators"])
+
+    async def client(sub: Subscriber) -> int:
+        for _ in range(n_messages):
+            await sub.get()
+        return n_messages
+
+    consumers = [asyncio.create_task(client(sub)) for sub in subs]
+    await asyncio.sleep(0)
+
+    with patch(
+        "services.live_hub.encode_message", wraps=live_hub.encode_message
+    ) as encode:
+        started = time.perf_counter()
+        for i in range(n_messages):
+            await hub.publish("indicators", "update", {"seq": i})
+        received = await asyncio.gather(*consumers)
+        elapsed = time.perf_counter() - started
+
+    assert sum(received) == n_clients * n_messages
+    assert encode.call_count == n_messages  # once per broadcast, not per client
+    assert all(sub.dropped == 0 for sub in subs)
+    assert elapsed < 10.0
+
+
+def _series(points: list[tuple[str, float]]) -> dict:
+    return {
+        "series_id": "GDP",
+        "title": "Gross Domestic Product",
+        "units": "Billions of Dollars",
+        "frequency": "Quarterly",
+        "data": [{"date": d, "value": v} for d, v in points],
+    }
+
+
+class TestSeriesChannels:
+    @pytest.mark.asyncio
+    async def test_snapshot_then_delta(self):
+        hub = LiveHub()
+        sub = hub.connect()
+        hub.subscribe(sub, ["series:GDP"])
+
+        await hub.publish_series(_series([("2024-01-01", 1.0)]))
+        await hub.publish_series(_series([("2024-01-01", 1.0)]))  # unchanged
+        await hub.publish_series(
+            _series([("2024-01-01", 1.5), ("2024-04-01", 2.0)])
+        )
+
+        snapshot = json.loads(await sub.get())
+        delta = json.loads(await sub.get())
+        assert sub.pending() == 0
+        assert snapshot["event"] == "snapshot"
+        assert snapshot["data"]["series"]["data"] == [
+            {"date": "2024-01-01", "value": 1.0}
+        ]
+        assert delta["event"] == "delta"
+        assert delta["data"]["base_version"] == snapshot["data"]["version"]
+        assert delta["data"]["appended"] == [{"date": "2024-04-01", "value": 2.0}]
+        assert delta["data"]["revised"] == [{"date": "2024-01-01", "value": 1.5}]
+
+    @pytest.mark.asyncio
+    async def test_catch_up_replays_or_snapshots(self):
+        hub = LiveHub(ring_size=2)
+        await hub.publish_series(_series([("2024-01-01", 1.0)]))
+        first = hub._series["series:GDP"].version
+        await hub.publish_series(
+            _series([("2024-01-01", 1.0), ("2024-04-01", 2.0)])
+        )
+
+        resumed = hub.connect()
+        await hub.catch_up(resumed, "series:GDP", since=first)
+        msg = json.loads(await resumed.get())
+        assert msg["event"] == "delta"
+        assert resumed.pending() == 0
+
+        stale = hub.connect()
+        await hub.catch_up(stale, "series:GDP", since=1)
+        msg = json.loads(await stale.get())
+        assert msg["event"] == "snapshot"
+        assert len(msg["data"]["series"]["data"]) == 2
+
+        fresh = hub.connect()
+        await hub.catch_up(fresh, "series:GDP")
+        assert json.loads(await fresh.get())["event"] == "snapshot"
+
+    @pytest.mark.asyncio
+    async def test_catch_up_loads_snapshot_for_unknown_series(self):
+        loader = AsyncMock(return_value=_series([("2024-01-01", 1.0)]))
+        hub = LiveHub(snapshot_loader=loader)
+        sub = hub.connect()
+
+        await hub.catch_up(sub, "series:GDP")
+
+        loader.assert_awaited_once_with("GDP")
+        msg = json.loads(await sub.get())
+        assert msg["event"] == "snapshot"
+
+    @pytest.mark.asyncio
+    async def test_catch_up_keeps_no_state_for_missing_series(self):
+        hub = LiveHub(snapshot_loader=AsyncMock(return_value=None))
+        sub = hub.connect()
+
+        for i in range(100):
+            await hub.catch_up(sub, f"series:BOGUS{i}", since=3)
+
+        assert hub._series == {}
+        assert sub.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_remote_deltas_keep_replay_ring_in_sync(self):
+        origin = LiveHub()
+        mirror = LiveHub()
+        await origin.publish_series(_series([("2024-01-01", 1.0)]))
+        snapshot = origin._series["series:GDP"].cached_snapshot()
+        mirror._apply_remote_series("series:GDP", snapshot)
+        base = mirror._series["series:GDP"].version
+
+        await origin.publish_series(
+            _series([("2024-01-01", 1.0), ("2024-04-01", 2.0)])
+        )
+        delta_payload = origin._series["series:GDP"].replay_since(base)[0]
+        mirror._apply_remote_series("series:GDP", delta_payload)
+
+        log = mirror._series["series:GDP"]
+        assert log.version == origin._series["series:GDP"].version
+        assert log.points == {"2024-01-01": 1.0, "2024-04-01": 2.0}
+        assert log.replay_since(base) == [delta_payload]
@@ -0,0 +1,132 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.llm_client import LLMClient
+from services.llm_limiter import LLMRateLimiter, Priority
+
+
+async def _hold(
+    limiter, order, name, tokens=1, priority=Priority.INTERACTIVE, gate=None
+):
+    async with limiter.acquire(tokens, priority):
+        order.append(name)
+        if gate is not None:
+            await gate.wait()
+
+
+@pytest.mark.asyncio
+async def test_caps_concurrent_calls():
+    limiter = LLMRateLimiter(rpm=100, tpm=10_000, max_concurrency=2)
+    gate, order = asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(_hold(limiter, order, i, gate=gate)) for i in range(5)
+    ]
+    await asyncio.sleep(0)
+
+    assert limiter.active == 2
+    assert limiter.queued == 3
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert sorted(order) == [0, 1, 2, 3, 4]
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_jump_background_queue():
+    limiter = LLMRateLimiter(rpm=100, tpm=10_000, max_concurrency=1)
+    gate, order = asyncio.Event(), []
+    first = asyncio.create_task(_hold(limiter, order, "running", gate=gate))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(_hold(limiter, order, "bg1", priority=Priority.BACKGROUND)),
+        asyncio.create_task(_hold(limiter, order, "bg2", priority=Priority.BACKGROUND)),
+        asyncio.create_task(_hold(limiter, order, "ui")),
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(first, *queued)
+
+    assert order == ["running", "ui", "bg1", "bg2"]
+
+
+@pytest.mark.asyncio
+async def test_requests_per_window_are_limited():
+    limiter = LLMRateLimiter(rpm=2, tpm=10_000, max_concurrency=10, window=0.05)
+    loop = asyncio.get_running_loop()
+    start, order = loop.time(), []
+    await asyncio.gather(*(_hold(limiter, order, i) for i in range(3)))
+
+    assert loop.time() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_recorded_usage_frees_token_budget():
+    limiter = LLMRateLimiter(rpm=100, tpm=100, max_concurrency=10, window=60)
+    async with limiter.acquire(60) as grant:
+        grant.record(10)
+    waiter = asyncio.create_task(_hold(limiter, [], "next", tokens=60))
+    await asyncio.wait_for(waiter, 0.5)
+
+    blocked = asyncio.create_task(_hold(limiter, [], "over", tokens=60))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    blocked.cancel()
+
+
+@pytest.mark.asyncio
+async def test_oversized_call_is_admitted_on_empty_window():
+    limiter = LLMRateLimiter(rpm=10, tpm=100, max_concurrency=1)
+    async with limiter.acquire(1_000) as grant:
+        assert grant.tokens == 1_000
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place():
+    limiter = LLMRateLimiter(rpm=100, tpm=10_000, max_concurrency=1)
+    gate, order = asyncio.Event(), []
+    running = asyncio.create_task(_hold(limiter, order, "running", gate=gate))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(_hold(limiter, order, "cancelled"))
+    after = asyncio.create_task(_hold(limiter, order, "after"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    gate.set()
+    await asyncio.gather(running, after)
+
+    assert order == ["running", "after"]
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_client_charges_reported_usage():
+    limiter = LLMRateLimiter(rpm=100, tpm=10_000, max_concurrency=1)
+    client = LLMClient(api_key="test-key", limiter=limiter)
+    client.client = MagicMock()
+    client.client.chat.completions.create = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+            usage=SimpleNamespace(total_tokens=321),
+        )
+    )
+
+    assert await client.chat("system", "user") == "{}"
+    assert [g.tokens for g in limiter._recent] == [321]
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_streams_do_not_shorten_the_completion_timeout(groq_stream_stub):
+    client = LLMClient(api_key="test-key")
+    groq_stream_stub(client, "{}")
+    before = list(client.upstream.latency._samples)
+
+    for _ in range(30):
+        async for _ in client.chat_stream("system", "user"):
+            pass
+
+    assert list(client.upstream.latency._samples) == before
+    assert len(client.stream_upstream.latency._samples) >= 30
+    assert client.stream_upstream.breaker is client.upstream.breaker
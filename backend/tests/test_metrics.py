@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from core.metrics import CACHE_LOOKUPS, bound
+from main import app
+from models.indicators import IndicatorPoint, IndicatorSeries
+from services.fred_client import FredClient
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_bound_reuses_label_children():
+    assert bound(CACHE_LOOKUPS, "x", "hit") is bound(CACHE_LOOKUPS, "x", "hit")
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_latency_by_route_template():
+    series = IndicatorSeries(
+        series_id="GDP",
+        title="GDP",
+        units="Units",
+        frequency="Quarterly",
+        data=[IndicatorPoint(date="2024-01-01", value=1.0)],
+    )
+    client = AsyncMock()
+    client.get_observations.return_value = series
+
+    with (
+        patch("api.indicators.get_fred_client", return_value=client),
+        patch("api.indicators.get_cache", return_value=None),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            await ac.get("/api/indicators/fred/GDP")
+            response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_seconds_count{method="GET",'
+        'route="/api/indicators/fred/{series_id}",status="200"}'
+    ) in response.text
+
+
+@pytest.mark.asyncio
+async def test_cache_lookups_counted_per_prefix(fake_cache):
+    def count(result):
+        return _sample("cache_lookups_total", prefix="metrics", result=result)
+
+    before = {r: count(r) for r in ("hit", "miss", "stale")}
+    await fake_cache.set("metrics:a", {"v": 1})
+    await fake_cache.get("metrics:a")
+    await fake_cache.get("metrics:b")
+    await fake_cache.redis.delete("metrics:a")
+    await fake_cache.get_with_stale("metrics:a")
+
+    assert count("hit") == before["hit"] + 1
+    assert count("miss") == before["miss"] + 1
+    assert count("stale") == before["stale"] + 1
+
+
+@pytest.mark.asyncio
+async def test_fred_calls_timed_per_endpoint():
+    client = FredClient(api_key="k")
+    client.upstream = AsyncMock()
+    client.upstream.call.side_effect = [{"seriess": [{}]}, RuntimeError("down")]
+
+    def count(outcome):
+        return _sample(
+            "fred_request_seconds_count", endpoint="series", outcome=outcome
+        )
+
+    ok, error = count("ok"), count("error")
+    await client._get("series", {"series_id": "GDP"})
+    with pytest.raises(RuntimeError):
+        await client._get("series", {"series_id": "GDP"})
+
+    assert count("ok") == ok + 1
+    assert count("error") == error + 1
@@ -0,0 +1,126 @@
+import gzip
+import json
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from core.http_cache import if_none_match, not_modified
+from core.middleware import CompressionMiddleware, select_encoding
+from storage.payload_cache import PayloadCache
+
+BODY = json.dumps([{"date": f"2024-01-{d:02d}", "value": d} for d in range(1, 29)] * 20)
+
+
+def _app(cache: PayloadCache) -> FastAPI:
+    app = FastAPI()
+    app.state.renders = 0
+
+    @app.get("/series")
+    async def series(request: Request):
+        if if_none_match(request, '"v1"'):
+            return not_modified('"v1"', "no-cache")
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return Response("{}", media_type="application/json")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(3):
+                yield json.dumps({"i": i, "pad": "x" * 600}).encode() + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100, cache=cache)
+    return app
+
+
+def _client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+def test_select_encoding_prefers_zstd_then_br_then_gzip():
+    assert select_encoding("gzip, br, zstd") == "zstd"
+    assert select_encoding("gzip, br") == "br"
+    assert select_encoding("gzip;q=1, br;q=0.5") == "gzip"
+    assert select_encoding("*") == "zstd"
+    assert select_encoding("identity") is None
+    assert select_encoding("gzip;q=0") is None
+    assert select_encoding("") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "encoding,decode",
+    [
+        ("gzip", gzip.decompress),
+        ("br", brotli.decompress),
+        ("zstd", lambda b: zstandard.ZstdDecompressor().decompress(b)),
+    ],
+)
+async def test_compresses_large_body(encoding, decode):
+    cache = PayloadCache()
+    async with _client(_app(cache)) as ac:
+        headers = {"Accept-Encoding": encoding}
+        async with ac.stream("GET", "/series", headers=headers) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["ETag"] == f'"v1-{encoding}"'
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) == len(raw) < len(BODY)
+    assert decode(raw) == BODY.encode()
+
+
+@pytest.mark.asyncio
+async def test_compressed_variant_is_cached_per_etag():
+    cache = PayloadCache()
+    async with _client(_app(cache)) as ac:
+        await ac.get("/series", headers={"Accept-Encoding": "br"})
+        cached = cache.get('/series|"v1"|br')
+        cache.put('/series|"v1"|br', brotli.compress(b"[1]"))
+        response = await ac.get("/series", headers={"Accept-Encoding": "br"})
+
+    assert cached is not None
+    assert response.content == b"[1]"
+
+
+@pytest.mark.asyncio
+async def test_small_and_identity_responses_pass_through():
+    async with _client(_app(PayloadCache())) as ac:
+        small = await ac.get("/small", headers={"Accept-Encoding": "gzip"})
+        identity = await ac.get("/series", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in small.headers
+    assert small.content == b"{}"
+    assert "Content-Encoding" not in identity.headers
+    assert identity.headers["ETag"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_with_encoded_etag_returns_304():
+    async with _client(_app(PayloadCache())) as ac:
+        response = await ac.get(
+            "/series",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'},
+        )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"v1-gzip"'
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_compressed_incrementally():
+    async with _client(_app(PayloadCache())) as ac:
+        response = await ac.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["i"] for line in lines] == [0, 1, 2]
@@ -0,0 +1,25 @@
+from storage.payload_cache import PayloadCache
+
+
+def test_get_returns_stored_body():
+    cache = PayloadCache()
+    cache.put("GDP:v1", b"{}")
+    assert cache.get("GDP:v1") == b"{}"
+    assert cache.get("GDP:v2") is None
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = PayloadCache(max_bytes=10)
+    cache.put("a", b"xxxx")
+    cache.put("b", b"xxxx")
+    cache.get("a")
+    cache.put("c", b"xxxx")
+    assert cache.get("a") == b"xxxx"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"xxxx"
+
+
+def test_skips_bodies_larger_than_budget():
+    cache = PayloadCache(max_bytes=4)
+    cache.put("big", b"xxxxx")
+    assert cache.get("big") is None
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from services.poll_planner import (
+    DAY,
+    POLL_KEY,
+    PollPlanner,
+    expected_release,
+    next_poll,
+    parse_last_updated,
+)
+
+FAST = 900.0
+
+
+def _ts(value: str) -> float:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _info(last_updated: str, frequency: str = "Monthly") -> dict:
+    return {"id": "CPIAUCSL", "frequency": frequency, "last_updated": last_updated}
+
+
+def test_parse_last_updated_handles_hour_only_offset():
+    assert parse_last_updated("2024-01-26 07:51:02-06") == _ts("2024-01-26 13:51:02")
+
+
+def test_expected_release_prefers_calendar_then_history():
+    state = {
+        "frequency": "Monthly",
+        "updates": [_ts("2024-01-11"), _ts("2024-02-13"), _ts("2024-03-12")],
+        "next_release": "2024-04-10",
+    }
+    assert expected_release(state, _ts("2024-03-20")) == _ts("2024-04-10")
+
+    # Calendar date long past: fall back to the median gap between updates
+    later = _ts("2024-04-20")
+    assert expected_release(state, later) == _ts("2024-03-12") + 30.5 * DAY
+
+
+def test_next_poll_sleeps_until_release_window_then_polls_fast():
+    state = {"frequency": "Monthly", "updates": [], "next_release": "2024-04-10"}
+    release = _ts("2024-04-10")
+
+    far = next_poll(state, _ts("2024-04-01"), FAST)
+    assert release - DAY < far < release
+
+    assert next_poll(state, release + 60, FAST) == release + 60 + FAST
+
+
+def test_next_poll_backs_off_when_release_is_overdue():
+    state = {"frequency": "Quarterly", "updates": [_ts("2024-01-25")]}
+    expected = expected_release(state, 0)
+
+    soon = next_poll(state, expected + 3600, FAST) - (expected + 3600)
+    late = next_poll(state, expected + 8 * DAY, FAST) - (expected + 8 * DAY)
+
+    assert soon == FAST
+    assert late == 2 * DAY
+
+
+def test_quarterly_series_polls_an_order_of_magnitude_less():
+    """Across a quarter the planner polls a quarterly series a handful of
+    times, versus every 15 minutes before."""
+    state = {"frequency": "Quarterly", "updates": [], "next_release": "2024-04-25"}
+    now, end, polls = _ts("2024-01-26"), _ts("2024-04-25"), 0
+    while now < end:
+        now = next_poll(state, now, FAST)
+        polls += 1
+    assert polls < (end - _ts("2024-01-26")) / FAST / 10
+
+
+@pytest.mark.asyncio
+async def test_planner_fetches_only_on_change(fake_cache):
+    fred = AsyncMock()
+    fred.get_next_release_date = AsyncMock(return_value="2024-04-10")
+    now = _ts("2024-03-12 13:00:00")
+    planner = PollPlanner(fake_cache, fred, fast=FAST, clock=lambda: now)
+
+    assert await planner.due(["CPIAUCSL"]) == ["CPIAUCSL"]
+    poll = await planner.plan("CPIAUCSL", _info("2024-03-12 07:41:02-05"))
+    assert poll.changed
+    fred.get_next_release_date.assert_awaited_once_with("CPIAUCSL", "2024-03-13")
+    assert await planner.due(["CPIAUCSL"]) == ["CPIAUCSL"]  # not committed yet
+    await planner.commit(poll)
+    assert await planner.due(["CPIAUCSL"]) == []
+
+    state = await fake_cache.hget(POLL_KEY, "CPIAUCSL")
+    assert poll.ttl == int(state["due"] - now + 2 * FAST)
+
+    poll = await planner.plan("CPIAUCSL", _info("2024-03-12 07:41:02-05"))
+    assert not poll.changed
+    fred.get_next_release_date.assert_awaited_once()
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from core.tracing import span, traced, tracing
+from services.profiling import LoopWatchdog, SamplingProfiler
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_attributes_time_to_the_busy_function():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy(0.1)
+    profiler.stop()
+
+    assert not profiler.running
+    assert any("_busy" in stack[-1] for stack in profiler.samples)
+    assert "_busy (test_profiling.py:" in profiler.folded()
+
+    doc = profiler.speedscope()
+    frames = doc["shared"]["frames"]
+    profile = doc["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert all(i < len(frames) for sample in profile["samples"] for i in sample)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_logs_the_blocking_stack(caplog):
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01)
+    watchdog.start()
+    await asyncio.sleep(0.02)
+    with caplog.at_level(logging.WARNING, logger="services.profiling"):
+        _busy(0.2)  # blocks the loop
+        await asyncio.sleep(0.05)
+    await watchdog.stop()
+
+    assert watchdog.stalls == 1
+    assert watchdog.max_lag >= 0.1
+    assert "Event loop blocked" in caplog.text
+    assert "_busy" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_tracing_records_nested_spans_only_when_active():
+    @traced("outer")
+    async def outer():
+        with span("inner"):
+            await asyncio.sleep(0)
+
+    await outer()  # no trace: nothing recorded, nothing raised
+
+    with tracing() as trace:
+        await outer()
+        await outer()
+
+    assert [(s.name, s.depth) for s in trace.spans] == [
+        ("inner", 1),
+        ("outer", 0),
+        ("inner", 1),
+        ("outer", 0),
+    ]
+    header = trace.server_timing()
+    assert header.startswith("total;dur=")
+    assert "outer;dur=" in header and 'desc="2x"' in header
+
+
+@pytest.mark.asyncio
+async def test_concurrent_spans_are_siblings():
+    async def leaf(name: str, delay: float):
+        with span(name):
+            await asyncio.sleep(delay)
+
+    with tracing() as trace:
+        with span("batch"):
+            await asyncio.gather(leaf("a", 0.02), leaf("b", 0.01))
+        # the inner span ran past its sibling; later spans start at the top
+        await leaf("after", 0)
+
+    assert sorted((s.name, s.depth) for s in trace.spans) == [
+        ("a", 1),
+        ("after", 0),
+        ("b", 1),
+        ("batch", 0),
+    ]
@@ -16,7 +16,7 @@ def mock_redis():
 @pytest.fixture
 def cache(mock_redis):
     """Create a RedisCache instance with a mocked Redis client."""
-    with patch("storage.redis_cache.redis.from_url", return_value=mock_redis):
+    with patch("redis.asyncio.from_url", return_value=mock_redis):
         c = RedisCache("redis://localhost:6379")
     return c
 
@@ -79,3 +79,13 @@ async def test_get_stale_returns_none_when_both_miss(cache, mock_redis):
 
     assert result is None
     assert is_stale is False
+
+
+@pytest.mark.asyncio
+async def test_get_many_uses_single_mget(cache, mock_redis):
+    mock_redis.mget.return_value = [json.dumps({"a": 1}).encode(), None]
+
+    result = await cache.get_many(["k1", "k2"])
+
+    assert result == [{"a": 1}, None]
+    mock_redis.mget.assert_awaited_once_with(["k1", "k2"])
@@ -0,0 +1,122 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    Upstream,
+    UpstreamTimeoutError,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.test")
+    return httpx.HTTPStatusError(
+        "boom", request=request, response=httpx.Response(status, request=request)
+    )
+
+
+async def _fail(exc: Exception):
+    raise exc
+
+
+def _warm(upstream: Upstream, seconds: float, n: int = 50) -> None:
+    for _ in range(n):
+        upstream.latency.observe(seconds)
+
+
+def test_breaker_opens_then_probes_once_and_closes():
+    clock = Clock()
+    breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.before_call()
+    assert exc.value.retry_after == 10
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # everyone else waits for the probe
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    clock = Clock()
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 5
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_the_breaker():
+    upstream = Upstream("t", CircuitBreaker("t", failure_threshold=1))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await upstream.call(lambda: _fail(_status_error(400)))
+    assert upstream.breaker.state == CLOSED
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await upstream.call(lambda: _fail(_status_error(503)))
+    assert upstream.breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        await upstream.call(lambda: asyncio.sleep(0))
+
+
+@pytest.mark.asyncio
+async def test_timeout_follows_observed_latency():
+    upstream = Upstream("t", min_timeout=0.01, max_timeout=5)
+    assert upstream.timeout() == 5
+    _warm(upstream, 0.01)
+    assert upstream.timeout() == pytest.approx(0.04)
+
+    with pytest.raises(UpstreamTimeoutError):
+        await upstream.call(lambda: asyncio.sleep(1))
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_idempotent_call():
+    upstream = Upstream("t", min_timeout=1, max_timeout=5, hedge=True)
+    _warm(upstream, 0.01)
+    delays = [1.0, 0.0]
+    started = []
+
+    async def attempt():
+        delay = delays[len(started)]
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await upstream.call(attempt, idempotent=True) == 0.0
+    assert started == [1.0, 0.0]
+
+    # Not idempotent: never hedged, the slow attempt is simply awaited
+    started.clear()
+    delays[0] = 0.05
+    assert await upstream.call(attempt) == 0.05
+    assert started == [0.05]
@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from scheduler import jobs
+from scheduler.jobs import (
+    _timed,
+    add_interval_job,
+    register_jobs,
+    scheduler,
+    start_scheduler,
+    stop_scheduler,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_scheduler():
+    yield
+    scheduler.remove_all_jobs()
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_register_jobs_runs_native_async_without_overlap():
+    register_jobs(AsyncMock(), AsyncMock())
+
+    job = scheduler.get_job("fred_fetcher")
+    assert job.func is _timed
+    assert job.args[0] == "fred_fetcher"
+    assert job.max_instances == 1
+    assert job.coalesce is True
+    assert job.trigger.jitter == jobs.settings.SCHEDULER_JITTER_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_timed_records_duration_and_outcome():
+    ok_before = _sample("scheduler_job_run_seconds_count", job="t", outcome="ok")
+    err_before = _sample("scheduler_job_run_seconds_count", job="t", outcome="error")
+
+    await _timed("t", AsyncMock())
+    with pytest.raises(RuntimeError):
+        await _timed("t", AsyncMock(side_effect=RuntimeError("boom")))
+
+    assert _sample("scheduler_job_run_seconds_count", job="t", outcome="ok") == (
+        ok_before + 1
+    )
+    assert _sample(
+        "scheduler_job_run_seconds_count", job="t", outcome="error"
+    ) == err_before + 1
+
+
+@pytest.mark.asyncio
+async def test_slow_job_never_overlaps_itself():
+    running = peak = 0
+
+    async def slow():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.15)
+        running -= 1
+
+    skipped_before = _sample(
+        "scheduler_job_skipped_total", job="slow", reason="overlap"
+    )
+    with patch.object(jobs.settings, "SCHEDULER_JITTER_SECONDS", 0):
+        add_interval_job(slow, "slow", "Slow job", minutes=0.0005)
+    start_scheduler()
+    await asyncio.sleep(0.4)
+    await stop_scheduler(timeout=1)
+
+    assert peak == 1
+    assert _sample(
+        "scheduler_job_skipped_total", job="slow", reason="overlap"
+    ) > skipped_before
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_in_flight_runs():
+    started, finished = asyncio.Event(), asyncio.Event()
+
+    async def run():
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.set()
+
+    scheduler.add_job(_timed, "date", run_date=datetime.now(), args=["drain", run])
+    start_scheduler()
+    await asyncio.wait_for(started.wait(), 1)
+    await stop_scheduler(timeout=1)
+
+    assert finished.is_set()
+    assert not scheduler.running
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_runs_past_the_drain_timeout():
+    started = asyncio.Event()
+
+    async def stuck():
+        started.set()
+        await asyncio.sleep(30)
+
+    before = _sample(
+        "scheduler_job_run_seconds_count", job="stuck", outcome="cancelled"
+    )
+    scheduler.add_job(_timed, "date", run_date=datetime.now(), args=["stuck", stuck])
+    start_scheduler()
+    await asyncio.wait_for(started.wait(), 1)
+    await stop_scheduler(timeout=0.01)
+
+    assert _sample(
+        "scheduler_job_run_seconds_count", job="stuck", outcome="cancelled"
+    ) == before + 1
+    assert not jobs._running
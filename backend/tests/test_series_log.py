@@ -0,0 +1,73 @@
+from services.series_log import SeriesLog
+
+
+def _series(points: list[tuple[str, float]], title: str = "GDP") -> dict:
+    return {
+        "series_id": "GDP",
+        "title": title,
+        "units": "Billions",
+        "frequency": "Quarterly",
+        "data": [{"date": d, "value": v} for d, v in points],
+    }
+
+
+class TestDiff:
+    def test_first_sight_needs_snapshot(self):
+        assert SeriesLog().diff(_series([("2024-01-01", 1.0)])) == {}
+
+    def test_unchanged_is_none(self):
+        log = SeriesLog()
+        log.reset(_series([("2024-01-01", 1.0)]))
+        assert log.diff(_series([("2024-01-01", 1.0)])) is None
+
+    def test_appended_and_revised(self):
+        log = SeriesLog()
+        log.reset(_series([("2024-01-01", 1.0), ("2024-04-01", 2.0)]))
+        delta = log.diff(
+            _series([("2024-01-01", 1.0), ("2024-04-01", 2.5), ("2024-07-01", 3.0)])
+        )
+        assert delta == {
+            "appended": [{"date": "2024-07-01", "value": 3.0}],
+            "revised": [{"date": "2024-04-01", "value": 2.5}],
+        }
+
+    def test_removed_point_or_metadata_change_needs_snapshot(self):
+        log = SeriesLog()
+        log.reset(_series([("2024-01-01", 1.0), ("2024-04-01", 2.0)]))
+        assert log.diff(_series([("2024-04-01", 2.0)])) == {}
+        assert log.diff(_series([("2024-01-01", 1.0), ("2024-04-01", 2.0)], "x")) == {}
+
+
+class TestReplay:
+    def test_replays_from_base_version(self):
+        log = SeriesLog(ring_size=3)
+        v0 = log.reset(_series([]))
+        versions = [v0]
+        for i in range(3):
+            base = log.version
+            point = {"date": f"2024-0{i + 1}-01", "value": i}
+            log.apply({"appended": [point], "revised": []})
+            log.record(base, log.version, f"delta-{i}")
+            versions.append(log.version)
+
+        assert log.replay_since(versions[1]) == ["delta-1", "delta-2"]
+        assert log.replay_since(versions[-1]) == []
+
+    def test_too_old_version_is_not_replayable(self):
+        log = SeriesLog(ring_size=1)
+        log.reset(_series([]))
+        first = log.version
+        for i in range(2):
+            base = log.version
+            point = {"date": f"2024-0{i + 1}-01", "value": i}
+            log.apply({"appended": [point], "revised": []})
+            log.record(base, log.version, f"delta-{i}")
+
+        assert log.replay_since(first) is None
+        assert log.replay_since(12345) is None
+
+    def test_versions_increase_monotonically(self):
+        log = SeriesLog()
+        v1 = log.reset(_series([]))
+        v2 = log.apply({"appended": [], "revised": []})
+        assert v2 > v1
@@ -0,0 +1,71 @@
+import math
+
+import msgpack
+import numpy as np
+import orjson
+from starlette.requests import Request
+
+from core.wire_format import (
+    COLUMNAR,
+    JSON,
+    MSGPACK,
+    encode_batch,
+    encode_series,
+    negotiate,
+    to_columns,
+)
+
+SERIES = {
+    "series_id": "GDP",
+    "title": "Gross Domestic Product",
+    "units": "Billions",
+    "frequency": "Quarterly",
+    "data": [
+        {"date": "2024-01-01", "value": 1.5},
+        {"date": "2024-04-01", "value": None},
+    ],
+}
+
+
+def _request(accept: str | None) -> Request:
+    headers = [(b"accept", accept.encode())] if accept is not None else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_negotiate_defaults_to_json():
+    assert negotiate(_request(None)) == JSON
+    assert negotiate(_request("*/*")) == JSON
+    assert negotiate(_request("text/html")) == JSON
+
+
+def test_negotiate_picks_highest_quality():
+    assert negotiate(_request("application/msgpack")) == MSGPACK
+    assert negotiate(_request("application/x-msgpack")) == MSGPACK
+    accept = "application/json;q=0.5, application/vnd.globalpulse.columnar+json"
+    assert negotiate(_request(accept)) == COLUMNAR
+    accept = "application/msgpack;q=0.9, application/json"
+    assert negotiate(_request(accept)) == JSON
+
+
+def test_to_columns_keeps_metadata_and_order():
+    columns = to_columns(SERIES)
+    assert columns["series_id"] == "GDP"
+    assert "data" not in columns
+    assert columns["dates"] == ["2024-01-01", "2024-04-01"]
+    assert columns["values"] == [1.5, None]
+
+
+def test_msgpack_values_are_float64_bytes():
+    decoded = msgpack.unpackb(encode_series(SERIES, MSGPACK))
+    values = np.frombuffer(decoded["values"], dtype="<f8")
+    assert decoded["dates"] == ["2024-01-01", "2024-04-01"]
+    assert values[0] == 1.5
+    assert math.isnan(values[1])
+
+
+def test_encode_batch_shapes_each_series():
+    result = {"series": {"GDP": SERIES}, "errors": {"BAD": "boom"}}
+    columnar = orjson.loads(encode_batch(result, COLUMNAR))
+    assert columnar["series"]["GDP"]["dates"] == ["2024-01-01", "2024-04-01"]
+    assert columnar["errors"] == {"BAD": "boom"}
+    assert orjson.loads(encode_batch(result, JSON)) == result
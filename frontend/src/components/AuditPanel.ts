@@ -36,15 +36,31 @@ export class AuditPanel extends Panel {
     const resultEl = this.body.querySelector('.audit-result')!;
 
     resultEl.innerHTML = '<div class="loading">AI 分析中...</div>';
+    const partial: Record<string, unknown> = {};
 
     try {
-      const report = await api.postAudit({
-        model_description: fd.get('model_description') as string,
-        target_market: fd.get('target_market') as string,
-        industry: fd.get('industry') as string,
-      });
-
-      resultEl.innerHTML = this.renderSWOT(report);
+      await api.streamAudit(
+        {
+          model_description: fd.get('model_description') as string,
+          target_market: fd.get('target_market') as string,
+          industry: fd.get('industry') as string,
+        },
+        (msg) => {
+          if (msg.event === 'item') {
+            const items = (partial[msg.data.field] as string[] | undefined) ?? [];
+            items[msg.data.index] = msg.data.value;
+            partial[msg.data.field] = items;
+            resultEl.innerHTML = this.renderSWOT(partial);
+          } else if (msg.event === 'summary') {
+            partial['risk_summary'] = msg.data.value;
+            resultEl.innerHTML = this.renderSWOT(partial);
+          } else if (msg.event === 'report') {
+            resultEl.innerHTML = this.renderSWOT(msg.data.report);
+          } else if (msg.event === 'error') {
+            throw new Error(msg.data.detail);
+          }
+        },
+      );
     } catch (err) {
       resultEl.innerHTML = `<div class="error">分析失敗: ${err}</div>`;
     }
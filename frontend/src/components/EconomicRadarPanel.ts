@@ -21,18 +21,19 @@ export class EconomicRadarPanel extends Panel {
 
   private async loadData(): Promise<void> {
     this.body.innerHTML = '<div class="loading">Loading indicators...</div>';
-    const rows: string[] = [];
-
-    for (const { id, label } of TRACKED_SERIES) {
-      try {
-        const series = await api.getFredSeries(id);
-        rows.push(this.renderRow(label, series));
-      } catch {
-        rows.push(`<div class="indicator-row error">${label}: unavailable</div>`);
-      }
+    let batch: Record<string, IndicatorSeries> = {};
+    try {
+      batch = (await api.getFredSeriesBatch(TRACKED_SERIES.map(({ id }) => id))).series;
+    } catch {
+      // Fall through: every row renders as unavailable
     }
 
-    this.body.innerHTML = rows.join('');
+    this.body.innerHTML = TRACKED_SERIES.map(({ id, label }) => {
+      const series = batch[id];
+      return series
+        ? this.renderRow(label, series)
+        : `<div class="indicator-row error">${label}: unavailable</div>`;
+    }).join('');
   }
 
   private renderRow(label: string, series: IndicatorSeries): string {
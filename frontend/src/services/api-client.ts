@@ -1,7 +1,17 @@
-import type { IndicatorSeries } from '@/types/indicators';
-import type { HealthResponse } from '@/types/api';
+import type {
+  IndicatorBatchResponse,
+  IndicatorSeries,
+  IndicatorSeriesColumns,
+} from '@/types/indicators';
+import type {
+  AuditJobResults,
+  AuditJobStatus,
+  AuditStreamEvent,
+  HealthResponse,
+} from '@/types/api';
 
 const BASE_URL = import.meta.env.VITE_API_URL || '';
+const COLUMNAR = 'application/vnd.globalpulse.columnar+json';
 
 async function request<T>(path: string, init?: RequestInit): Promise<T> {
   const resp = await fetch(`${BASE_URL}${path}`, {
@@ -25,11 +35,77 @@ export const api = {
     return request<IndicatorSeries>(`/api/indicators/fred/${seriesId}${qs ? '?' + qs : ''}`);
   },
 
+  /** Same series as parallel `dates` / `values` arrays, cheaper to parse and plot. */
+  getFredSeriesColumns: (seriesId: string, start?: string, end?: string) => {
+    const params = new URLSearchParams();
+    if (start) params.set('start', start);
+    if (end) params.set('end', end);
+    const qs = params.toString();
+    return request<IndicatorSeriesColumns>(
+      `/api/indicators/fred/${seriesId}${qs ? '?' + qs : ''}`,
+      { headers: { Accept: COLUMNAR } },
+    );
+  },
+
+  getFredSeriesBatch: (seriesIds: string[], start?: string, end?: string) =>
+    request<IndicatorBatchResponse>('/api/indicators/batch', {
+      method: 'POST',
+      body: JSON.stringify({ series_ids: seriesIds, start, end }),
+    }),
+
   postAudit: (body: { model_description: string; target_market: string; industry: string }) =>
     request<Record<string, unknown>>('/api/audit', {
       method: 'POST',
       body: JSON.stringify(body),
     }),
 
-  getScrapers: () => request<unknown[]>('/api/scrapers'),
+  /** POST /api/audit?stream=true, invoking `onEvent` for each Server-Sent Event. */
+  streamAudit: async (
+    body: { model_description: string; target_market: string; industry: string },
+    onEvent: (event: AuditStreamEvent) => void,
+  ) => {
+    const resp = await fetch(`${BASE_URL}/api/audit?stream=true`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify(body),
+    });
+    if (!resp.ok || !resp.body) {
+      throw new Error(`API ${resp.status}: ${resp.statusText}`);
+    }
+    const reader = resp.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      let end: number;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        let event = 'message';
+        let data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        onEvent({ event, data: JSON.parse(data) } as AuditStreamEvent);
+      }
+    }
+  },
+
+  submitAuditBatch: (
+    items: { model_description: string; target_market: string; industry: string }[],
+  ) =>
+    request<AuditJobStatus>('/api/audit/batch', {
+      method: 'POST',
+      body: JSON.stringify({ items }),
+    }),
+
+  getAuditBatch: (jobId: string, cursor = 0) =>
+    request<AuditJobResults>(`/api/audit/batch/${jobId}?cursor=${cursor}`),
+
+  getScrapers: (filters: Record<string, string> = {}) => {
+    const qs = new URLSearchParams(filters).toString();
+    return request<unknown[]>(`/api/scrapers${qs ? '?' + qs : ''}`);
+  },
 };
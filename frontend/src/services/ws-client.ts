@@ -1,10 +1,12 @@
-import type { WSMessage, WSSubscribe } from '@/types/api';
+import type { SeriesDelta, SeriesSnapshot, WSMessage, WSSubscribe } from '@/types/api';
 
 type MessageHandler = (msg: WSMessage) => void;
 
 export class WSClient {
   private ws: WebSocket | null = null;
   private handlers: Map<string, Set<MessageHandler>> = new Map();
+  /** Last applied version per series channel, sent back on reconnect. */
+  private versions: Map<string, number> = new Map();
   private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
   private url: string;
 
@@ -15,8 +17,14 @@ export class WSClient {
   connect(): void {
     this.ws = new WebSocket(this.url);
 
+    this.ws.onopen = () => {
+      const channels = [...this.handlers.keys()];
+      if (channels.length) this.sendSubscribe(channels);
+    };
+
     this.ws.onmessage = (event) => {
       const msg: WSMessage = JSON.parse(event.data);
+      if (!this.trackVersion(msg)) return;
       const channelHandlers = this.handlers.get(msg.channel);
       if (channelHandlers) {
         channelHandlers.forEach((h) => h(msg));
@@ -35,13 +43,52 @@ export class WSClient {
     this.handlers.get(channel)!.add(handler);
 
     if (this.ws?.readyState === WebSocket.OPEN) {
-      const msg: WSSubscribe = { action: 'subscribe', channels: [channel] };
-      this.ws.send(JSON.stringify(msg));
+      this.sendSubscribe([channel]);
+    }
+  }
+
+  private sendSubscribe(channels: string[]): void {
+    const since: Record<string, number> = {};
+    for (const channel of channels) {
+      const version = this.versions.get(channel);
+      if (version !== undefined) since[channel] = version;
     }
+    const msg: WSSubscribe = { action: 'subscribe', channels, since };
+    this.ws?.send(JSON.stringify(msg));
+  }
+
+  /**
+   * Keep series channel versions in step. A delta that does not continue from
+   * the last applied version is dropped and the channel is resubscribed, so
+   * the server replays the gap or sends a fresh snapshot.
+   */
+  private trackVersion(msg: WSMessage): boolean {
+    if (msg.event === 'snapshot') {
+      this.versions.set(msg.channel, (msg.data as SeriesSnapshot).version);
+    } else if (msg.event === 'delta') {
+      const delta = msg.data as SeriesDelta;
+      const current = this.versions.get(msg.channel);
+      if (current !== undefined && delta.version <= current) return false;
+      if (current !== delta.base_version) {
+        this.sendSubscribe([msg.channel]);
+        return false;
+      }
+      this.versions.set(msg.channel, delta.version);
+    }
+    return true;
   }
 
   unsubscribe(channel: string, handler: MessageHandler): void {
-    this.handlers.get(channel)?.delete(handler);
+    const channelHandlers = this.handlers.get(channel);
+    channelHandlers?.delete(handler);
+    if (channelHandlers?.size === 0) {
+      this.handlers.delete(channel);
+      this.versions.delete(channel);
+      if (this.ws?.readyState === WebSocket.OPEN) {
+        const msg: WSSubscribe = { action: 'unsubscribe', channels: [channel] };
+        this.ws.send(JSON.stringify(msg));
+      }
+    }
   }
 
   disconnect(): void {
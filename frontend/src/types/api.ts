@@ -1,3 +1,5 @@
+import type { IndicatorPoint, IndicatorSeries } from './indicators';
+
 export interface HealthResponse {
   status: string;
   version: string;
@@ -13,4 +15,46 @@ export interface WSMessage {
 export interface WSSubscribe {
   action: 'subscribe' | 'unsubscribe';
   channels: string[];
+  /** Last applied version per `series:<id>` channel, used to resume with deltas. */
+  since?: Record<string, number>;
+}
+
+export interface SeriesSnapshot {
+  version: number;
+  series: IndicatorSeries;
+}
+
+export interface SeriesDelta {
+  version: number;
+  base_version: number;
+  appended: IndicatorPoint[];
+  revised: IndicatorPoint[];
+}
+
+export type SWOTField = 'strengths' | 'weaknesses' | 'opportunities' | 'threats';
+
+/** Events from `POST /api/audit?stream=true`. */
+export type AuditStreamEvent =
+  | { event: 'item'; data: { field: SWOTField; index: number; value: string } }
+  | { event: 'summary'; data: { value: string } }
+  | { event: 'report'; data: { report: Record<string, unknown>; cache: string } }
+  | { event: 'error'; data: { detail: string } };
+
+export interface AuditJobStatus {
+  job_id: string;
+  status: 'running' | 'done';
+  total: number;
+  unique: number;
+  completed: number;
+}
+
+export interface AuditJobResults extends AuditJobStatus {
+  results: {
+    key: string;
+    /** Positions in the submitted items that share this result. */
+    indices: number[];
+    report: Record<string, unknown> | null;
+    error: string | null;
+  }[];
+  next_cursor: number;
 }
@@ -10,3 +10,18 @@ export interface IndicatorSeries {
   frequency: string;
   data: IndicatorPoint[];
 }
+
+/** Columnar shape served for `Accept: application/vnd.globalpulse.columnar+json`. */
+export interface IndicatorSeriesColumns {
+  series_id: string;
+  title: string;
+  units: string;
+  frequency: string;
+  dates: string[];
+  values: (number | null)[];
+}
+
+export interface IndicatorBatchResponse {
+  series: Record<string, IndicatorSeries>;
+  errors: Record<string, string>;
+}